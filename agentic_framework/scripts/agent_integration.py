@@ -6,28 +6,85 @@ This module provides utilities for loading agent personas, managing communicatio
 between agents, and orchestrating the agentic SDLC workflow.
 """
 
-import json
-import yaml
+import asyncio
+import glob
+import mmap
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 import logging
 
+# Sibling modules are imported by name (as cli.py does) so these scripts also
+# work when copied into a project's agentic-scripts/ directory.
+sys.path.append(str(Path(__file__).parent))
+
+from file_cache import FileCache, DEFAULT_STATE_DIR
+from persona_parser import parse_persona
+from capability_index import CapabilityIndex
+from registry_watcher import RegistryWatcher, AGENT_FILE_PATTERN
+from state_store import StateStore, DEFAULT_FLUSH_INTERVAL, make_record, open_state_store, task_project_id
+from task_index import TaskIndex
+from task_scheduler import PENDING, TaskScheduler
+from task_executor import AsyncTaskExecutor, ExecutorSettings, ModelBackend, TaskResult
+from workflow_definitions import Workflow, WorkflowLibrary
+from prompt_templates import AgentPromptCache, BASE_TEMPLATE
+from prompt_assembler import PromptAssembler
+from standards_resolver import StandardsResolver
+from message_store import MessageStore, DEFAULT_MAX_MESSAGES
+from notification_dispatcher import NotificationDispatcher
+from event_bus import Event, EventBus, AGENT_MESSAGE, HUMAN_NOTIFICATION, TASK_READY, TASK_STATUS
+from brief_parser import BriefParser, ProjectBrief, reviewers_for_agent
+from review_queue import ReviewQueue, LEAST_LOADED, REVIEW_STATES
+from task_state_machine import (
+    ASSIGNED, COMPLETED, IN_PROGRESS, REVISION_REQUESTED, TaskEventJournal, TaskStateMachine, TaskStatusView,
+    make_event
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _decode_markdown(data: bytes) -> str:
+    """Decode markdown bytes with the same newline handling as text-mode reads."""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
 @dataclass
 class AgentPersona:
-    """Represents an AI agent persona loaded from markdown file."""
+    """Represents an AI agent persona loaded from markdown file.
+    
+    ``content`` is None for personas loaded in metadata-only mode; the body is
+    then read from ``content_offset``/``content_length`` in the file on demand.
+    """
     name: str
     role: str
     file_path: Path
-    content: str
+    content: Optional[str] = None
     capabilities: List[str] = field(default_factory=list)
     dependencies: List[str] = field(default_factory=list)
     standards_references: List[str] = field(default_factory=list)
+    content_offset: int = 0
+    content_length: int = -1
+    
+    def load_content(self, use_mmap: bool = False) -> str:
+        """Return the persona markdown, reading it from disk if not held in memory."""
+        if self.content is not None:
+            return self.content
+        
+        with open(self.file_path, 'rb') as f:
+            if use_mmap and self.content_length != 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    end = len(mapped) if self.content_length < 0 else self.content_offset + self.content_length
+                    data = mapped[self.content_offset:end]
+            else:
+                f.seek(self.content_offset)
+                data = f.read(self.content_length)
+        return _decode_markdown(data)
 
 @dataclass
 class Task:
@@ -42,6 +99,24 @@ class Task:
     created_at: datetime = field(default_factory=datetime.utcnow)
     due_date: Optional[datetime] = None
     dependencies: List[str] = field(default_factory=list)
+    project_id: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible data."""
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        data["due_date"] = self.due_date.isoformat() if self.due_date else None
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        """Rebuild a task serialized with ``to_dict``."""
+        data = dict(data)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        if data.get("due_date"):
+            data["due_date"] = datetime.fromisoformat(data["due_date"])
+        data["project_id"] = task_project_id(data["id"], data)
+        return cls(**data)
 
 @dataclass
 class Project:
@@ -55,13 +130,85 @@ class Project:
     current_phase: str = ""
     team: Dict[str, str] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.utcnow)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible data."""
+        data = asdict(self)
+        data["brief_path"] = str(self.brief_path)
+        data["created_at"] = self.created_at.isoformat()
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Project":
+        """Rebuild a project serialized with ``to_dict``."""
+        data = dict(data)
+        data["brief_path"] = Path(data["brief_path"])
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+@dataclass
+class BatchResult:
+    """Outcome of creating (and starting) projects from many briefs."""
+    projects: List[Project] = field(default_factory=list)
+    tasks: List[Task] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+def expand_brief_paths(pattern: str) -> List[Path]:
+    """Resolve a directory, glob pattern or file path to a sorted list of project briefs."""
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(path.glob("*.md"))
+    matches = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+    if matches:
+        return [match for match in matches if match.is_file()]
+    return [path] if path.exists() else []
 
 class AgentRegistry:
-    """Registry for managing AI agent personas."""
+    """Registry for managing AI agent personas.
+    
+    With ``metadata_only`` the registry keeps just the parsed metadata of each
+    persona and reads the markdown body on demand (see ``load_content``).
+    
+    ``max_workers`` greater than 1 reads persona files on a thread pool, and
+    ``parse_in_processes`` additionally parses them on a process pool (with
+    ``max_workers`` defaulting to the CPU count). Results are merged in
+    filename order whatever order the workers finish in.
     
-    def __init__(self, agents_directory: Path = Path("./sub-agents")):
+    Reloads (``reload_paths``, ``reload_changed`` and the ``watch`` mode) build
+    a new agents dict and swap it in, so ``get_agent`` readers never block and
+    always see a consistent snapshot.
+    """
+    
+    # Bump whenever persona parsing changes so cached personas are re-parsed
+    PARSER_VERSION = "3"
+    DEFAULT_CACHE_PATH = DEFAULT_STATE_DIR / "persona-cache.pkl"
+    
+    def __init__(self, agents_directory: Path = Path("./sub-agents"),
+                 cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 rebuild_cache: bool = False,
+                 metadata_only: bool = False,
+                 use_mmap: bool = False,
+                 max_workers: Optional[int] = None,
+                 parse_in_processes: bool = False):
         self.agents_directory = agents_directory
         self.agents: Dict[str, AgentPersona] = {}
+        self.capability_index = CapabilityIndex()
+        self.metadata_only = metadata_only
+        self.use_mmap = use_mmap
+        if parse_in_processes and max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.parse_in_processes = parse_in_processes
+        self.load_timings: Dict[str, float] = {}
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._signatures: Dict[Path, Tuple[int, int]] = {}
+        self._index_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self.cache: Optional[FileCache] = None
+        if cache_path is not None:
+            self.cache = FileCache(cache_path, version=self.PARSER_VERSION)
+            if rebuild_cache:
+                self.cache.clear()
         self._load_all_agents()
     
     def _load_all_agents(self) -> None:
@@ -70,90 +217,200 @@ class AgentRegistry:
             logger.error(f"Agents directory not found: {self.agents_directory}")
             return
         
-        for agent_file in self.agents_directory.glob("*-agent.md"):
-            try:
-                agent = self._load_agent_from_file(agent_file)
+        agent_files = sorted(self.agents_directory.glob(AGENT_FILE_PATTERN))
+        concurrent = self.parse_in_processes or (self.max_workers is not None and self.max_workers > 1)
+        if concurrent and len(agent_files) > 1:
+            results = self._load_agents_concurrently(agent_files)
+        else:
+            results = [self._timed_load(agent_file) for agent_file in agent_files]
+        
+        for agent_file, agent, error, elapsed in results:
+            self.load_timings[agent_file.name] = elapsed
+            if agent is not None:
                 self.agents[agent.name] = agent
+                self.capability_index.add(agent.name, agent.capabilities)
                 logger.info(f"Loaded agent: {agent.name}")
-            except Exception as e:
-                logger.error(f"Failed to load agent from {agent_file}: {e}")
+                logger.debug(f"Loaded {agent_file.name} in {elapsed * 1000:.1f} ms")
+            else:
+                logger.error(f"Failed to load agent from {agent_file}: {error}")
+        
+        if self.cache is not None:
+            self.cache.prune(agent_files)
+            self.cache.save()
+    
+    def _load_agents_concurrently(self, agent_files: List[Path]) -> List[Tuple[Path, Optional[AgentPersona], Optional[Exception], float]]:
+        """Load persona files on worker pools, returning results in input order."""
+        if self.parse_in_processes:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent-loader") as pool:
+                return list(pool.map(self._timed_load, agent_files))
+        finally:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+    
+    def _timed_load(self, agent_file: Path) -> Tuple[Path, Optional[AgentPersona], Optional[Exception], float]:
+        """Load one persona file, capturing the error instead of raising it."""
+        start = time.perf_counter()
+        try:
+            # Recorded before reading so a write during the load is seen next poll
+            self._signatures[agent_file] = self._file_signature(agent_file)
+            agent, error = self._load_agent_from_file(agent_file), None
+        except Exception as e:
+            agent, error = None, e
+        return agent_file, agent, error, time.perf_counter() - start
     
     def _load_agent_from_file(self, file_path: Path) -> AgentPersona:
-        """Load an agent persona from a markdown file."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract agent name from filename
-        agent_name = file_path.stem  # removes .md extension
-        
-        # Parse agent role from content (look for "# Persona:" line)
-        role = "Unknown"
-        for line in content.split('\n'):
-            if line.startswith("# Persona:"):
-                role = line.replace("# Persona:", "").strip()
-                break
-        
-        # Extract capabilities, dependencies, and standards references
-        capabilities = self._extract_capabilities(content)
-        dependencies = self._extract_dependencies(content)
-        standards_refs = self._extract_standards_references(content)
-        
-        return AgentPersona(
-            name=agent_name,
-            role=role,
+        """Load an agent persona from the persona cache or its markdown file."""
+        record, content = self._read_agent_record(file_path)
+        
+        agent = AgentPersona(
+            name=sys.intern(file_path.stem),  # agent name is the filename without .md
+            role=sys.intern(record["role"]),
             file_path=file_path,
-            content=content,
-            capabilities=capabilities,
-            dependencies=dependencies,
-            standards_references=standards_refs
+            # Interned so names shared across personas are stored once
+            capabilities=[sys.intern(c) for c in record["capabilities"]],
+            dependencies=[sys.intern(d) for d in record["dependencies"]],
+            standards_references=[sys.intern(r) for r in record["standards_references"]],
+            content_offset=record["content_offset"],
+            content_length=record["content_length"]
         )
+        if not self.metadata_only:
+            agent.content = content if content is not None else agent.load_content(self.use_mmap)
+        return agent
+    
+    def _read_agent_record(self, file_path: Path) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return the metadata record for a persona file, plus its content if it was read."""
+        if self.cache is not None:
+            cached = self.cache.get(file_path)
+            if cached is not None:
+                return cached, None
+        
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        if self.cache is not None:
+            cached = self.cache.get(file_path, data)
+            if cached is not None:
+                return cached, None
+        
+        content = _decode_markdown(data)
+        record = self._parse_agent(content)
+        record["content_offset"] = 0
+        record["content_length"] = len(data)
+        
+        if self.cache is not None:
+            self.cache.put(file_path, data, record)
+        
+        return record, content
+    
+    def _parse_agent(self, content: str) -> Dict[str, Any]:
+        """Parse the metadata record of an agent persona from its markdown content."""
+        if self._parse_pool is not None:
+            parsed = self._parse_pool.submit(parse_persona, content).result()
+        else:
+            parsed = parse_persona(content)
+        return {
+            "role": parsed["role"],
+            "capabilities": parsed["capabilities"],
+            "dependencies": parsed["dependencies"],
+            "standards_references": parsed["standards_references"],
+        }
+    
+    def load_content(self, agent: AgentPersona) -> str:
+        """Return an agent's persona markdown, loading it on demand if needed."""
+        return agent.load_content(self.use_mmap)
     
-    def _extract_capabilities(self, content: str) -> List[str]:
-        """Extract capabilities from agent content."""
-        capabilities = []
-        in_functions_section = False
+    @staticmethod
+    def _file_signature(file_path: Path) -> Tuple[int, int]:
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _swap_agents(self, updated: List[AgentPersona], removed: List[str]) -> None:
+        """Publish a new agents dict with personas updated and removed."""
+        with self._index_lock:
+            agents = dict(self.agents)
+            for name in removed:
+                agents.pop(name, None)
+                self.capability_index.remove(name)
+            for agent in updated:
+                agents[agent.name] = agent
+                self.capability_index.add(agent.name, agent.capabilities)
+            self.agents = agents
+    
+    def add_agent(self, agent: AgentPersona) -> None:
+        """Add or replace an agent persona and update the capability index."""
+        self._swap_agents([agent], [])
+    
+    def remove_agent(self, agent_name: str) -> Optional[AgentPersona]:
+        """Remove an agent persona and drop it from the capability index."""
+        agent = self.agents.get(agent_name)
+        self._swap_agents([], [agent_name])
+        return agent
+    
+    def reload_paths(self, paths: Iterable[Path]) -> Dict[str, List[str]]:
+        """Reload the personas at ``paths``, dropping those whose files are gone.
         
-        for line in content.split('\n'):
-            if "## Core Functions" in line or "## Tasks" in line:
-                in_functions_section = True
+        A persona that fails to reload keeps its previous version and its file
+        is reported under "failed" so the caller can retry it. Returns the
+        agent names that were added, updated and removed.
+        """
+        with self._reload_lock:
+            updated: List[AgentPersona] = []
+            removed: List[str] = []
+            failed: List[str] = []
+            for path in sorted(set(paths)):
+                if path.exists():
+                    agent_file, agent, error, elapsed = self._timed_load(path)
+                    self.load_timings[agent_file.name] = elapsed
+                    if agent is None:
+                        logger.error(f"Failed to load agent from {agent_file}: {error}")
+                        failed.append(str(path))
+                    else:
+                        updated.append(agent)
+                else:
+                    self._signatures.pop(path, None)
+                    if self.cache is not None:
+                        self.cache.discard(path)
+                    if path.stem in self.agents:
+                        removed.append(path.stem)
+            
+            changes = {
+                "added": [a.name for a in updated if a.name not in self.agents],
+                "updated": [a.name for a in updated if a.name in self.agents],
+                "removed": removed,
+                "failed": failed,
+            }
+            if updated or removed:
+                self._swap_agents(updated, removed)
+                if self.cache is not None:
+                    self.cache.save()
+                for kind in ("added", "updated", "removed"):
+                    for name in changes[kind]:
+                        logger.info(f"Reloaded agent ({kind}): {name}")
+            return changes
+    
+    def reload_changed(self) -> Dict[str, List[str]]:
+        """Reload personas whose files were added, modified or deleted since loading."""
+        current: Dict[Path, Tuple[int, int]] = {}
+        for agent_file in self.agents_directory.glob(AGENT_FILE_PATTERN):
+            try:
+                current[agent_file] = self._file_signature(agent_file)
+            except OSError:
                 continue
-            elif line.startswith("## ") and in_functions_section:
-                break
-            elif in_functions_section and line.strip().startswith(('1.', '2.', '3.', '4.', '-')):
-                # Extract capability description
-                capability = line.strip().lstrip('1234567890.- ').split(':')[0]
-                if capability:
-                    capabilities.append(capability)
-        
-        return capabilities
-    
-    def _extract_dependencies(self, content: str) -> List[str]:
-        """Extract dependencies from agent content."""
-        dependencies = []
-        
-        # Look for references to other agents
-        for line in content.split('\n'):
-            if 'agent' in line.lower() and any(keyword in line.lower() for keyword in ['engage', 'collaborate', 'work with']):
-                # Extract agent names from the line
-                words = line.split()
-                for word in words:
-                    if word.endswith('-agent'):
-                        dependencies.append(word.strip('`'))
-        
-        return list(set(dependencies))  # Remove duplicates
-    
-    def _extract_standards_references(self, content: str) -> List[str]:
-        """Extract standards file references from agent content."""
-        standards = []
-        
-        for line in content.split('\n'):
-            if 'development-standards' in line or './development-standards/' in line:
-                # Extract file references
-                import re
-                matches = re.findall(r'`\./development-standards/([^`]+)`', line)
-                standards.extend(matches)
-        
-        return list(set(standards))  # Remove duplicates
+        
+        changed = {path for path, sig in current.items() if self._signatures.get(path) != sig}
+        deleted = set(self._signatures) - set(current)
+        return self.reload_paths(changed | deleted)
+    
+    def watch(self, interval: float = 1.0, use_inotify: bool = True) -> RegistryWatcher:
+        """Start hot-reloading personas as files in the agents directory change.
+        
+        Uses inotify where available and mtime polling every ``interval``
+        seconds otherwise. Call ``stop()`` on the returned watcher to end it.
+        """
+        return RegistryWatcher(self, interval=interval, use_inotify=use_inotify).start()
     
     def get_agent(self, agent_name: str) -> Optional[AgentPersona]:
         """Get an agent persona by name."""
@@ -164,49 +421,101 @@ class AgentRegistry:
         return list(self.agents.keys())
     
     def get_agents_by_capability(self, capability: str) -> List[AgentPersona]:
-        """Find agents that have a specific capability."""
-        matching_agents = []
-        for agent in self.agents.values():
-            if any(capability.lower() in cap.lower() for cap in agent.capabilities):
-                matching_agents.append(agent)
-        return matching_agents
+        """Find agents that have a specific capability (case-insensitive substring)."""
+        with self._index_lock:
+            return [self.agents[name] for name in self.capability_index.find(capability)]
+    
+    def search_agents(self, query: str, limit: Optional[int] = None) -> List[AgentPersona]:
+        """Find agents whose capabilities best match a multi-word query, best first."""
+        with self._index_lock:
+            return [self.agents[name] for name, _ in self.capability_index.search(query, limit)]
 
 class WorkflowEngine:
     """Engine for managing and executing agentic SDLC workflows."""
     
-    def __init__(self, agent_registry: AgentRegistry):
+    def __init__(self, agent_registry: AgentRegistry, state_file: Path = Path("./workflow_state.json"),
+                 compact_every: int = 500, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 store: Optional[StateStore] = None, workflows: Optional[WorkflowLibrary] = None,
+                 prompt_token_budget: Optional[int] = None, standards: Optional[StandardsResolver] = None,
+                 inline_standards: bool = False, events: Optional[EventBus] = None,
+                 task_events: Optional[TaskEventJournal] = None, review_policy: str = LEAST_LOADED,
+                 reviewer_weights: Optional[Dict[str, float]] = None):
         self.agent_registry = agent_registry
+        self.events = events or EventBus()
+        self.workflows = workflows or WorkflowLibrary()
         self.projects: Dict[str, Project] = {}
         self.active_tasks: Dict[str, Task] = {}
-        self.state_file = Path("./workflow_state.json")
+        self.task_index = TaskIndex()
+        self.review_queue = ReviewQueue(review_policy, reviewer_weights)
+        self.scheduler = TaskScheduler()
+        self.prompt_templates = AgentPromptCache()
+        self.prompt_assembler = PromptAssembler()
+        self.prompt_token_budget = prompt_token_budget
+        self.standards = standards or StandardsResolver()
+        self.brief_parser = BriefParser()
+        self.inline_standards = inline_standards
+        self.state_file = state_file
+        self.store = store or open_state_store(state_file, compact_every=compact_every,
+                                               flush_interval=flush_interval)
+        self.state_machine = TaskStateMachine()
+        self.task_events = task_events or TaskEventJournal(state_file.with_name(state_file.name + ".events"))
+        self.status_view = TaskStatusView(self.task_events)
         self._load_state()
     
     def _load_state(self) -> None:
-        """Load workflow state from file."""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    # TODO: Deserialize projects and tasks
-                    logger.info("Loaded workflow state")
-            except Exception as e:
-                logger.error(f"Failed to load workflow state: {e}")
+        """Load projects and open tasks from the state store.
+        
+        Completed tasks stay in the store: they no longer block anything, so
+        they are only counted in the task index and read back on demand.
+        """
+        try:
+            data = self.store.load(exclude_statuses=(COMPLETED,))
+            self.projects = {
+                project_id: Project.from_dict(project)
+                for project_id, project in data["projects"].items()
+            }
+            self.active_tasks = {
+                task_id: Task.from_dict(task)
+                for task_id, task in data["tasks"].items()
+            }
+            self.task_index = TaskIndex()
+            self.review_queue = ReviewQueue(self.review_queue.policy, self.review_queue.weights)
+            for task in self.active_tasks.values():
+                self.task_index.add(task)
+                self.review_queue.add(task)
+            for project_id, counts in data.get("excluded", {}).items():
+                self.task_index.count_unloaded(project_id, counts)
+            if any(task.status in REVIEW_STATES for task in self.active_tasks.values()):
+                self.review_queue.replay(self.status_view.review_since())
+            self.scheduler = TaskScheduler()
+            self._schedule_tasks(self.active_tasks.values())
+            if self.projects or self.active_tasks:
+                logger.info(f"Loaded workflow state: {len(self.projects)} projects, {len(self.active_tasks)} open tasks")
+        except Exception as e:
+            logger.error(f"Failed to load workflow state: {e}")
     
     def _save_state(self) -> None:
-        """Save workflow state to file."""
+        """Compact the journaled workflow state into the store's snapshot."""
         try:
-            # TODO: Serialize projects and tasks
-            data = {
-                "projects": {},  # Serialized projects
-                "tasks": {},     # Serialized tasks
-                "last_updated": datetime.utcnow().isoformat()
-            }
-            with open(self.state_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.store.compact()
+            # Startup then replays only the task events after the checkpoint
+            self.status_view.compact()
             logger.info("Saved workflow state")
         except Exception as e:
             logger.error(f"Failed to save workflow state: {e}")
     
+    def _record_changes(self, projects: Iterable[Project] = (), tasks: Iterable[Task] = ()) -> None:
+        """Journal changed projects and tasks, compacting when the journal grows too long."""
+        records = [make_record("project", p.id, p.to_dict()) for p in projects]
+        records.extend(make_record("task", t.id, t.to_dict()) for t in tasks)
+        try:
+            self.store.append(records)
+        except Exception as e:
+            logger.error(f"Failed to journal workflow state: {e}")
+            return
+        if self.store.needs_compaction():
+            self._save_state()
+    
     def create_project(self, project_brief_path: Path) -> Project:
         """Create a new project from a project brief."""
         if not project_brief_path.exists():
@@ -215,6 +524,15 @@ class WorkflowEngine:
         # Parse project brief to extract metadata
         project_data = self._parse_project_brief(project_brief_path)
         
+        project = self._add_project(project_brief_path, project_data)
+        self._record_changes(projects=[project])
+        self.brief_parser.save()
+        
+        logger.info(f"Created project: {project.name} (ID: {project.id})")
+        return project
+    
+    def _add_project(self, project_brief_path: Path, project_data: Dict[str, Any]) -> Project:
+        """Create a project from parsed brief data without journaling it."""
         project = Project(
             id=self._generate_project_id(),
             name=project_data.get("name", "Unnamed Project"),
@@ -225,36 +543,61 @@ class WorkflowEngine:
         )
         
         self.projects[project.id] = project
-        self._save_state()
-        
-        logger.info(f"Created project: {project.name} (ID: {project.id})")
         return project
     
-    def _parse_project_brief(self, brief_path: Path) -> Dict[str, Any]:
+    def create_projects(self, brief_paths: Iterable[Path], start_workflows: bool = True,
+                        max_workers: Optional[int] = None) -> BatchResult:
+        """Create projects (and optionally start their workflows) from many briefs.
+        
+        Briefs are read on a thread pool and parsed on a process pool (parsing
+        is CPU-bound); all projects and tasks are then journaled in a single
+        batch. Briefs that fail are reported in
+        ``BatchResult.errors`` and do not stop the others.
+        """
+        result = BatchResult()
+        brief_paths = list(dict.fromkeys(brief_paths))
+        
+        def parse(brief_path: Path) -> Dict[str, Any]:
+            if not brief_path.exists():
+                raise FileNotFoundError(f"Project brief not found: {brief_path}")
+            return self._parse_project_brief(brief_path, parse_pool)
+        
+        parse_pool = ProcessPoolExecutor(max_workers=max_workers) if len(brief_paths) > 1 else None
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [(brief_path, pool.submit(parse, brief_path)) for brief_path in brief_paths]
+                for brief_path, future in futures:
+                    try:
+                        project_data = future.result()
+                        workflow = self.workflows.get(self._determine_workflow(project_data.get("type", "")))
+                        project = self._add_project(brief_path, project_data)
+                        if start_workflows:
+                            result.tasks.extend(self._create_tasks_from_workflow(project, workflow, record=False))
+                        result.projects.append(project)
+                    except Exception as e:
+                        result.errors[str(brief_path)] = str(e)
+                        logger.error(f"Failed to create project from {brief_path}: {e}")
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown()
+        
+        self._record_changes(projects=result.projects, tasks=result.tasks)
+        self.task_events.append(make_event(task, None) for task in result.tasks)
+        self.brief_parser.save()
+        logger.info(f"Created {len(result.projects)} projects with {len(result.tasks)} tasks "
+                    f"({len(result.errors)} failed)")
+        return result
+    
+    def _parse_project_brief(self, brief_path: Path, pool: Optional[ProcessPoolExecutor] = None) -> Dict[str, Any]:
         """Parse project brief to extract metadata."""
-        # This is a simplified parser - in practice you'd want more robust parsing
-        with open(brief_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract basic information
-        project_data = {}
-        
-        # Look for project name
-        for line in content.split('\n'):
-            if line.startswith('# ') and 'Project' in line:
-                project_data['name'] = line.replace('#', '').strip()
-                break
-        
-        # Determine project type from checkboxes
-        if '[x]' in content or '[X]' in content:
-            if 'FastAPI' in content:
-                project_data['type'] = 'api'
-            elif 'Streamlit' in content:
-                project_data['type'] = 'dashboard'
-            elif 'Django' in content or 'Flask' in content:
-                project_data['type'] = 'web_app'
-        
-        return project_data
+        return self.brief_parser.parse_file(brief_path, pool).to_project_data()
+    
+    def get_project_brief(self, project_id: str) -> ProjectBrief:
+        """Return the parsed brief of a project (cached while the brief is unchanged)."""
+        project = self.projects.get(project_id)
+        if not project:
+            raise ValueError(f"Project not found: {project_id}")
+        return self.brief_parser.parse_file(Path(project.brief_path))
     
     def _determine_workflow(self, project_type: str) -> str:
         """Determine which workflow to use based on project type."""
@@ -276,100 +619,59 @@ class WorkflowEngine:
         if not project:
             raise ValueError(f"Project not found: {project_id}")
         
-        if project.workflow == "software_systems":
-            return self._start_software_workflow(project)
-        elif project.workflow == "data_science":
-            return self._start_data_science_workflow(project)
-        else:
-            raise ValueError(f"Unknown workflow: {project.workflow}")
-    
-    def _start_software_workflow(self, project: Project) -> List[Task]:
-        """Start the software/systems development workflow."""
-        workflow_phases = [
-            {
-                "phase": "definition_design",
-                "tasks": [
-                    {"agent": "product-owner-agent", "task": "Draft and prioritize epic"},
-                    {"agent": "business-analyst-agent", "task": "Create user stories and acceptance criteria"},
-                    {"agent": "solutions-architect-agent", "task": "Design system architecture"},
-                    {"agent": "security-expert-agent", "task": "Create threat model"}
-                ]
-            },
-            {
-                "phase": "build_qa", 
-                "tasks": [
-                    {"agent": "software-developer-agent", "task": "Implement core functionality"},
-                    {"agent": "QA-engineer-agent", "task": "Create test plans"},
-                    {"agent": "test-automation-expert-agent", "task": "Automate test cases"}
-                ]
-            },
-            {
-                "phase": "delivery_operations",
-                "tasks": [
-                    {"agent": "devops-engineer-agent", "task": "Setup CI/CD pipeline"},
-                    {"agent": "product-owner-agent", "task": "Final acceptance review"}
-                ]
-            }
-        ]
-        
-        return self._create_tasks_from_workflow(project, workflow_phases)
-    
-    def _start_data_science_workflow(self, project: Project) -> List[Task]:
-        """Start the data science/ML workflow."""
-        workflow_phases = [
-            {
-                "phase": "problem_framing",
-                "tasks": [
-                    {"agent": "product-owner-agent", "task": "Define business problem and metrics"},
-                    {"agent": "business-analyst-agent", "task": "Document success criteria"}
-                ]
-            },
-            {
-                "phase": "data_engineering",
-                "tasks": [
-                    {"agent": "data-engineer-agent", "task": "Build data pipelines"}
-                ]
-            },
-            {
-                "phase": "analysis_experimentation",
-                "tasks": [
-                    {"agent": "data-scientist-agent", "task": "Exploratory data analysis and modeling"}
-                ]
-            },
-            {
-                "phase": "operationalization",
-                "tasks": [
-                    {"agent": "ML-engineer-agent", "task": "Productionize models"}
-                ]
-            }
-        ]
-        
-        return self._create_tasks_from_workflow(project, workflow_phases)
+        return self._create_tasks_from_workflow(project, self.workflows.get(project.workflow))
     
-    def _create_tasks_from_workflow(self, project: Project, workflow_phases: List[Dict]) -> List[Task]:
-        """Create tasks from workflow definition."""
+    def _create_tasks_from_workflow(self, project: Project, workflow: Workflow, record: bool = True) -> List[Task]:
+        """Create tasks from a compiled workflow definition.
+        
+        Each task depends on every task of the previous phase and on earlier
+        tasks in its own phase whose agent its persona lists as a dependency;
+        other tasks in the same phase can run concurrently. With ``record``
+        false the caller journals the tasks.
+        """
         tasks = []
         task_counter = 1
+        previous_phase: List[str] = []
         
-        for phase in workflow_phases:
-            for task_def in phase["tasks"]:
+        for phase in workflow.phases:
+            phase_tasks: List[Task] = []
+            for task_def in phase.tasks:
+                dependencies = list(previous_phase)
+                persona = self.agent_registry.get_agent(task_def.agent)
+                if persona:
+                    dependencies.extend(t.id for t in phase_tasks if t.agent in persona.dependencies)
+                
                 task = Task(
                     id=f"{project.id}_task_{task_counter:03d}",
-                    title=task_def["task"],
-                    description=f"{task_def['task']} for project {project.name}",
-                    agent=task_def["agent"],
-                    human_reviewer=project.team.get(task_def["agent"].replace("-agent", ""), "")
+                    title=task_def.title,
+                    description=f"{task_def.title} for project {project.name}",
+                    agent=task_def.agent,
+                    # Balanced against every reviewer's queue across projects
+                    human_reviewer=self.review_queue.choose(reviewers_for_agent(project.team, task_def.agent)),
+                    dependencies=dependencies,
+                    project_id=project.id
                 )
                 
                 tasks.append(task)
+                phase_tasks.append(task)
                 self.active_tasks[task.id] = task
+                self.task_index.add(task)
+                self.review_queue.add(task)
                 task_counter += 1
+            previous_phase = [t.id for t in phase_tasks]
         
-        self._save_state()
+        self._schedule_tasks(tasks)
+        if record:
+            self._record_changes(tasks=tasks)
+            self.task_events.append(make_event(task, None) for task in tasks)
         return tasks
     
-    def assign_task(self, task_id: str) -> str:
-        """Assign a task to an agent and generate the agent prompt."""
+    def assign_task(self, task_id: str, token_budget: Optional[int] = None) -> str:
+        """Assign a task to an agent and generate the agent prompt.
+        
+        ``token_budget`` (default ``prompt_token_budget``) caps the prompt size;
+        persona sections are then pruned by relevance to the task.
+        """
         task = self.active_tasks.get(task_id)
         if not task:
             raise ValueError(f"Task not found: {task_id}")
@@ -378,75 +680,223 @@ class WorkflowEngine:
         if not agent:
             raise ValueError(f"Agent not found: {task.agent}")
         
-        # Update task status
-        task.status = "in_progress"
-        self._save_state()
+        # Re-assigning a task that is already in progress only re-renders its prompt
+        if task.status not in (ASSIGNED, IN_PROGRESS, REVISION_REQUESTED):
+            raise ValueError(f"Task {task_id} is {task.status}: it was already submitted and can only be "
+                             f"re-assigned after a revision is requested")
+        if task.status != IN_PROGRESS:
+            self.set_task_status(task_id, IN_PROGRESS, actor=task.agent)
         
         # Generate agent prompt
-        prompt = self._generate_agent_prompt(agent, task)
+        prompt = self._generate_agent_prompt(agent, task, token_budget or self.prompt_token_budget)
         
         logger.info(f"Assigned task {task_id} to agent {task.agent}")
         return prompt
     
-    def _generate_agent_prompt(self, agent: AgentPersona, task: Task) -> str:
+    def _schedule_tasks(self, tasks: Iterable[Task]) -> None:
+        """Add tasks to the scheduler, each after the tasks it depends on."""
+        pending = {task.id: task for task in tasks}
+        
+        def schedule(task: Task) -> None:
+            del pending[task.id]
+            for dep in task.dependencies:
+                if dep in pending:
+                    schedule(pending[dep])
+            self.scheduler.add_task(task.id, task.dependencies, done=task.status == "completed",
+                                    group=task.project_id)
+            if task.status not in ("assigned", "completed") and self.scheduler.state(task.id) == "ready":
+                self.scheduler.start(task.id)
+        
+        while pending:
+            schedule(next(iter(pending.values())))
+    
+    def set_task_status(self, task_id: str, status: str, actor: str = "") -> Task:
+        """Change a task's status, updating the task index, scheduler and journals.
+        
+        Raises InvalidTransitionError (a ValueError) if the state machine does
+        not allow the change, and ValueError if the task's dependencies have
+        not been completed.
+        """
+        task = self.active_tasks.get(task_id)
+        if not task:
+            raise ValueError(f"Task not found: {task_id}")
+        
+        transition = self.state_machine.transition(task.status, status, task_id)
+        # Checked before the hooks run, so they never see a change that is then refused
+        if status != ASSIGNED and self.scheduler.state(task_id) == PENDING:
+            raise ValueError(f"Task {task_id} is blocked: waiting on {self.scheduler.blocking(task_id)}")
+        self.state_machine.run_hooks(transition, task, before=True)
+        
+        released: List[str] = []
+        if task_id in self.scheduler:
+            if status == COMPLETED:
+                released = self.scheduler.complete(task_id)
+                if released:
+                    logger.info(f"Task {task_id} completed, released: {', '.join(released)}")
+            elif status != ASSIGNED:
+                self.scheduler.start(task_id)
+        
+        previous, task.status = task.status, status
+        self.task_index.set_status(task_id, status)
+        self.review_queue.set_status(task_id, status)
+        self._record_changes(tasks=[task])
+        self.task_events.append([make_event(task, transition, actor)])
+        self.state_machine.run_hooks(transition, task)
+        
+        self.events.publish(Event(TASK_STATUS, {"task_id": task_id, "status": status, "previous": previous},
+                                  sender=task.agent, project_id=task.project_id))
+        for released_id in released:
+            # Lets the next agent's subscribers start as soon as a handoff completes
+            ready = self.active_tasks[released_id]
+            self.events.publish(Event(TASK_READY, {"task_id": released_id, "released_by": task_id},
+                                      sender=task.agent, recipient=ready.agent, project_id=ready.project_id))
+        return task
+    
+    def advance_task(self, task_id: str, status: str, actor: str = "") -> Task:
+        """Move a task to ``status`` through each intermediate state, journaling every step."""
+        task = self.active_tasks.get(task_id)
+        if not task:
+            raise ValueError(f"Task not found: {task_id}")
+        for transition in self.state_machine.path(task.status, status, task_id):
+            self.set_task_status(task_id, transition.target, actor=actor)
+        return task
+    
+    def get_project_tasks(self, project_id: str) -> List[Task]:
+        """Return a project's tasks in creation order, including completed tasks left in the store."""
+        if self.task_index.has_unloaded(project_id):
+            return [
+                self.active_tasks.get(data["id"]) or Task.from_dict(data)
+                for data in self.store.query_tasks(project_id=project_id)
+            ]
+        return [self.active_tasks[task_id] for task_id in self.task_index.tasks_for_project(project_id)]
+    
+    def get_ready_tasks(self, project_id: Optional[str] = None) -> List[Task]:
+        """Return tasks whose dependencies are complete and that have not started."""
+        return [self.active_tasks[task_id] for task_id in self.scheduler.ready(project_id)]
+    
+    def get_critical_path(self, project_id: str, durations: Optional[Dict[str, float]] = None) -> Tuple[float, List[Task]]:
+        """Return a project's longest dependency chain and its total duration.
+        
+        ``durations`` maps task ids to estimated durations (default 1 each);
+        the result is the workflow's end-to-end time with unlimited parallelism.
+        """
+        length, path = self.scheduler.critical_path(
+            durations or {}, self.task_index.tasks_for_project(project_id)
+        )
+        return length, [self.active_tasks[task_id] for task_id in path]
+    
+    def get_task_project(self, task_id: str) -> Optional[Project]:
+        """Return the project a task belongs to."""
+        return self.projects.get(self.task_index.project_of(task_id))
+    
+    def _generate_agent_prompt(self, agent: AgentPersona, task: Task, token_budget: Optional[int] = None) -> str:
         """Generate a prompt for the agent to work on the task."""
-        project = None
-        for p in self.projects.values():
-            if task.id.startswith(p.id):
-                project = p
-                break
-        
-        prompt = f"""
-# Agent Assignment: {agent.role}
-
-## Agent Persona
-{agent.content}
-
-## Task Assignment
-**Task ID**: {task.id}
-**Title**: {task.title}
-**Description**: {task.description}
-**Due Date**: {task.due_date or 'Not specified'}
-**Human Reviewer**: {task.human_reviewer}
-
-## Project Context
-**Project**: {project.name if project else 'Unknown'}
-**Project Type**: {project.type if project else 'Unknown'}
-**Current Phase**: {project.current_phase if project else 'Unknown'}
-
-## Standards to Follow
-You must adhere to all standards referenced in your persona, including:
-{chr(10).join(f"- ./development-standards/{ref}" for ref in agent.standards_references)}
-
-## Expected Deliverables
-{chr(10).join(f"- {deliverable}" for deliverable in task.deliverables)}
-
-## Instructions
-1. Review the project brief and relevant standards
-2. Complete the assigned task according to your persona guidelines
-3. Create all specified deliverables
-4. When complete, mark the task as "draft_ready" and notify the human reviewer
-5. Be prepared to incorporate feedback and make revisions as needed
-
-## Handoff Protocol
-When you complete this task:
-1. Update the task status to "draft_ready"
-2. Create a handoff document listing all deliverables
-3. Notify {task.human_reviewer} for review
-4. Wait for approval before proceeding to the next task
-
-Begin working on this task now.
-"""
+        project = self.get_task_project(task.id)
+        fields = {
+            "task_id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "due_date": task.due_date or 'Not specified',
+            "human_reviewer": task.human_reviewer,
+            "project_name": project.name if project else 'Unknown',
+            "project_type": project.type if project else 'Unknown',
+            "current_phase": project.current_phase if project else 'Unknown',
+            "deliverables": chr(10).join(f"- {deliverable}" for deliverable in task.deliverables),
+        }
         
-        return prompt
+        if token_budget is None:
+            # The standards field depends on the inline flag and the documents' contents
+            variant = (self.inline_standards, self.standards.signatures(agent.standards_references))
+            return self.prompt_templates.get(
+                agent, self.agent_registry.load_content, self._format_standards, variant=variant
+            ).render(fields)
+        return self._assemble_budgeted_prompt(agent, task, fields, token_budget)
+    
+    def _list_standards(self, agent: AgentPersona) -> str:
+        """List the agent's standards references, flagging missing and placeholder documents."""
+        lines = []
+        for ref, document in self.standards.resolve_many(agent.standards_references).items():
+            note = " (not found)" if document is None else " (no content yet)" if document.empty else ""
+            lines.append(f"- ./development-standards/{ref}{note}")
+        return "\n".join(lines)
+    
+    def _format_standards(self, agent: AgentPersona) -> str:
+        """Render the standards field, inlining document contents when ``inline_standards`` is set."""
+        listing = self._list_standards(agent)
+        if not self.inline_standards:
+            return listing
+        documents = self.standards.resolve_many(agent.standards_references).items()
+        return listing + "".join(
+            f"\n\n### {ref}\n{document.content}"
+            for ref, document in documents if document is not None and not document.empty
+        )
+    
+    def _assemble_budgeted_prompt(self, agent: AgentPersona, task: Task, fields: Dict[str, Any],
+                                  token_budget: int) -> str:
+        """Render a prompt whose persona and standards sections are pruned to fit ``token_budget``."""
+        listing = self._list_standards(agent)
+        frame = BASE_TEMPLATE.partial({"role": agent.role})
+        available = token_budget - self.prompt_assembler.count_tokens(
+            frame.render(dict(fields, persona="", standards=listing))
+        )
+        
+        sections = list(self.prompt_assembler.sections(agent.name, self.agent_registry.load_content(agent)))
+        documents = [
+            (ref, document)
+            for ref, document in self.standards.resolve_many(agent.standards_references).items()
+            if document is not None and not document.empty
+        ]
+        for ref, document in documents:
+            sections.extend(self.prompt_assembler.sections(ref, document.content, required=False))
+        selection = self.prompt_assembler.select(sections, f"{task.title} {task.description}", available)
+        
+        persona = selection.text(agent.name)
+        omitted = [section.title for section in selection.omitted if section.source == agent.name]
+        if omitted:
+            persona += "\n\n_Persona sections omitted for this task: " + ", ".join(omitted) + "_"
+        
+        standards = listing
+        for ref, _ in documents:
+            text = selection.text(ref)
+            if text:
+                standards += f"\n\n### {ref}\n{text}"
+        
+        return frame.render(dict(fields, persona=persona, standards=standards))
 
 class CommunicationHub:
     """Hub for managing communication between agents and humans."""
     
-    def __init__(self, workflow_engine: WorkflowEngine):
+    def __init__(self, workflow_engine: WorkflowEngine, max_messages: Optional[int] = DEFAULT_MAX_MESSAGES,
+                 message_retention: Optional[float] = None, spill_path: Optional[Path] = None,
+                 dispatcher: Optional[NotificationDispatcher] = None):
         self.workflow_engine = workflow_engine
-        self.message_log: List[Dict] = []
+        self.events = workflow_engine.events
+        self.dispatcher = dispatcher
+        self.message_log = MessageStore(max_messages, retention=message_retention, spill_path=spill_path)
+        # A bounded store keeps the same window; older messages are then only in the spill file
+        self.store.limit_messages(max_messages, message_retention)
         self.notifications: List[Dict] = []
+        self._history_truncated = False
+        self._load_recent_messages()
+    
+    @property
+    def store(self) -> StateStore:
+        """The workflow engine's state store, which also holds messages."""
+        return self.workflow_engine.store
+    
+    def _load_recent_messages(self) -> None:
+        """Seed the in-memory message log with the newest stored messages."""
+        limit = self.message_log.max_messages
+        try:
+            recent = self.store.query_messages(limit=limit + 1 if limit is not None else None)
+        except Exception as e:
+            logger.error(f"Failed to load message history: {e}")
+            self._history_truncated = True
+            return
+        if limit is not None and len(recent) > limit:
+            recent = recent[:limit]
+            self._history_truncated = True
+        self.message_log.extend(reversed(recent))
     
     def send_message(self, from_agent: str, to_agent: str, message: str, context: Dict = None) -> None:
         """Send a message between agents."""
@@ -460,7 +910,16 @@ class CommunicationHub:
             "type": "agent_communication"
         }
         
-        self.message_log.append(message_record)
+        self.message_log.add(message_record)
+        try:
+            self.store.append([make_record("message", message_record["id"], message_record)])
+            if self.store.needs_compaction():
+                self.store.compact()
+        except Exception as e:
+            logger.error(f"Failed to store message {message_record['id']}: {e}")
+        self.events.publish(Event(AGENT_MESSAGE, message_record, sender=from_agent, recipient=to_agent,
+                                  project_id=message_record["context"].get("project_id", ""),
+                                  id=message_record["id"], timestamp=message_record["timestamp"]))
         logger.info(f"Message sent from {from_agent} to {to_agent}")
     
     def notify_human(self, human_email: str, subject: str, message: str, urgency: str = "normal") -> None:
@@ -478,7 +937,11 @@ class CommunicationHub:
         
         self.notifications.append(notification)
         
-        # In a real implementation, this would send an actual email/Slack message
+        # The dispatcher batches notifications into per-recipient digests
+        if self.dispatcher is not None:
+            self.dispatcher.submit(notification)
+        self.events.publish(Event(HUMAN_NOTIFICATION, notification, recipient=human_email,
+                                  id=notification["id"], timestamp=notification["timestamp"]))
         logger.info(f"Notification queued for {human_email}: {subject}")
     
     def _generate_message_id(self) -> str:
@@ -487,22 +950,34 @@ class CommunicationHub:
         return f"msg_{uuid.uuid4().hex[:8]}"
     
     def get_conversation_history(self, agent_name: str, limit: int = 50) -> List[Dict]:
-        """Get conversation history for an agent."""
-        agent_messages = [
-            msg for msg in self.message_log
-            if msg["from"] == agent_name or msg["to"] == agent_name
-        ]
-        
-        return sorted(agent_messages, key=lambda x: x["timestamp"], reverse=True)[:limit]
+        """Get conversation history for an agent, newest first."""
+        messages = self.message_log.history(agent_name, limit=limit)
+        if len(messages) < limit and (self._history_truncated or not self.message_log.is_complete(agent_name)):
+            # Older messages were evicted from memory
+            if self.store.keeps_all_messages:
+                return self.store.query_messages(agent=agent_name, limit=limit)
+            messages.extend(self.message_log.spilled(agent_name, limit=limit - len(messages)))
+        return messages
 
 # Main orchestrator class
 class AgenticSDLC:
     """Main orchestrator for the Agentic SDLC system."""
     
-    def __init__(self, agents_dir: Path = Path("./sub-agents")):
-        self.agent_registry = AgentRegistry(agents_dir)
-        self.workflow_engine = WorkflowEngine(self.agent_registry)
-        self.communication_hub = CommunicationHub(self.workflow_engine)
+    def __init__(self, agents_dir: Path = Path("./sub-agents"), rebuild_cache: bool = False,
+                 metadata_only: bool = False, load_workers: Optional[int] = None,
+                 state_file: Path = Path("./workflow_state.json"), inline_standards: bool = False,
+                 notifier: Optional[NotificationDispatcher] = None, review_policy: str = LEAST_LOADED,
+                 reviewer_weights: Optional[Dict[str, float]] = None):
+        self.agent_registry = AgentRegistry(agents_dir, rebuild_cache=rebuild_cache,
+                                            metadata_only=metadata_only,
+                                            max_workers=load_workers)
+        self.workflow_engine = WorkflowEngine(self.agent_registry, state_file=state_file,
+                                              workflows=WorkflowLibrary(rebuild_cache=rebuild_cache),
+                                              inline_standards=inline_standards,
+                                              review_policy=review_policy, reviewer_weights=reviewer_weights)
+        self.communication_hub = CommunicationHub(
+            self.workflow_engine, dispatcher=notifier.start() if notifier is not None else None
+        )
     
     def initialize_project(self, project_brief_path: str) -> Project:
         """Initialize a new project from a project brief."""
@@ -519,6 +994,44 @@ class AgenticSDLC:
         
         return project
     
+    def initialize_projects(self, brief_pattern: str, start_workflows: bool = True,
+                            max_workers: Optional[int] = None) -> BatchResult:
+        """Create projects from a directory or glob of project briefs.
+        
+        Each product owner gets one notification for their projects and each
+        reviewer one notification listing all of their new tasks.
+        """
+        result = self.workflow_engine.create_projects(
+            expand_brief_paths(brief_pattern), start_workflows=start_workflows, max_workers=max_workers
+        )
+        
+        projects_by_owner: Dict[str, List[Project]] = {}
+        for project in result.projects:
+            projects_by_owner.setdefault(project.team.get("product_owner", ""), []).append(project)
+        for owner, projects in projects_by_owner.items():
+            self.communication_hub.notify_human(
+                owner,
+                f"{len(projects)} Projects Initialized",
+                "The following projects have been initialized and are ready to begin:\n"
+                + "\n".join(f"- {project.name} ({project.id})" for project in projects),
+                urgency="normal"
+            )
+        
+        tasks_by_reviewer: Dict[str, List[Task]] = {}
+        for task in result.tasks:
+            if task.human_reviewer:
+                tasks_by_reviewer.setdefault(task.human_reviewer, []).append(task)
+        for reviewer, tasks in tasks_by_reviewer.items():
+            self.communication_hub.notify_human(
+                reviewer,
+                f"{len(tasks)} Tasks Assigned",
+                "The following tasks will require your review:\n"
+                + "\n".join(f"- {task.title} ({task.id}, {task.agent})" for task in tasks),
+                urgency="normal"
+            )
+        
+        return result
+    
     def start_project_workflow(self, project_id: str) -> List[Task]:
         """Start the workflow for a project."""
         tasks = self.workflow_engine.start_workflow(project_id)
@@ -535,29 +1048,48 @@ class AgenticSDLC:
         
         return tasks
     
-    def execute_task(self, task_id: str) -> str:
+    def execute_task(self, task_id: str, token_budget: Optional[int] = None) -> str:
         """Execute a specific task."""
-        prompt = self.workflow_engine.assign_task(task_id)
+        prompt = self.workflow_engine.assign_task(task_id, token_budget=token_budget)
         
         # In a real implementation, this would interface with the actual AI model
         # For now, we return the prompt that would be sent to the AI
         return prompt
     
+    def create_executor(self, backend: ModelBackend, settings: Optional[ExecutorSettings] = None,
+                        auto_complete: bool = False) -> AsyncTaskExecutor:
+        """Create an asyncio executor that sends task prompts to a model backend."""
+        return AsyncTaskExecutor(self.workflow_engine, backend, settings, auto_complete=auto_complete)
+    
+    def execute_tasks(self, task_ids: List[str], backend: ModelBackend,
+                      settings: Optional[ExecutorSettings] = None) -> List[TaskResult]:
+        """Execute several tasks concurrently against a model backend."""
+        executor = self.create_executor(backend, settings)
+        return asyncio.run(executor.run_tasks(task_ids))
+    
+    def run_project_workflow(self, project_id: str, backend: ModelBackend,
+                             settings: Optional[ExecutorSettings] = None,
+                             auto_complete: bool = False) -> List[TaskResult]:
+        """Execute a project's ready tasks concurrently, following the dependency graph."""
+        executor = self.create_executor(backend, settings, auto_complete=auto_complete)
+        return asyncio.run(executor.run_workflow(project_id))
+    
+    def get_review_queues(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth, workload and review times for every human reviewer."""
+        return self.workflow_engine.review_queue.metrics()
+    
     def get_project_status(self, project_id: str) -> Dict:
         """Get the current status of a project."""
         project = self.workflow_engine.projects.get(project_id)
         if not project:
             raise ValueError(f"Project not found: {project_id}")
         
-        # Get all tasks for this project
-        project_tasks = [
-            task for task in self.workflow_engine.active_tasks.values()
-            if task.id.startswith(project.id)
-        ]
+        # Status counters are maintained incrementally by the task index
+        status_counts = self.workflow_engine.task_index.status_counts(project.id)
         
         # Calculate progress
-        completed_tasks = len([t for t in project_tasks if t.status == "completed"])
-        total_tasks = len(project_tasks)
+        completed_tasks = status_counts.get("completed", 0)
+        total_tasks = sum(status_counts.values())
         progress = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
         
         return {
@@ -567,8 +1099,12 @@ class AgenticSDLC:
             "progress": progress,
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
-            "active_tasks": len([t for t in project_tasks if t.status == "in_progress"]),
-            "pending_reviews": len([t for t in project_tasks if t.status == "draft_ready"])
+            "active_tasks": status_counts.get("in_progress", 0),
+            "pending_reviews": status_counts.get("draft_ready", 0),
+            "in_review": status_counts.get("under_review", 0),
+            "ready_tasks": self.workflow_engine.scheduler.ready_count(project.id),
+            "revisions": self.workflow_engine.status_view.transition_counts(project.id).get("request_revision", 0),
+            "last_activity": self.workflow_engine.status_view.last_activity(project.id)
         }
 
 # CLI interface for testing
@@ -580,11 +1116,15 @@ def main():
     parser.add_argument("command", choices=["list-agents", "create-project", "start-workflow", "status"])
     parser.add_argument("--project-brief", help="Path to project brief file")
     parser.add_argument("--project-id", help="Project ID for operations")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="Discard the compiled persona cache and re-parse all agents")
+    parser.add_argument("--state", default="./workflow_state.json",
+                        help="Workflow state file (.db/.sqlite selects the SQLite backend)")
     
     args = parser.parse_args()
     
     # Initialize the system
-    sdlc = AgenticSDLC()
+    sdlc = AgenticSDLC(rebuild_cache=args.rebuild_cache, state_file=Path(args.state))
     
     if args.command == "list-agents":
         agents = sdlc.agent_registry.list_agents()
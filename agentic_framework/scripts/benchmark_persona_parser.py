@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Persona Parser Benchmark
+
+Compares the single-pass persona parser against the previous four line-scan
+extractors over a synthetic corpus of agent personas.
+
+Usage:
+    python benchmark_persona_parser.py --personas 5000 --repeat 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.append(str(Path(__file__).parent))
+
+from persona_parser import parse_persona
+
+WORDS = [
+    "pipeline", "review", "deployment", "schema", "threat", "model", "metrics",
+    "backlog", "coverage", "latency", "contract", "migration", "dashboard",
+    "incident", "release", "observability", "requirements", "architecture",
+]
+STANDARDS = [
+    "coding_styleguide.md", "testing_strategy.md", "sre_handbook.md",
+    "iac_standards.md", "secure_coding_checklist.md", "user_story_template.md",
+]
+AGENTS = [
+    "software-developer-agent", "QA-engineer-agent", "devops-engineer-agent",
+    "security-expert-agent", "business-analyst-agent", "data-engineer-agent",
+]
+
+
+def _sentence(rng: random.Random, length: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+
+
+def generate_persona(rng: random.Random) -> str:
+    """Generate one synthetic persona shaped like the files in sub_agents/."""
+    lines = [
+        f"## Persona: {rng.choice(WORDS).title()} {rng.choice(WORDS).title()} AI Assistant",
+        "",
+        _sentence(rng, 30),
+        "",
+        "## Guiding Standards",
+        "",
+    ]
+    for standard in rng.sample(STANDARDS, 2):
+        lines.append(f"* **Source of Truth**: Follow `./development-standards/{standard}` at all times.")
+    lines += ["", "## Core Functions & Tasks", ""]
+    for i in range(1, rng.randint(4, 9)):
+        lines.append(f"{i}. **{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}**: {_sentence(rng, 20)}")
+    lines += ["", "## Interaction Protocol", ""]
+    for _ in range(3):
+        lines.append(f"* Collaborate with the {rng.choice(AGENTS)} when {_sentence(rng, 8)}")
+    for _ in range(rng.randint(10, 30)):
+        lines.append(_sentence(rng, 16))
+    return "\n".join(lines) + "\n"
+
+
+def legacy_parse(content: str) -> Dict[str, object]:
+    """The previous parser: one role scan plus three separate extractor scans."""
+    role = "Unknown"
+    for line in content.split('\n'):
+        if line.startswith("# Persona:"):
+            role = line.replace("# Persona:", "").strip()
+            break
+
+    capabilities = []
+    in_functions_section = False
+    for line in content.split('\n'):
+        if "## Core Functions" in line or "## Tasks" in line:
+            in_functions_section = True
+            continue
+        elif line.startswith("## ") and in_functions_section:
+            break
+        elif in_functions_section and line.strip().startswith(('1.', '2.', '3.', '4.', '-')):
+            capability = line.strip().lstrip('1234567890.- ').split(':')[0]
+            if capability:
+                capabilities.append(capability)
+
+    dependencies = []
+    for line in content.split('\n'):
+        if 'agent' in line.lower() and any(keyword in line.lower() for keyword in ['engage', 'collaborate', 'work with']):
+            for word in line.split():
+                if word.endswith('-agent'):
+                    dependencies.append(word.strip('`'))
+
+    standards = []
+    for line in content.split('\n'):
+        if 'development-standards' in line or './development-standards/' in line:
+            import re
+            standards.extend(re.findall(r'`\./development-standards/([^`]+)`', line))
+
+    return {
+        "role": role,
+        "capabilities": capabilities,
+        "dependencies": list(set(dependencies)),
+        "standards_references": list(set(standards)),
+    }
+
+
+def time_parser(parser: Callable[[str], object], corpus: List[str], repeat: int) -> float:
+    """Return the best wall-clock time of ``repeat`` runs over the corpus."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in corpus:
+            parser(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Benchmark the agent persona parser")
+    parser.add_argument("--personas", type=int, default=5000, help="Number of synthetic personas")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser (best is reported)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the corpus")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [generate_persona(rng) for _ in range(args.personas)]
+    total_kb = sum(len(c) for c in corpus) / 1024
+
+    legacy = time_parser(legacy_parse, corpus, args.repeat)
+    single_pass = time_parser(parse_persona, corpus, args.repeat)
+
+    print(f"Corpus: {len(corpus)} personas, {total_kb:.0f} KB")
+    print(f"Legacy extractors: {legacy * 1000:8.1f} ms")
+    print(f"Single-pass parser: {single_pass * 1000:8.1f} ms")
+    print(f"Speedup: {legacy / single_pass:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
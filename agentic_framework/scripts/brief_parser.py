@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Project Brief Parser
+
+Parses project briefs written from templates/project-brief-template.md into a
+typed ProjectBrief: name, checked project types, technology choices, team,
+timeline and constraints. Results are memoized by content hash in memory and
+cached under .agentic-state/, so unchanged briefs are never parsed twice.
+"""
+
+import copy
+import hashlib
+import re
+import sys
+import threading
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+sys.path.append(str(Path(__file__).parent))
+
+from file_cache import FileCache, DEFAULT_STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsing changes to invalidate cached briefs
+PARSER_VERSION = "1"
+
+# Project Type checkbox labels (matched by prefix, case-insensitively) and the project type they select
+PROJECT_TYPES = (
+    ("web application", "web_app"),
+    ("rest api", "api"),
+    ("data dashboard", "dashboard"),
+    ("ml model", "ml_model"),
+    ("data pipeline", "data_pipeline"),
+    ("cli tool", "cli"),
+    ("other", "other"),
+)
+
+# Backend frameworks that imply a project type when no Project Type box is checked
+FRAMEWORK_TYPES = (
+    ("fastapi", "api"),
+    ("streamlit", "dashboard"),
+    ("django", "web_app"),
+    ("flask", "web_app"),
+)
+
+# Team roles that can review an agent's work, in order of preference, for
+# agents whose name does not match a team role directly
+REVIEWER_ALIASES = {
+    "software_developer": ("lead_developer",),
+    "business_analyst": ("product_owner",),
+    "test_automation_expert": ("qa_engineer",),
+    "test_manager": ("qa_engineer",),
+    "ui_designer": ("ui_ux_designer",),
+    "ux_research": ("ux_researcher", "ui_ux_designer"),
+    "data_engineer": ("database_engineer", "lead_developer"),
+    "cloud_engineer": ("devops_engineer",),
+    "site_reliability_engineer": ("devops_engineer",),
+    "networks_engineer": ("network_engineer", "devops_engineer"),
+    "project_manager": ("product_owner",),
+    "scrum_master": ("product_owner",),
+    "technical_writer": ("product_owner",),
+}
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_CHECKBOX_RE = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+\[([ xX])\]\s*(.*)$")
+_FIELD_RE = re.compile(r"^\s*(?:[-*+]|\d+\.)?\s*(?:\[[ xX]\]\s*)?\*\*(.+?)\*\*\s*:?\s*(.*)$")
+_PLACEHOLDER_RE = re.compile(r"^(\[[^\]]*\]|[_$\s/.:-]*|yes/no)$", re.IGNORECASE)
+
+
+def normalize_role(role: str) -> str:
+    """Turn a team role such as "UI/UX Designer" into a key such as "ui_ux_designer"."""
+    return "_".join(re.findall(r"[a-z0-9]+", role.lower()))
+
+
+def _is_placeholder(value: str) -> bool:
+    value = value.strip()
+    return not value or "___" in value or bool(_PLACEHOLDER_RE.match(value))
+
+
+@dataclass
+class TeamMember:
+    """A person named in the brief's team section."""
+    role: str
+    name: str = ""
+    contact: str = ""
+
+    @property
+    def address(self) -> str:
+        """How to reach the member: their contact if given, else their name."""
+        return self.contact or self.name
+
+
+@dataclass
+class ProjectBrief:
+    """Structured contents of a project brief."""
+    name: str = ""
+    type: str = ""
+    project_types: List[str] = field(default_factory=list)
+    technology: Dict[str, List[str]] = field(default_factory=dict)
+    team: Dict[str, TeamMember] = field(default_factory=dict)
+    timeline: Dict[str, str] = field(default_factory=dict)
+    milestones: Dict[str, str] = field(default_factory=dict)
+    constraints: Dict[str, Any] = field(default_factory=dict)
+
+    def to_project_data(self) -> Dict[str, Any]:
+        """Return the fields used to create a Project."""
+        data: Dict[str, Any] = {"team": {key: member.address for key, member in self.team.items()}}
+        if self.name:
+            data["name"] = self.name
+        if self.type:
+            data["type"] = self.type
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProjectBrief":
+        data = copy.deepcopy(data)
+        data["team"] = {key: TeamMember(**member) for key, member in data.get("team", {}).items()}
+        return cls(**data)
+
+
+def reviewers_for_agent(team: Dict[str, str], agent_name: str) -> List[str]:
+    """Return the team members who can review an agent's work, in order of preference."""
+    key = normalize_role(agent_name[:-len("-agent")] if agent_name.endswith("-agent") else agent_name)
+    reviewers: List[str] = []
+    for candidate in (key,) + REVIEWER_ALIASES.get(key, ()):
+        if team.get(candidate) and team[candidate] not in reviewers:
+            reviewers.append(team[candidate])
+    return reviewers
+
+
+def reviewer_for_agent(team: Dict[str, str], agent_name: str) -> str:
+    """Return the team member who reviews an agent's work, or "" if there is none."""
+    reviewers = reviewers_for_agent(team, agent_name)
+    return reviewers[0] if reviewers else ""
+
+
+def split_markdown_sections(content: str) -> List[Tuple[int, str, List[str]]]:
+    """Split markdown into ``(level, title, lines)`` per heading, ignoring fenced code."""
+    sections: List[Tuple[int, str, List[str]]] = [(0, "", [])]
+    in_code = False
+    for line in content.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        match = None if in_code else _HEADING_RE.match(line)
+        if match:
+            sections.append((len(match.group(1)), match.group(2).strip(), []))
+        else:
+            sections[-1][2].append(line)
+    return sections
+
+
+def _section_lines(sections: List[Tuple[int, str, List[str]]], title: str) -> Optional[List[str]]:
+    """Return the lines of a section and its subsections, or None if it is absent."""
+    wanted = title.lower()
+    for index, (level, heading, lines) in enumerate(sections):
+        if heading.lower() == wanted:
+            collected = list(lines)
+            for sub_level, sub_heading, sub_lines in sections[index + 1:]:
+                if sub_level <= level:
+                    break
+                collected.append(f"{'#' * sub_level} {sub_heading}")
+                collected.extend(sub_lines)
+            return collected
+    return None
+
+
+def _checked_items(lines: List[str]) -> Dict[str, List[str]]:
+    """Group checked checkbox labels under the bold label that precedes them."""
+    groups: Dict[str, List[str]] = {}
+    group = ""
+    for line in lines:
+        checkbox = _CHECKBOX_RE.match(line)
+        if checkbox:
+            if checkbox.group(1) in "xX" and not _is_placeholder(checkbox.group(2)):
+                groups.setdefault(group, []).append(checkbox.group(2).strip())
+            continue
+        label = _FIELD_RE.match(line)
+        if label and not label.group(2).strip():
+            group = label.group(1).strip().rstrip(":")
+    return groups
+
+
+def _fields(lines: List[str]) -> Dict[str, str]:
+    """Collect ``**Key**: value`` pairs whose value has been filled in."""
+    fields = {}
+    for line in lines:
+        if _CHECKBOX_RE.match(line):
+            continue
+        match = _FIELD_RE.match(line)
+        if match and not _is_placeholder(match.group(2)):
+            fields[match.group(1).strip().rstrip(":")] = match.group(2).strip()
+    return fields
+
+
+def _first_text(lines: List[str]) -> str:
+    for line in lines:
+        text = line.strip()
+        if text and not _is_placeholder(text):
+            return text
+    return ""
+
+
+def _team_member(role: str, details: str) -> Optional[TeamMember]:
+    if _is_placeholder(details):
+        return None
+    name, _, contact = details.partition(" - ")
+    name = "" if _is_placeholder(name) else name.strip()
+    contact = "" if _is_placeholder(contact) else contact.strip()
+    if not name and not contact:
+        return None
+    return TeamMember(role=role, name=name, contact=contact)
+
+
+def _parse_team(lines: List[str]) -> Dict[str, TeamMember]:
+    """Read team members from ``**Role**: Name - Contact`` bullets or a Role/Name/Contact table."""
+    team: Dict[str, TeamMember] = {}
+    header: Optional[List[str]] = None
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("|"):
+            cells = [cell.strip() for cell in stripped.strip("|").split("|")]
+            if header is None:
+                header = [normalize_role(cell) for cell in cells]
+            elif not all(set(cell) <= set("-: ") for cell in cells):
+                row = dict(zip(header, cells))
+                role = row.get("role", "")
+                member = _team_member(role, f"{row.get('name', '')} - {row.get('contact', row.get('email', ''))}")
+                if role and member:
+                    team.setdefault(normalize_role(role), member)
+            continue
+        header = None
+        match = _FIELD_RE.match(line)
+        if match:
+            member = _team_member(match.group(1).strip().rstrip(":"), match.group(2))
+            if member:
+                team.setdefault(normalize_role(member.role), member)
+    return team
+
+
+def _project_type(project_types: List[str], technology: Dict[str, List[str]], content: str) -> str:
+    for label in project_types:
+        for prefix, project_type in PROJECT_TYPES:
+            if label.lower().startswith(prefix):
+                return project_type
+    # Briefs that only tick a framework, e.g. "- [x] FastAPI"
+    checked = technology.get("Backend Framework") or [
+        item for items in _checked_items(content.splitlines()).values() for item in items
+    ]
+    for item in checked:
+        for framework, project_type in FRAMEWORK_TYPES:
+            if framework in item.lower():
+                return project_type
+    return ""
+
+
+def parse_brief(content: str) -> ProjectBrief:
+    """Parse the text of a project brief."""
+    sections = split_markdown_sections(content)
+    section = lambda title: _section_lines(sections, title) or []
+
+    brief = ProjectBrief()
+    brief.name = _first_text(section("Project Name"))
+    if not brief.name:
+        titles = [heading for level, heading, _ in sections if level == 1]
+        brief.name = next((title for title in titles if "Project" in title), titles[0] if titles else "")
+
+    brief.project_types = _checked_items(section("Project Type")).get("", [])
+    brief.technology = {
+        group or "Other": items for group, items in _checked_items(section("Technology Stack")).items()
+    }
+    brief.type = _project_type(brief.project_types, brief.technology, content)
+
+    brief.team = _parse_team(section("Core Team Roles") + section("Additional Specialists (if needed)")
+                             or section("Team & Resources"))
+    brief.timeline = _fields(section("Target Dates"))
+    brief.milestones = _fields(section("Key Milestones"))
+
+    constraints: Dict[str, Any] = {}
+    for key, title in (("performance", "Performance Requirements"), ("budget", "Budget & Resources")):
+        values = _fields(section(title))
+        if values:
+            constraints[key] = values
+    for key, title in (("security", "Security & Compliance"),
+                       ("architecture", "System Architecture Approach"),
+                       ("dependencies", "Dependencies")):
+        checked = _checked_items(section(title))
+        if checked:
+            constraints[key] = checked.get("", []) if list(checked) == [""] else checked
+    out_of_scope = [line.strip().lstrip("-*+ ").strip() for line in section("Out of Scope")]
+    out_of_scope = [item for item in out_of_scope if not _is_placeholder(item)]
+    if out_of_scope:
+        constraints["out_of_scope"] = out_of_scope
+    brief.constraints = constraints
+    return brief
+
+
+def parse_brief_data(content: str) -> Dict[str, Any]:
+    """Parse brief text into the dict form of a ProjectBrief (picklable for process pools)."""
+    return parse_brief(content).to_dict()
+
+
+class BriefParser:
+    """Memoizing project brief parser.
+
+    Parsed briefs are kept in memory by content hash and in a FileCache keyed
+    by path, so an unchanged brief is not even read again in later processes.
+    """
+
+    DEFAULT_CACHE_PATH = DEFAULT_STATE_DIR / "brief-cache.pkl"
+
+    def __init__(self, cache_path: Optional[Path] = DEFAULT_CACHE_PATH):
+        self.cache = FileCache(cache_path, version=PARSER_VERSION) if cache_path is not None else None
+        self._parsed: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.parses = 0
+
+    def parse_file(self, brief_path: Path, pool: Optional[Executor] = None) -> ProjectBrief:
+        """Parse a brief file, reusing the result for unchanged content.
+
+        Briefs that are not cached are parsed on ``pool`` when one is given.
+        """
+        cached = self.cache.get(brief_path) if self.cache is not None else None
+        if cached is None:
+            data = brief_path.read_bytes()
+            cached = self.cache.get(brief_path, data) if self.cache is not None else None
+            if cached is None:
+                cached = self._parse_bytes(data, pool)
+                if self.cache is not None:
+                    self.cache.put(brief_path, data, cached)
+        return ProjectBrief.from_dict(cached)
+
+    def parse(self, content: str) -> ProjectBrief:
+        """Parse brief text, reusing the result for content seen before."""
+        return ProjectBrief.from_dict(self._parse_bytes(content.encode('utf-8')))
+
+    def _parse_bytes(self, data: bytes, pool: Optional[Executor] = None) -> Dict[str, Any]:
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            parsed = self._parsed.get(digest)
+        if parsed is None:
+            content = data.decode('utf-8')
+            if pool is not None:
+                parsed = pool.submit(parse_brief_data, content).result()
+            else:
+                parsed = parse_brief_data(content)
+            with self._lock:
+                self._parsed[digest] = parsed
+                self.parses += 1
+        return parsed
+
+    def save(self) -> None:
+        """Write the on-disk cache if it changed."""
+        if self.cache is not None:
+            self.cache.save()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Agent Capability Index
+
+Inverted index over agent capabilities used by AgentRegistry for task
+routing. Capabilities are indexed by character trigrams (substring lookups)
+and by word tokens (prefix lookups and ranked multi-term search), and the
+index is updated incrementally as agents are added, reloaded or removed.
+"""
+
+import bisect
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+NGRAM_SIZE = 3
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Per-term scores used by CapabilityIndex.search
+EXACT_TOKEN_SCORE = 1.0
+PREFIX_TOKEN_SCORE = 0.75
+SUBSTRING_SCORE = 0.5
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class CapabilityIndex:
+    """Inverted index from capability trigrams and tokens to agent names.
+
+    Matching is case-insensitive. Results preserve the order in which agents
+    were first added, so lookups return agents in registry order.
+    """
+
+    def __init__(self):
+        self._capabilities: Dict[str, List[str]] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._ngram_postings: Dict[str, Set[str]] = defaultdict(set)
+        self._token_postings: Dict[str, Set[str]] = defaultdict(set)
+        self._sorted_tokens: List[str] = []
+
+    def add(self, agent_name: str, capabilities: Iterable[str]) -> None:
+        """Index an agent's capabilities, replacing any previous entry."""
+        if agent_name in self._capabilities:
+            self._unindex(agent_name)
+        else:
+            self._order[agent_name] = self._next_order
+            self._next_order += 1
+
+        lowered = [cap.lower() for cap in capabilities]
+        self._capabilities[agent_name] = lowered
+        for cap in lowered:
+            for gram in _ngrams(cap):
+                self._ngram_postings[gram].add(agent_name)
+            for token in _TOKEN_RE.findall(cap):
+                postings = self._token_postings[token]
+                if not postings:
+                    bisect.insort(self._sorted_tokens, token)
+                postings.add(agent_name)
+
+    def remove(self, agent_name: str) -> None:
+        """Remove an agent from the index."""
+        if agent_name in self._capabilities:
+            self._unindex(agent_name)
+            del self._capabilities[agent_name]
+            del self._order[agent_name]
+
+    def _unindex(self, agent_name: str) -> None:
+        for cap in self._capabilities[agent_name]:
+            for gram in _ngrams(cap):
+                postings = self._ngram_postings.get(gram)
+                if postings is not None:
+                    postings.discard(agent_name)
+                    if not postings:
+                        del self._ngram_postings[gram]
+            for token in _TOKEN_RE.findall(cap):
+                postings = self._token_postings.get(token)
+                if postings is not None:
+                    postings.discard(agent_name)
+                    if not postings:
+                        del self._token_postings[token]
+                        del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+
+    def _ordered(self, agent_names: Iterable[str]) -> List[str]:
+        return sorted(agent_names, key=self._order.__getitem__)
+
+    def _substring_candidates(self, query: str) -> Set[str]:
+        # Queries shorter than a trigram cannot use the n-gram postings and
+        # fall back to verifying every agent.
+        if len(query) < NGRAM_SIZE:
+            return set(self._capabilities)
+
+        postings = []
+        for gram in _ngrams(query):
+            posting = self._ngram_postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def _substring_matches(self, query: str) -> Set[str]:
+        return {
+            name for name in self._substring_candidates(query)
+            if any(query in cap for cap in self._capabilities[name])
+        }
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        matches: Set[str] = set()
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            matches |= self._token_postings[token]
+        return matches
+
+    def find(self, substring: str) -> List[str]:
+        """Return agents with a capability containing ``substring``."""
+        return self._ordered(self._substring_matches(substring.lower()))
+
+    def find_prefix(self, prefix: str) -> List[str]:
+        """Return agents with a capability word starting with ``prefix``."""
+        return self._ordered(self._prefix_matches(prefix.lower()))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Rank agents against every word of ``query``.
+
+        Each term scores an agent by its best match: an exact capability word,
+        a word prefix, or a substring of a capability. Results are sorted by
+        total score, then by registry order.
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        for term in dict.fromkeys(_TOKEN_RE.findall(query.lower())):
+            term_scores: Dict[str, float] = {}
+            for name in self._substring_matches(term):
+                term_scores[name] = SUBSTRING_SCORE
+            for name in self._prefix_matches(term):
+                term_scores[name] = PREFIX_TOKEN_SCORE
+            for name in self._token_postings.get(term, ()):
+                term_scores[name] = EXACT_TOKEN_SCORE
+            for name, score in term_scores.items():
+                scores[name] += score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._order[item[0]]))
+        return ranked[:limit] if limit is not None else ranked
+
+    def __contains__(self, agent_name: str) -> bool:
+        return agent_name in self._capabilities
+
+    def __len__(self) -> int:
+        return len(self._capabilities)
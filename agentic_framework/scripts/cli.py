@@ -8,18 +8,28 @@ Simple CLI wrapper for managing the agentic SDLC workflows.
 import sys
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 # Add the scripts directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
 from agent_integration import AgenticSDLC
+from notification_dispatcher import NotificationDispatcher, open_transport
+from quality_gates import FAILED, PARTIAL, PASSED, QualityGateEngine, format_results
+from review_queue import ASSIGNMENT_POLICIES, LEAST_LOADED
 
 class AgenticSDLCCLI:
     """Command line interface for Agentic SDLC."""
     
-    def __init__(self):
-        self.sdlc = AgenticSDLC()
+    def __init__(self, rebuild_cache: bool = False, load_workers: Optional[int] = None,
+                 state_file: Path = Path("./workflow_state.json"), inline_standards: bool = False,
+                 notifier: Optional[NotificationDispatcher] = None, review_policy: str = LEAST_LOADED,
+                 reviewer_weights: Optional[Dict[str, float]] = None):
+        # Persona bodies are only needed when a task prompt is generated
+        self.sdlc = AgenticSDLC(rebuild_cache=rebuild_cache, metadata_only=True,
+                                load_workers=load_workers, state_file=state_file,
+                                inline_standards=inline_standards, notifier=notifier,
+                                review_policy=review_policy, reviewer_weights=reviewer_weights)
     
     def list_agents(self) -> None:
         """List all available agents."""
@@ -68,11 +78,50 @@ class AgenticSDLCCLI:
                 print(f"    Agent: {task.agent}")
                 print(f"    Reviewer: {task.human_reviewer or 'Not assigned'}")
                 print(f"    Status: {task.status}")
+                if task.dependencies:
+                    print(f"    Depends on: {', '.join(task.dependencies)}")
                 print()
+            
+            ready = self.sdlc.workflow_engine.get_ready_tasks(project_id)
+            print(f"▶️  Ready to start now: {', '.join(task.id for task in ready)}")
                 
         except Exception as e:
             print(f"❌ Error starting workflow: {e}")
     
+    def bulk_create(self, brief_pattern: str, start_workflows: bool = True,
+                    workers: Optional[int] = None) -> None:
+        """Create projects from a directory or glob of project briefs."""
+        try:
+            result = self.sdlc.initialize_projects(brief_pattern, start_workflows=start_workflows,
+                                                   max_workers=workers)
+            
+            print(f"📦 Bulk Project Creation: {brief_pattern}")
+            print("=" * 60)
+            print(f"✅ Projects created: {len(result.projects)}")
+            print(f"📋 Tasks created: {len(result.tasks)}")
+            print(f"❌ Failed briefs: {len(result.errors)}")
+            
+            workflows: Dict[str, int] = {}
+            for project in result.projects:
+                workflows[project.workflow] = workflows.get(project.workflow, 0) + 1
+            for workflow, count in sorted(workflows.items()):
+                print(f"   {workflow}: {count} projects")
+            
+            if result.projects:
+                print()
+                print("📁 Projects:")
+                for project in result.projects:
+                    print(f"   {project.id}: {project.name} ({project.brief_path})")
+            
+            if result.errors:
+                print()
+                print("⚠️  Failures:")
+                for brief_path, error in result.errors.items():
+                    print(f"   {brief_path}: {error}")
+                    
+        except Exception as e:
+            print(f"❌ Error creating projects: {e}")
+    
     def show_status(self, project_id: str) -> None:
         """Show project status."""
         try:
@@ -85,12 +134,10 @@ class AgenticSDLCCLI:
             print(f"✅ Completed: {status['completed_tasks']}")
             print(f"🔄 Active: {status['active_tasks']}")
             print(f"⏳ Pending Review: {status['pending_reviews']}")
+            print(f"▶️  Ready to Start: {status['ready_tasks']}")
             
             # Show detailed task breakdown
-            project_tasks = [
-                task for task in self.sdlc.workflow_engine.active_tasks.values()
-                if task.id.startswith(project_id)
-            ]
+            project_tasks = self.sdlc.workflow_engine.get_project_tasks(project_id)
             
             if project_tasks:
                 print()
@@ -102,6 +149,7 @@ class AgenticSDLCCLI:
                         "in_progress": "🔄", 
                         "draft_ready": "⏳",
                         "under_review": "👀",
+                        "approved": "👍",
                         "completed": "✅",
                         "revision_requested": "🔄"
                     }.get(task.status, "❓")
@@ -116,10 +164,34 @@ class AgenticSDLCCLI:
         except Exception as e:
             print(f"❌ Error getting project status: {e}")
     
-    def execute_task(self, task_id: str) -> None:
+    def show_review_queues(self) -> None:
+        """Show each human reviewer's queue depth and review times."""
+        try:
+            queues = self.sdlc.get_review_queues()
+        except Exception as e:
+            print(f"❌ Error getting review queues: {e}")
+            return
+        
+        print("👀 Review Queues")
+        print("=" * 60)
+        if not queues:
+            print("No tasks are assigned to reviewers.")
+            return
+        for reviewer, metrics in sorted(queues.items(), key=lambda item: -item[1]["load"]):
+            print(f"{reviewer}")
+            print(f"   Queue: {metrics['queue_depth']} "
+                  f"(⏳ {metrics['draft_ready']} draft ready, 👀 {metrics['under_review']} under review)")
+            print(f"   Open tasks: {metrics['open_tasks']} (load {metrics['load']:.1f}, weight {metrics['weight']:g})")
+            if metrics["queue_depth"]:
+                print(f"   Oldest waiting: {metrics['oldest_wait'] / 3600:.1f}h")
+            if metrics["mean_review_time"] is not None:
+                print(f"   Mean review time: {metrics['mean_review_time'] / 3600:.1f}h over {metrics['reviews']} reviews")
+            print()
+    
+    def execute_task(self, task_id: str, max_tokens: Optional[int] = None) -> None:
         """Execute a specific task."""
         try:
-            prompt = self.sdlc.execute_task(task_id)
+            prompt = self.sdlc.execute_task(task_id, token_budget=max_tokens)
             print(f"🤖 Task Execution Started")
             print(f"Task ID: {task_id}")
             print()
@@ -134,6 +206,28 @@ class AgenticSDLCCLI:
         except Exception as e:
             print(f"❌ Error executing task: {e}")
     
+    def check_gates(self, gate_ids: Optional[List[str]] = None, workflow: Optional[str] = None,
+                    workers: Optional[int] = None, use_cache: bool = True) -> bool:
+        """Run quality gate automated checks and record the results in workflow state."""
+        try:
+            engine = QualityGateEngine(max_workers=workers, use_cache=use_cache)
+            results = engine.evaluate(gate_ids, workflow)
+        except Exception as e:
+            print(f"❌ Error checking quality gates: {e}")
+            return False
+        
+        print("🚦 Quality Gates")
+        print("=" * 50)
+        for line in format_results(results):
+            print(line)
+        statuses = [result.status for result in results]
+        checks = [check for result in results for check in result.checks]
+        print()
+        print(f"{statuses.count(PASSED)}/{len(results)} gates passed, {statuses.count(PARTIAL)} partial "
+              f"(skipped checks need manual review), {statuses.count(FAILED)} failed "
+              f"({sum(1 for check in checks if not check.cached)} of {len(checks)} checks re-run)")
+        return FAILED not in statuses
+    
     def interactive_mode(self) -> None:
         """Run in interactive mode."""
         print("🚀 Agentic SDLC Interactive Mode")
@@ -141,6 +235,7 @@ class AgenticSDLCCLI:
         print("Commands:")
         print("  list-agents - Show available agents")
         print("  create-project <path> - Create new project")
+        print("  bulk-create <dir-or-glob> - Create projects from many briefs")
         print("  start-workflow <project-id> - Start project workflow")
         print("  status <project-id> - Show project status")
         print("  execute-task <task-id> - Execute a specific task")
@@ -162,7 +257,7 @@ class AgenticSDLCCLI:
                     print("👋 Goodbye!")
                     break
                 elif cmd == "help":
-                    print("Available commands: list-agents, create-project, start-workflow, status, execute-task, help, exit")
+                    print("Available commands: list-agents, create-project, bulk-create, start-workflow, status, execute-task, help, exit")
                 elif cmd == "list-agents":
                     self.list_agents()
                 elif cmd == "create-project":
@@ -170,6 +265,11 @@ class AgenticSDLCCLI:
                         print("❌ Usage: create-project <path-to-project-brief>")
                     else:
                         self.create_project(parts[1])
+                elif cmd == "bulk-create":
+                    if len(parts) < 2:
+                        print("❌ Usage: bulk-create <briefs-directory-or-glob>")
+                    else:
+                        self.bulk_create(parts[1])
                 elif cmd == "start-workflow":
                     if len(parts) < 2:
                         print("❌ Usage: start-workflow <project-id>")
@@ -206,6 +306,23 @@ def main():
         description="Agentic SDLC Management System",
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="Discard the compiled persona cache and re-parse all agents")
+    parser.add_argument("--load-workers", type=int, default=None,
+                        help="Number of threads used to load agent personas")
+    parser.add_argument("--state", default="./workflow_state.json",
+                        help="Workflow state file (.db/.sqlite selects the SQLite backend)")
+    parser.add_argument("--inline-standards", action="store_true",
+                        help="Include the contents of referenced standards documents in task prompts")
+    parser.add_argument("--notify", metavar="URL", default=None,
+                        help="Deliver notifications via smtp://, http(s)://, file:// or memory: "
+                             "(default: queue them only)")
+    parser.add_argument("--digest-interval", type=float, default=30.0,
+                        help="Seconds to collect notifications into one digest per recipient")
+    parser.add_argument("--review-policy", choices=ASSIGNMENT_POLICIES, default=LEAST_LOADED,
+                        help="How new tasks are assigned among eligible human reviewers")
+    parser.add_argument("--reviewer-weight", action="append", default=[], metavar="REVIEWER=WEIGHT",
+                        help="Review capacity of a reviewer for the weighted policy (repeatable)")
     
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
@@ -216,6 +333,15 @@ def main():
     create_parser = subparsers.add_parser("create-project", help="Create a new project")
     create_parser.add_argument("project_brief", help="Path to project brief file")
     
+    # Bulk create command
+    bulk_parser = subparsers.add_parser("bulk-create",
+                                        help="Create projects from a directory or glob of project briefs")
+    bulk_parser.add_argument("briefs", help="Directory of briefs or glob pattern, e.g. 'briefs/**/*.md'")
+    bulk_parser.add_argument("--no-start", action="store_true",
+                             help="Create the projects without starting their workflows")
+    bulk_parser.add_argument("--workers", type=int, default=None,
+                             help="Number of threads used to parse briefs")
+    
     # Start workflow command  
     start_parser = subparsers.add_parser("start-workflow", help="Start workflow for a project")
     start_parser.add_argument("project_id", help="Project ID")
@@ -227,13 +353,45 @@ def main():
     # Execute task command
     execute_parser = subparsers.add_parser("execute-task", help="Execute a specific task")
     execute_parser.add_argument("task_id", help="Task ID")
+    execute_parser.add_argument("--max-tokens", type=int, default=None,
+                                help="Token budget for the prompt; prunes persona and standards sections "
+                                     "least relevant to the task")
+    
+    # Check gates command
+    gates_parser = subparsers.add_parser("check-gates", help="Run quality gate automated checks")
+    gates_parser.add_argument("gates", nargs="*",
+                              help="Gate ids or numbers, e.g. '3' or 'security_gate' (default: all)")
+    gates_parser.add_argument("--workflow", choices=["software_systems", "data_science"], default=None,
+                              help="Only evaluate the gates of this workflow")
+    gates_parser.add_argument("--workers", type=int, default=None,
+                              help="Number of processes used to run checks")
+    gates_parser.add_argument("--no-cache", action="store_true",
+                              help="Re-run checks even if their input files are unchanged")
+    
+    # Review queues command
+    subparsers.add_parser("review-queues", help="Show human reviewers' queue depth and review times")
     
     # Interactive mode command
     subparsers.add_parser("interactive", help="Run in interactive mode")
     
     args = parser.parse_args()
     
-    cli = AgenticSDLCCLI()
+    notifier = None
+    if args.notify:
+        notifier = NotificationDispatcher(open_transport(args.notify), digest_interval=args.digest_interval)
+    reviewer_weights = {}
+    for item in args.reviewer_weight:
+        reviewer, _, weight = item.rpartition("=")
+        try:
+            if not reviewer:
+                raise ValueError(item)
+            reviewer_weights[reviewer] = float(weight)
+        except ValueError:
+            parser.error(f"Invalid --reviewer-weight '{item}', expected REVIEWER=WEIGHT")
+    cli = AgenticSDLCCLI(rebuild_cache=args.rebuild_cache, load_workers=args.load_workers,
+                         state_file=Path(args.state), inline_standards=args.inline_standards,
+                         notifier=notifier, review_policy=args.review_policy,
+                         reviewer_weights=reviewer_weights)
     
     if not args.command:
         # No command provided, show help and enter interactive mode
@@ -247,12 +405,19 @@ def main():
         cli.list_agents()
     elif args.command == "create-project":
         cli.create_project(args.project_brief)
+    elif args.command == "bulk-create":
+        cli.bulk_create(args.briefs, start_workflows=not args.no_start, workers=args.workers)
     elif args.command == "start-workflow":
         cli.start_workflow(args.project_id)
     elif args.command == "status":
         cli.show_status(args.project_id)
     elif args.command == "execute-task":
-        cli.execute_task(args.task_id)
+        cli.execute_task(args.task_id, max_tokens=args.max_tokens)
+    elif args.command == "check-gates":
+        if not cli.check_gates(args.gates, args.workflow, workers=args.workers, use_cache=not args.no_cache):
+            sys.exit(1)
+    elif args.command == "review-queues":
+        cli.show_review_queues()
     elif args.command == "interactive":
         cli.interactive_mode()
 
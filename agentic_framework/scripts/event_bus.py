@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Agent Event Bus
+
+In-process publish/subscribe for agent messages, notifications and task
+lifecycle events. Subscribers filter by event type, agent (sender or
+recipient) and project. Subscriptions made inside a running asyncio event
+loop receive events through a bounded asyncio.Queue drained on that loop, so
+publishing never blocks the publisher; other subscriptions fall back to
+calling their handler synchronously in the publishing thread (a coroutine
+handler is then scheduled on the publisher's loop, if it has one).
+"""
+
+import asyncio
+import inspect
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Event types published by CommunicationHub and WorkflowEngine
+AGENT_MESSAGE = "agent_communication"
+HUMAN_NOTIFICATION = "human_notification"
+TASK_STATUS = "task_status"
+TASK_READY = "task_ready"
+
+# What to do when an asynchronous subscriber's queue is full
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+DEFAULT_QUEUE_SIZE = 1000
+
+
+@dataclass
+class Event:
+    """Something that happened, addressed by type, agents and project."""
+    type: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    sender: str = ""
+    recipient: str = ""
+    project_id: str = ""
+    id: str = field(default_factory=lambda: f"evt_{uuid.uuid4().hex[:8]}")
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+Handler = Callable[[Event], Union[None, Awaitable[None]]]
+
+
+class Subscription:
+    """A subscriber's filters and delivery channel; returned by ``EventBus.subscribe``.
+
+    Without a handler, asynchronous subscriptions are consumed with
+    ``await subscription.get()`` or ``async for event in subscription``.
+    """
+
+    def __init__(self, bus: "EventBus", handler: Optional[Handler], type: Optional[str],
+                 agent: Optional[str], project_id: Optional[str],
+                 loop: Optional[asyncio.AbstractEventLoop], maxsize: int, overflow: str):
+        self.bus = bus
+        self.handler = handler
+        self.type = type
+        self.agent = agent
+        self.project_id = project_id
+        self.loop = loop
+        self.overflow = overflow
+        self.queue: Optional[asyncio.Queue] = asyncio.Queue(maxsize) if loop is not None else None
+        self.delivered = 0
+        self.dropped = 0
+        self.active = True
+        self._consumer: Optional[asyncio.Task] = None
+        self._handler_tasks: Set[asyncio.Future] = set()
+        if loop is not None and handler is not None:
+            self._consumer = loop.create_task(self._consume())
+
+    def matches(self, event: Event) -> bool:
+        if self.type is not None and event.type != self.type:
+            return False
+        if self.agent is not None and self.agent not in (event.sender, event.recipient):
+            return False
+        return self.project_id is None or event.project_id == self.project_id
+
+    def _deliver(self, event: Event) -> None:
+        if self.queue is None:
+            self._call_handler(event)
+            return
+        try:
+            if asyncio.get_running_loop() is self.loop:
+                self._enqueue(event)
+                return
+        except RuntimeError:
+            pass
+        try:
+            self.loop.call_soon_threadsafe(self._enqueue, event)
+        except RuntimeError:
+            # The subscriber's event loop has been closed
+            self.bus.unsubscribe(self)
+
+    def _enqueue(self, event: Event) -> None:
+        if not self.active:
+            return
+        if self.queue.full():
+            self.dropped += 1
+            if self.overflow == DROP_NEWEST:
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def _call_handler(self, event: Event) -> None:
+        try:
+            result = self.handler(event)
+            if inspect.isawaitable(result):
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    # A coroutine handler without a running loop: run it to completion
+                    asyncio.run(result)
+                else:
+                    # Published from inside a loop: schedule it there instead of blocking
+                    task = asyncio.ensure_future(result, loop=loop)
+                    self._handler_tasks.add(task)
+                    task.add_done_callback(lambda task: self._handler_done(event, task))
+                    return
+            self.delivered += 1
+        except Exception as e:
+            logger.error(f"Event handler failed for {event.type} {event.id}: {e}")
+
+    def _handler_done(self, event: Event, task: asyncio.Future) -> None:
+        self._handler_tasks.discard(task)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error(f"Event handler failed for {event.type} {event.id}: {task.exception()}")
+        else:
+            self.delivered += 1
+
+    async def _consume(self) -> None:
+        while True:
+            event = await self.queue.get()
+            try:
+                result = self.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+                self.delivered += 1
+            except Exception as e:
+                logger.error(f"Event handler failed for {event.type} {event.id}: {e}")
+
+    async def get(self) -> Event:
+        """Wait for the next event (asynchronous subscriptions without a handler)."""
+        if self.queue is None:
+            raise ValueError("Synchronous subscriptions deliver to their handler")
+        event = await self.queue.get()
+        self.delivered += 1
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        return await self.get()
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """Routes published events to matching subscriptions.
+
+    Subscriptions are indexed by event type, so publishing only checks the
+    subscribers of that type plus those listening to every type.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[Optional[str], List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: Optional[Handler] = None, type: Optional[str] = None,
+                  agent: Optional[str] = None, project_id: Optional[str] = None,
+                  maxsize: int = DEFAULT_QUEUE_SIZE, overflow: str = DROP_OLDEST) -> Subscription:
+        """Subscribe to events matching all of the given filters.
+
+        Called inside a running event loop, events are queued (at most
+        ``maxsize``, then ``overflow`` decides which to drop) and the handler
+        runs on that loop; otherwise the handler is called synchronously.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None and handler is None:
+            raise ValueError("A handler is required outside a running event loop")
+
+        subscription = Subscription(self, handler, type, agent, project_id, loop, maxsize, overflow)
+        with self._lock:
+            self._subscriptions.setdefault(type, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription."""
+        with self._lock:
+            subscription.active = False
+            subscriptions = self._subscriptions.get(subscription.type, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+        if subscription._consumer is not None and not subscription.loop.is_closed():
+            subscription.loop.call_soon_threadsafe(subscription._consumer.cancel)
+
+    def publish(self, event: Event) -> int:
+        """Deliver an event to matching subscribers; return how many matched."""
+        with self._lock:
+            candidates = self._subscriptions.get(event.type, []) + self._subscriptions.get(None, [])
+        matched = 0
+        for subscription in candidates:
+            if subscription.matches(event):
+                matched += 1
+                subscription._deliver(event)
+        return matched
+
+    async def publish_async(self, event: Event) -> int:
+        """Like ``publish``, but wait for room in full queues of subscribers on
+        the current loop instead of dropping events (backpressure)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            candidates = self._subscriptions.get(event.type, []) + self._subscriptions.get(None, [])
+        matched = 0
+        for subscription in candidates:
+            if subscription.matches(event):
+                matched += 1
+                if subscription.loop is loop and subscription.active:
+                    await subscription.queue.put(event)
+                else:
+                    subscription._deliver(event)
+        return matched
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Compiled File Cache
+
+Persists values derived from source files (parsed agent personas, compiled
+workflow definitions, ...) under .agentic-state/ so unchanged files can be
+reused across processes without being parsed again.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+import logging
+
+sys.path.append(str(Path(__file__).parent))
+
+from atomic_io import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout of the cache file itself changes
+CACHE_FORMAT = 1
+
+DEFAULT_STATE_DIR = Path("./.agentic-state")
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Unpickler that only accepts builtin containers and scalars."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from cache")
+
+
+class FileCache:
+    """On-disk cache of values derived from files.
+
+    Entries are keyed by resolved file path and validated against the file's
+    mtime, size and SHA-256 content hash. A matching mtime and size is trusted
+    without reading the file; when only the stat data differs, the content
+    hash decides whether the cached value is still valid. Values must be
+    plain builtin data (dicts, lists, strings, numbers). Methods are safe to
+    call from multiple threads.
+    """
+
+    def __init__(self, cache_path: Path, version: str = "1"):
+        self.cache_path = cache_path
+        self.version = version
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Return the content hash used to validate entries."""
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def _key(file_path: Path) -> str:
+        return str(Path(file_path).resolve())
+
+    def _load(self) -> None:
+        """Load cache entries, discarding them if the version does not match."""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = _PlainUnpickler(io.BytesIO(f.read())).load()
+            if (
+                isinstance(data, dict)
+                and data.get("format") == CACHE_FORMAT
+                and data.get("version") == self.version
+            ):
+                self._entries = data.get("entries", {})
+            else:
+                logger.info(f"Discarding stale cache: {self.cache_path}")
+                self._dirty = True
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache {self.cache_path}: {e}")
+            self._dirty = True
+
+    def get(self, file_path: Path, data: Optional[bytes] = None) -> Optional[Any]:
+        """Return the cached value for a file, or None if it is missing or stale.
+
+        When ``data`` (the file's current bytes) is given, an entry whose stat
+        signature changed but whose content hash still matches is refreshed
+        and returned instead of being treated as a miss.
+        """
+        key = self._key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["value"]
+
+        if data is not None and len(data) == entry["size"] and self.digest(data) == entry["sha256"]:
+            with self._lock:
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._dirty = True
+            return entry["value"]
+
+        return None
+
+    def put(self, file_path: Path, data: bytes, value: Any) -> None:
+        """Store the value derived from ``data``, the current bytes of a file."""
+        stat = os.stat(file_path)
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": len(data),
+            "sha256": self.digest(data),
+            "value": value,
+        }
+        key = self._key(file_path)
+        with self._lock:
+            self._entries[key] = entry
+            self._dirty = True
+
+    def discard(self, file_path: Path) -> None:
+        """Drop the entry for a file."""
+        key = self._key(file_path)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def prune(self, file_paths: Iterable[Path]) -> None:
+        """Drop entries for files that are not in ``file_paths``."""
+        keep = {self._key(p) for p in file_paths}
+        with self._lock:
+            for key in [k for k in self._entries if k not in keep]:
+                del self._entries[key]
+                self._dirty = True
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed, replacing the file atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"format": CACHE_FORMAT, "version": self.version, "entries": dict(self._entries)}
+            self._dirty = False
+        try:
+            # The cache can always be rebuilt, so it is not worth an fsync
+            atomic_write(self.cache_path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL),
+                         fsync=False)
+        except Exception as e:
+            logger.warning(f"Failed to write cache {self.cache_path}: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
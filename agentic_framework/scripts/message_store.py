@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Bounded Message Store
+
+In-memory store for agent messages with per-agent indexes kept in timestamp
+order, so "latest N messages for an agent" is O(N) regardless of how many
+messages have been sent. The store holds at most ``max_messages`` messages
+(oldest evicted first, like a ring buffer), optionally drops messages older
+than a retention period, and can spill evicted messages to a JSON-lines file.
+"""
+
+import bisect
+import json
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MESSAGES = 100_000
+
+
+def _participants(message: Dict[str, Any]) -> Set[str]:
+    return {agent for agent in (message.get("from"), message.get("to")) if agent}
+
+
+def _timestamp(message: Dict[str, Any]) -> str:
+    return message.get("timestamp", "")
+
+
+class _TimestampView:
+    """Sequence view of a deque's timestamps, for bisect."""
+
+    def __init__(self, messages: Deque[Dict[str, Any]]):
+        self._messages = messages
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index: int) -> str:
+        return _timestamp(self._messages[index])
+
+
+def _insort(messages: Deque[Dict[str, Any]], message: Dict[str, Any]) -> None:
+    # Messages almost always arrive in timestamp order; only late ones pay for bisect
+    if not messages or _timestamp(messages[-1]) <= _timestamp(message):
+        messages.append(message)
+    else:
+        messages.insert(bisect.bisect_right(_TimestampView(messages), _timestamp(message)), message)
+
+
+def _remove_identical(messages: Deque[Dict[str, Any]], message: Dict[str, Any]) -> None:
+    # By identity: equal dicts may be distinct messages
+    for index, candidate in enumerate(messages):
+        if candidate is message:
+            del messages[index]
+            return
+
+
+class MessageStore:
+    """Bounded, indexed store of message records.
+
+    Messages are dicts with ISO ``timestamp``, ``from`` and ``to`` keys, as
+    created by ``CommunicationHub.send_message``. ``retention`` is in
+    seconds; when ``spill_path`` is set, evicted messages are appended to it
+    and can be read back with ``spilled``.
+    """
+
+    def __init__(self, max_messages: Optional[int] = DEFAULT_MAX_MESSAGES, retention: Optional[float] = None,
+                 spill_path: Optional[Path] = None):
+        if max_messages is not None and max_messages < 1:
+            raise ValueError("max_messages must be at least 1")
+        self.max_messages = max_messages
+        self.retention = retention
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self._messages: Deque[Dict[str, Any]] = deque()
+        self._by_agent: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._evicted_agents: Set[str] = set()
+        self._spill_file = None
+        self._lock = threading.RLock()
+        self.evicted = 0
+
+    def add(self, message: Dict[str, Any]) -> None:
+        """Store a message, evicting the oldest ones if the store is full."""
+        with self._lock:
+            _insort(self._messages, message)
+            for agent in _participants(message):
+                agent_messages = self._by_agent.get(agent)
+                if agent_messages is None:
+                    agent_messages = self._by_agent[agent] = deque()
+                _insort(agent_messages, message)
+            self._evict()
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """Store several messages."""
+        for message in messages:
+            self.add(message)
+
+    def _evict(self) -> None:
+        cutoff = None
+        if self.retention is not None:
+            cutoff = (datetime.utcnow() - timedelta(seconds=self.retention)).isoformat()
+
+        evicted = []
+        while self._messages and (
+            (self.max_messages is not None and len(self._messages) > self.max_messages)
+            or (cutoff is not None and _timestamp(self._messages[0]) < cutoff)
+        ):
+            message = self._messages.popleft()
+            for agent in _participants(message):
+                agent_messages = self._by_agent[agent]
+                # Per-agent deques keep the global order, so the globally oldest
+                # message is also the oldest of each participant
+                if agent_messages[0] is message:
+                    agent_messages.popleft()
+                else:
+                    _remove_identical(agent_messages, message)
+                if not agent_messages:
+                    del self._by_agent[agent]
+                self._evicted_agents.add(agent)
+            evicted.append(message)
+
+        if evicted:
+            self.evicted += len(evicted)
+            if self.spill_path is not None:
+                self._spill(evicted)
+
+    def _spill(self, messages: List[Dict[str, Any]]) -> None:
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+            self._spill_file.write("".join(json.dumps(message) + "\n" for message in messages))
+            self._spill_file.flush()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to spill {len(messages)} messages to {self.spill_path}: {e}")
+
+    def history(self, agent: Optional[str] = None, since: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return messages sent or received by ``agent`` (all messages if None), newest first."""
+        with self._lock:
+            if self.retention is not None:
+                self._evict()
+            messages = self._messages if agent is None else self._by_agent.get(agent, deque())
+            return list(islice(self._newest_first(messages, since), limit))
+
+    @staticmethod
+    def _newest_first(messages: Deque[Dict[str, Any]], since: Optional[str]) -> Iterator[Dict[str, Any]]:
+        for message in reversed(messages):
+            # Messages are in timestamp order, so stop at the first older one
+            if since is not None and _timestamp(message) < since:
+                return
+            yield message
+
+    def spilled(self, agent: Optional[str] = None, since: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read evicted messages back from the spill file, newest first.
+
+        This scans the whole file and is meant for occasional audits, not
+        for hot paths.
+        """
+        if self.spill_path is None or not self.spill_path.exists():
+            return []
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+            matches = []
+            with open(self.spill_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        message = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if agent is not None and agent not in _participants(message):
+                        continue
+                    if since is not None and _timestamp(message) < since:
+                        continue
+                    matches.append(message)
+        matches.sort(key=_timestamp, reverse=True)
+        return matches[:limit] if limit is not None else matches
+
+    def is_complete(self, agent: Optional[str] = None) -> bool:
+        """Whether no messages of ``agent`` (of anyone if None) have been evicted."""
+        with self._lock:
+            return not self.evicted if agent is None else agent not in self._evicted_agents
+
+    def agents(self) -> List[str]:
+        """Return the agents with messages in the store."""
+        with self._lock:
+            return list(self._by_agent)
+
+    def close(self) -> None:
+        """Close the spill file."""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def __len__(self) -> int:
+        return len(self._messages)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Agent Persona Parser
+
+Single-pass tokenizer for agent persona markdown files. Instead of walking
+every line in Python, the tokenizer jumps between the few markers it cares
+about (headings, standards links and agent names) with ``str.find``, so plain
+prose is skipped at C speed and Python code only runs once per token.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Token kinds emitted by tokenize_persona
+ROLE = "role"
+SECTION = "section"
+CAPABILITY = "capability"
+AGENT_REF = "agent_ref"
+STANDARD = "standard"
+
+_STANDARD_MARKER = "`./development-standards/"
+_AGENT_MARKER = "-agent"
+
+_HEADING_RE = re.compile(r'(#{1,6})[ \t]+(.*)')
+_ROLE_RE = re.compile(r'Persona:\s*(.*)$')
+_CAPABILITY_SECTION_RE = re.compile(r'(?:Core Functions|Tasks)\b')
+_LIST_ITEM_RE = re.compile(r'[ \t]*(?:\d+\.|[-*+])[ \t]+(.*)')
+_COLLABORATION_RE = re.compile(r'engage|collaborate|work with')
+_AGENT_NAME_RE = re.compile(r'[A-Za-z0-9_]+(?:-[A-Za-z0-9_]+)*-agent')
+
+# First characters that can start a numbered or bulleted list item
+_LIST_ITEM_START = frozenset('0123456789-*+ \t')
+# Punctuation stripped from words before matching agent names
+_WORD_PUNCTUATION = '`*_,.;:!?()[]{}"\''
+
+Token = Tuple[str, Any]
+
+
+def _capability_items(section: str) -> Iterator[Token]:
+    for line in section.split('\n'):
+        if line and line[0] in _LIST_ITEM_START:
+            item = _LIST_ITEM_RE.match(line)
+            if item:
+                capability = item.group(1).split(':')[0].strip()
+                if capability:
+                    yield CAPABILITY, capability
+
+
+def tokenize_persona(content: str) -> Iterator[Token]:
+    """Yield ``(kind, value)`` tokens from persona markdown in document order.
+
+    SECTION values are ``(level, title)`` tuples; all other values are strings.
+    Capability items of a "Core Functions"/"Tasks" section are emitted when
+    that section closes.
+    """
+    find = content.find
+    end = len(content)
+
+    # Positions of the next heading line, standards link and agent name;
+    # ``end`` means there are no more markers of that kind.
+    heading_pos = 0 if content.startswith('#') else find('\n#') + 1 or end
+    standard_pos = find(_STANDARD_MARKER)
+    if standard_pos < 0:
+        standard_pos = end
+    agent_pos = find(_AGENT_MARKER)
+    if agent_pos < 0:
+        agent_pos = end
+
+    role_found = False
+    capabilities_start = -1
+
+    while True:
+        if heading_pos <= standard_pos and heading_pos <= agent_pos:
+            pos = heading_pos
+            if pos >= end:
+                break
+            line_end = find('\n', pos)
+            if line_end < 0:
+                line_end = end
+            heading = _HEADING_RE.match(content, pos, line_end)
+            if heading:
+                level = len(heading.group(1))
+                title = heading.group(2).rstrip()
+                yield SECTION, (level, title)
+
+                if not role_found:
+                    role = _ROLE_RE.match(title)
+                    if role:
+                        role_found = True
+                        yield ROLE, role.group(1).strip()
+
+                if level <= 2:
+                    if capabilities_start >= 0:
+                        yield from _capability_items(content[capabilities_start:pos])
+                        capabilities_start = -1
+                    if level == 2 and _CAPABILITY_SECTION_RE.match(title):
+                        capabilities_start = line_end
+            heading_pos = find('\n#', line_end) + 1 or end
+
+        elif standard_pos <= agent_pos:
+            ref_start = standard_pos + len(_STANDARD_MARKER)
+            ref_end = find('`', ref_start)
+            line_end = find('\n', ref_start)
+            if line_end < 0:
+                line_end = end
+            if ref_start < ref_end < line_end:
+                yield STANDARD, content[ref_start:ref_end]
+                ref_start = ref_end + 1
+            standard_pos = find(_STANDARD_MARKER, ref_start)
+            if standard_pos < 0:
+                standard_pos = end
+
+        else:
+            # Agent names only count as dependencies on collaboration lines
+            line_start = content.rfind('\n', 0, agent_pos) + 1
+            line_end = find('\n', agent_pos)
+            if line_end < 0:
+                line_end = end
+            line = content[line_start:line_end]
+            if _COLLABORATION_RE.search(line.lower()):
+                for word in line.split():
+                    if _AGENT_MARKER in word:
+                        name = word.strip(_WORD_PUNCTUATION)
+                        if _AGENT_NAME_RE.fullmatch(name):
+                            yield AGENT_REF, name
+            agent_pos = find(_AGENT_MARKER, line_end)
+            if agent_pos < 0:
+                agent_pos = end
+
+    if capabilities_start >= 0:
+        yield from _capability_items(content[capabilities_start:])
+
+
+def parse_persona(content: str) -> Dict[str, Any]:
+    """Parse persona markdown into role, sections, capabilities and references."""
+    role = "Unknown"
+    sections: List[Tuple[int, str]] = []
+    capabilities: List[str] = []
+    dependencies: Dict[str, None] = {}
+    standards: Dict[str, None] = {}
+
+    for kind, value in tokenize_persona(content):
+        if kind == CAPABILITY:
+            capabilities.append(value)
+        elif kind == SECTION:
+            sections.append(value)
+        elif kind == STANDARD:
+            standards[value] = None
+        elif kind == AGENT_REF:
+            dependencies[value] = None
+        elif kind == ROLE:
+            role = value
+
+    return {
+        "role": role,
+        "sections": sections,
+        "capabilities": capabilities,
+        "dependencies": list(dependencies),
+        "standards_references": list(standards),
+    }
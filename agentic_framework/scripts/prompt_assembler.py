@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Token-Budgeted Prompt Assembly
+
+Selects which persona sections and standards documents to inline in an agent
+prompt. Candidates are scored for relevance to the task (TF-IDF over task
+title and description words) and added greedily, best first, until the
+model's context budget is used up; selected sections keep their document
+order. Section splits and token counts are cached per text.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Words too common in task descriptions and personas to indicate relevance
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it of on or that the
+their this to with will your you all any each project task tasks agent
+""".split())
+
+# Headings whose sections are always kept: the persona's identity
+REQUIRED_SECTION_RE = re.compile(r"Persona\b", re.IGNORECASE)
+
+TITLE_WEIGHT = 2.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate a BPE token count: one token per word or punctuation mark."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def _terms(text: str) -> List[str]:
+    return [word for word in _WORD_RE.findall(text.lower()) if len(word) > 2 and word not in STOPWORDS]
+
+
+@dataclass(frozen=True)
+class Section:
+    """A block of markdown that is included in a prompt as a whole."""
+    source: str
+    title: str
+    text: str
+    tokens: int
+    terms: Tuple[str, ...]
+    title_terms: Tuple[str, ...]
+    required: bool = False
+
+
+@dataclass
+class Selection:
+    """Sections chosen for a prompt, in document order, and what was left out."""
+    sections: List[Section]
+    omitted: List[Section]
+    tokens: int
+
+    def text(self, source: str) -> str:
+        """Concatenate the selected sections of one source."""
+        return "\n".join(section.text for section in self.sections if section.source == source)
+
+
+def split_sections(markdown: str) -> List[Tuple[str, str]]:
+    """Split markdown into ``(title, text)`` blocks at level-1 and level-2 headings.
+
+    Text before the first heading is its own block with an empty title, and
+    deeper headings stay inside their parent block.
+    """
+    blocks: List[Tuple[str, str]] = []
+    title, lines = "", []
+    for line in markdown.split("\n"):
+        if line.startswith("# ") or line.startswith("## "):
+            if lines and any(l.strip() for l in lines):
+                blocks.append((title, "\n".join(lines).strip("\n")))
+            title, lines = line.lstrip("#").strip(), [line]
+        else:
+            lines.append(line)
+    if lines and any(l.strip() for l in lines):
+        blocks.append((title, "\n".join(lines).strip("\n")))
+    return blocks
+
+
+class PromptAssembler:
+    """Fits persona and standards sections into a token budget.
+
+    ``token_counter`` defaults to ``estimate_tokens``; pass a real tokenizer's
+    counting function for exact budgets. Split sections and their token
+    counts are cached in an LRU keyed by the document text.
+    """
+
+    def __init__(self, token_counter: Callable[[str], int] = estimate_tokens, cache_size: int = 1024):
+        self.token_counter = token_counter
+        self.cache_size = cache_size
+        self._sections: "OrderedDict[Tuple[str, str, Optional[bool]], Tuple[Section, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count_tokens(self, text: str) -> int:
+        return self.token_counter(text)
+
+    def sections(self, source: str, markdown: str, required: Optional[bool] = None) -> Tuple[Section, ...]:
+        """Split a document into scored-ready sections, reusing cached results.
+
+        With ``required=True`` every section of the document is kept regardless
+        of budget and with ``False`` none is; by default the persona identity
+        sections (the preamble and "Persona" headings) are.
+        """
+        key = (source, markdown, required)
+        with self._lock:
+            cached = self._sections.get(key)
+            if cached is not None:
+                self._sections.move_to_end(key)
+                return cached
+
+        sections = tuple(
+            Section(
+                source=source,
+                title=title,
+                text=text,
+                tokens=self.token_counter(text) + 1,
+                terms=tuple(_terms(text)),
+                title_terms=tuple(_terms(title)),
+                required=required if required is not None else (
+                    not title or bool(REQUIRED_SECTION_RE.match(title))
+                ),
+            )
+            for title, text in split_sections(markdown)
+        )
+        with self._lock:
+            self._sections[key] = sections
+            while len(self._sections) > self.cache_size:
+                self._sections.popitem(last=False)
+        return sections
+
+    @staticmethod
+    def score(sections: Sequence[Section], query: str) -> Dict[int, float]:
+        """Score each section's relevance to ``query`` with TF-IDF; keys are list positions."""
+        query_terms = set(_terms(query))
+        if not query_terms:
+            return {i: 0.0 for i in range(len(sections))}
+
+        document_frequency: Counter = Counter()
+        for section in sections:
+            document_frequency.update(query_terms.intersection(section.terms))
+
+        scores = {}
+        total = len(sections)
+        for i, section in enumerate(sections):
+            counts = Counter(term for term in section.terms if term in query_terms)
+            title_counts = Counter(term for term in section.title_terms if term in query_terms)
+            score = 0.0
+            for term in query_terms:
+                if not counts[term] and not title_counts[term]:
+                    continue
+                idf = math.log(1 + total / (1 + document_frequency[term]))
+                score += (1 + math.log(1 + counts[term]) + TITLE_WEIGHT * title_counts[term]) * idf
+            # Normalize by length so long sections do not win on volume alone
+            scores[i] = score / math.sqrt(max(section.tokens, 1))
+        return scores
+
+    def select(self, sections: Iterable[Section], query: str, budget: int) -> Selection:
+        """Choose sections for ``query`` within ``budget`` tokens.
+
+        Required sections are always included (even over budget); the rest
+        are added greedily by score while they fit.
+        """
+        sections = list(sections)
+        scores = self.score(sections, query)
+        chosen = {i for i, section in enumerate(sections) if section.required}
+        used = sum(sections[i].tokens for i in chosen)
+
+        ranked = sorted(
+            (i for i in range(len(sections)) if i not in chosen),
+            key=lambda i: (-scores[i], i),
+        )
+        for i in ranked:
+            if used + sections[i].tokens <= budget:
+                chosen.add(i)
+                used += sections[i].tokens
+
+        return Selection(
+            sections=[sections[i] for i in sorted(chosen)],
+            omitted=[sections[i] for i in range(len(sections)) if i not in chosen],
+            tokens=used,
+        )
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Agent Prompt Templates
+
+Precompiled prompt templates for agent task assignments. The base template is
+parsed once into literal segments and field slots; each agent's template has
+the agent-specific fields (role, persona markdown, standards) baked into its
+literal segments, so generating a prompt only joins the task-specific fields
+into a prebuilt list of strings.
+"""
+
+import string
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+# Bump whenever AGENT_PROMPT_TEMPLATE changes
+PROMPT_TEMPLATE_VERSION = "1"
+
+AGENT_PROMPT_TEMPLATE = """
+# Agent Assignment: {role}
+
+## Agent Persona
+{persona}
+
+## Task Assignment
+**Task ID**: {task_id}
+**Title**: {title}
+**Description**: {description}
+**Due Date**: {due_date}
+**Human Reviewer**: {human_reviewer}
+
+## Project Context
+**Project**: {project_name}
+**Project Type**: {project_type}
+**Current Phase**: {current_phase}
+
+## Standards to Follow
+You must adhere to all standards referenced in your persona, including:
+{standards}
+
+## Expected Deliverables
+{deliverables}
+
+## Instructions
+1. Review the project brief and relevant standards
+2. Complete the assigned task according to your persona guidelines
+3. Create all specified deliverables
+4. When complete, mark the task as "draft_ready" and notify the human reviewer
+5. Be prepared to incorporate feedback and make revisions as needed
+
+## Handoff Protocol
+When you complete this task:
+1. Update the task status to "draft_ready"
+2. Create a handoff document listing all deliverables
+3. Notify {human_reviewer} for review
+4. Wait for approval before proceeding to the next task
+
+Begin working on this task now.
+"""
+
+# Template fields filled from the agent persona rather than the task
+AGENT_FIELDS = ("role", "persona", "standards")
+
+
+class PromptTemplate:
+    """A template compiled into alternating literal segments and field names.
+
+    Only plain ``{name}`` fields are supported; ``{{`` and ``}}`` are literal
+    braces. Values substituted by ``partial`` or ``render`` are never parsed
+    again, so braces inside them (e.g. code in a persona) need no escaping.
+    """
+
+    def __init__(self, segments: List[Tuple[str, Optional[str]]]):
+        # Each segment is (literal text, field name or None)
+        merged: List[Tuple[str, Optional[str]]] = []
+        for literal, name in segments:
+            if merged and merged[-1][1] is None:
+                merged[-1] = (merged[-1][0] + literal, name)
+            else:
+                merged.append((literal, name))
+        self._segments = tuple(merged)
+        self.fields = frozenset(name for _, name in merged if name is not None)
+
+    @classmethod
+    def compile(cls, source: str) -> "PromptTemplate":
+        """Parse a format-style template string."""
+        segments = []
+        for literal, name, format_spec, conversion in string.Formatter().parse(source):
+            if name is not None and (not name.isidentifier() or format_spec or conversion):
+                raise ValueError(f"Unsupported template field: {{{name}}}")
+            segments.append((literal, name))
+        return cls(segments)
+
+    def partial(self, values: Mapping[str, Any]) -> "PromptTemplate":
+        """Return a template with some fields replaced by fixed text."""
+        segments = []
+        for literal, name in self._segments:
+            if name is not None and name in values:
+                segments.append((literal + str(values[name]), None))
+            else:
+                segments.append((literal, name))
+        return PromptTemplate(segments)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Fill the remaining fields; raises KeyError for a missing value."""
+        parts = []
+        for literal, name in self._segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(str(values[name]))
+        return "".join(parts)
+
+
+BASE_TEMPLATE = PromptTemplate.compile(AGENT_PROMPT_TEMPLATE)
+
+
+def format_standards_references(agent: Any) -> str:
+    """List an agent's standards references as markdown bullets."""
+    return "\n".join(f"- ./development-standards/{ref}" for ref in agent.standards_references)
+
+
+class AgentPromptCache:
+    """Per-agent compiled prompt templates, memoized by agent and template version.
+
+    Reloading a persona creates a new AgentPersona object, so an entry is
+    reused only while it was compiled from the same persona object, the same
+    template version and the same ``variant`` (a key for anything else baked
+    into the template, such as the standards documents).
+    """
+
+    def __init__(self, base: PromptTemplate = BASE_TEMPLATE, version: str = PROMPT_TEMPLATE_VERSION):
+        self.base = base
+        self.version = version
+        self._templates: Dict[Tuple[str, str], Tuple[Any, Hashable, PromptTemplate]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, agent: Any, load_content: Callable[[Any], str],
+            format_standards: Optional[Callable[[Any], str]] = None, variant: Hashable = None) -> PromptTemplate:
+        """Return the compiled template for an agent, compiling it on first use.
+
+        ``format_standards`` renders the agent's standards field; by default
+        it lists the persona's standards references. Pass a ``variant`` that
+        changes whenever its output would.
+        """
+        key = (agent.name, self.version)
+        with self._lock:
+            entry = self._templates.get(key)
+        if entry is not None and entry[0] is agent and entry[1] == variant:
+            return entry[2]
+
+        template = self.base.partial({
+            "role": agent.role,
+            "persona": load_content(agent),
+            "standards": (format_standards or format_standards_references)(agent),
+        })
+        with self._lock:
+            self._templates[key] = (agent, variant, template)
+        return template
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+    def __len__(self) -> int:
+        return len(self._templates)
@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+Quality Gate Evaluation
+
+Loads the quality gates and their automated checks from the ``yaml`` blocks
+in templates/quality-gates.md, runs the checks concurrently in a process
+pool and records the outcome in .agentic-state/current-state.json
+(``quality_gates_passed`` and ``quality_gate_results``).
+
+Checks run by tool: command-line tools (ruff, mypy, bandit, pytest, ...)
+pass when they exit with status 0, ``pytest-cov`` compares total coverage
+with the check's ``pass_threshold`` and ``file_presence`` checks that the
+``required_files`` globs match. Checks whose tool has no runner (most
+custom analyzers in the template) are reported as skipped, and a gate with
+skipped checks is only ``partial``: it is not recorded as passed until all
+of its checks run and pass. Settings can be
+overridden per check in config/quality-gates.yaml, e.g.::
+
+    checks:
+      code_quality:
+        command: ["ruff", "check", "src"]
+        inputs: ["src/**/*.py", "pyproject.toml"]
+      gate_8.infrastructure_validation:
+        command: ["kubectl", "apply", "--dry-run=client", "-f", "k8s/"]
+      architecture_documentation:
+        tool: file_presence
+        required_files: ["docs/architecture/*.md"]
+
+Evaluation is incremental: a manifest in .agentic-state/ records the hash
+of every project file, and each check declares the globs it reads (tool
+defaults in TOOL_INPUTS, or ``inputs`` in the config). Only checks whose
+settings changed or whose inputs changed since they last ran are run again;
+checks with unknown inputs (e.g. a custom ``command`` without ``inputs``)
+are re-run when any file changes. Unchanged files are recognized by mtime
+and size without being read.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import yaml
+
+sys.path.append(str(Path(__file__).parent))
+
+from atomic_io import atomic_write
+from file_cache import FileCache, DEFAULT_STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when gate parsing or result semantics change to invalidate caches
+GATES_VERSION = "2"
+
+DEFAULT_GATES_FILE = Path(__file__).resolve().parent.parent / "templates" / "quality-gates.md"
+DEFAULT_CONFIG_FILE = Path("config/quality-gates.yaml")
+
+# CheckResult.status values
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+
+# GateResult status of a gate whose run checks passed but some were skipped
+PARTIAL = "partial"
+
+# Sections of quality-gates.md and the workflow their gates belong to
+WORKFLOW_SECTIONS = {
+    "software/systems workflow gates": "software_systems",
+    "data science/ml workflow gates": "data_science",
+}
+
+# yaml sections of a gate that list its automated checks
+CHECK_SECTION_SUFFIXES = ("_checks", "_tests")
+
+# Command lines for tools that pass or fail by exit status
+TOOL_COMMANDS = {
+    "ruff": ["ruff", "check", "."],
+    "mypy": ["mypy", "."],
+    "bandit": ["bandit", "-q", "-r", ".", "-ll", "-x", "./.venv,./venv,./tests"],
+    "pytest": ["pytest", "-q"],
+    "safety": ["safety", "check"],
+    "terraform_validate": ["terraform", "validate"],
+    "checkov": ["checkov", "-q", "-d", "."],
+    "trivy": ["trivy", "fs", "--exit-code", "1", "--severity", "HIGH,CRITICAL", "."],
+    "truffleHog": ["trufflehog", "filesystem", ".", "--fail"],
+}
+
+# Files each tool reads; a check is re-run only when one of them changes
+TOOL_INPUTS = {
+    "ruff": ["**/*.py", "pyproject.toml", "ruff.toml", ".ruff.toml"],
+    "mypy": ["**/*.py", "pyproject.toml", "mypy.ini", "setup.cfg"],
+    "bandit": ["**/*.py", "pyproject.toml", ".bandit"],
+    "pytest": ["**/*.py", "pyproject.toml", "pytest.ini", "setup.cfg", "conftest.py"],
+    "pytest-cov": ["**/*.py", "pyproject.toml", "pytest.ini", "setup.cfg", ".coveragerc"],
+    "safety": ["requirements*.txt", "pyproject.toml", "poetry.lock", "Pipfile.lock"],
+    "terraform_validate": ["**/*.tf", "**/*.tfvars"],
+    "checkov": ["**/*.tf", "**/*.yaml", "**/*.yml", "**/Dockerfile"],
+    "trivy": ["**/*"],
+    "truffleHog": ["**/*"],
+}
+
+# Inputs of a check that declares none and whose tool is not in TOOL_INPUTS
+ALL_FILES = ["**/*"]
+
+# Directories never scanned for check inputs
+IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".venv", "venv", "node_modules", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox", ".agentic-state",
+})
+
+DEFAULT_TIMEOUT = 600.0
+MAX_DETAILS = 2000
+
+
+@dataclass(frozen=True)
+class GateCheck:
+    """An automated check of a quality gate."""
+    gate_id: str
+    name: str
+    tool: str
+    criteria: str = ""
+    settings: Dict[str, Any] = field(default_factory=dict, hash=False, compare=False)
+
+
+@dataclass(frozen=True)
+class QualityGate:
+    """A quality gate and its automated checks."""
+    id: str
+    name: str
+    workflow: Optional[str]
+    checks: Tuple[GateCheck, ...]
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one automated check."""
+    gate_id: str
+    check: str
+    tool: str
+    status: str
+    details: str = ""
+    duration: float = 0.0
+    cached: bool = False
+    checked_at: str = ""
+
+
+@dataclass
+class GateResult:
+    """Outcome of a gate's automated checks.
+
+    A gate passes when all of its checks passed. It is ``partial`` when the
+    checks that ran passed but others were skipped (left to the gate's
+    manual review), and ``skipped`` when none could run.
+    """
+    gate_id: str
+    name: str
+    status: str
+    checks: List[CheckResult]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def gate_id(title: str) -> str:
+    """Return the id for a gate heading: ``gate_3`` for "Gate 3: ...", else a slug."""
+    match = re.match(r"Gate\s+(\d+)\b", title, re.IGNORECASE)
+    if match:
+        return f"gate_{match.group(1)}"
+    return "_".join(re.findall(r"[a-z0-9]+", title.split("(")[0].lower()))
+
+
+def parse_gate_definitions(markdown: str) -> List[Dict[str, Any]]:
+    """Extract gates and their checks from quality-gates.md as plain data."""
+    gates: List[Dict[str, Any]] = []
+    workflow: Optional[str] = None
+    current: Optional[Dict[str, Any]] = None
+    in_yaml, block = False, []
+
+    for line in markdown.splitlines():
+        if in_yaml:
+            if line.strip().startswith("```"):
+                in_yaml = False
+                if current is not None:
+                    current["checks"].extend(_parse_checks("\n".join(block), current["id"]))
+            else:
+                block.append(line)
+            continue
+        if line.strip().startswith("```yaml"):
+            in_yaml, block = True, []
+        elif line.startswith("## "):
+            workflow = WORKFLOW_SECTIONS.get(line[3:].strip().lower())
+            current = None
+        elif line.startswith("### "):
+            title = line[4:].strip()
+            if "gate" in title.lower():
+                current = {"id": gate_id(title), "name": title, "workflow": workflow, "checks": []}
+                gates.append(current)
+            else:
+                current = None
+
+    return [gate for gate in gates if gate["checks"]]
+
+
+def _parse_checks(text: str, gate: str) -> List[Dict[str, Any]]:
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        logger.error(f"Invalid yaml block in {gate}: {e}")
+        return []
+    if not isinstance(data, dict):
+        return []
+    checks = []
+    for key, section in data.items():
+        # automated_checks, security_checks, performance_tests; not failure_escalation etc.
+        if not str(key).endswith(CHECK_SECTION_SUFFIXES) or not isinstance(section, dict):
+            continue
+        for name, settings in section.items():
+            if isinstance(settings, dict):
+                settings = dict(settings)
+                checks.append({
+                    "name": str(name),
+                    "tool": str(settings.pop("tool", "")),
+                    "criteria": str(settings.pop("criteria", "")),
+                    "settings": settings,
+                })
+    return checks
+
+
+def parse_threshold(value: Any, default: float = 100.0) -> float:
+    """Read a percentage such as "80%" or 0.8; other text gives ``default``."""
+    if isinstance(value, (int, float)):
+        return float(value) * 100 if value <= 1 else float(value)
+    match = re.match(r"\s*(\d+(?:\.\d+)?)\s*%", str(value or ""))
+    return float(match.group(1)) if match else default
+
+
+def parse_timeout(value: Any, default: float = DEFAULT_TIMEOUT) -> float:
+    """Read a timeout such as 300, "5 minutes" or "90s" in seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.match(r"\s*(\d+(?:\.\d+)?)\s*(s|sec|second|m|min|minute|h|hour)?", str(value or ""), re.IGNORECASE)
+    if not match:
+        return default
+    unit = (match.group(2) or "s").lower()[0]
+    return float(match.group(1)) * {"s": 1, "m": 60, "h": 3600}[unit]
+
+
+def _glob_regex(pattern: str) -> "re.Pattern":
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def list_files(root: Path) -> List[str]:
+    """Return the project's files as sorted root-relative posix paths, skipping IGNORED_DIRS."""
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in IGNORED_DIRS]
+        relative = Path(directory).relative_to(root).as_posix()
+        prefix = "" if relative == "." else relative + "/"
+        files.extend(prefix + name for name in filenames)
+    return sorted(files)
+
+
+def match_files(files: Iterable[str], patterns: Iterable[str]) -> List[str]:
+    """Return the files matching any of the glob patterns (``**`` spans directories)."""
+    regexes = [_glob_regex(pattern) for pattern in patterns]
+    return [path for path in files if any(regex.match(path) for regex in regexes)]
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileManifest:
+    """Content hashes of the project's files, persisted between runs.
+
+    Each entry records a file's mtime, size and SHA-256 plus the build
+    generation in which its content last changed. A file whose mtime and size
+    are unchanged is trusted without being read. Deleted files are kept as
+    tombstones (no hash) so ``changed_since`` reports them too.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        # Identifies this manifest's generation numbering; a new one starts when it is lost
+        self.epoch = uuid.uuid4().hex
+        self.generation = 0
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.hashed = 0
+        # A new epoch must be saved even if no files are found, or every run mints another
+        self._dirty = True
+        if path is not None and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+                if data.get("version") == GATES_VERSION:
+                    self.epoch, self.generation, self.files = data["epoch"], data["generation"], data["files"]
+                    self._dirty = False
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable file manifest {path}: {e}")
+
+    def scan(self, root: Path, workers: Optional[int] = None) -> List[str]:
+        """Update the manifest from the files under ``root``; return the paths that changed."""
+        seen = set()
+        to_hash = []
+        base = str(root)
+        for path in list_files(root):
+            seen.add(path)
+            try:
+                stat = os.stat(os.path.join(base, path))
+            except OSError:
+                continue
+            entry = self.files.get(path)
+            if entry is None or entry["sha"] is None or (entry["mtime"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+                to_hash.append((path, stat))
+
+        generation = self.generation + 1
+        changed = []
+        # hashlib releases the GIL, so threads hash files in parallel
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = pool.map(lambda item: self._try_hash(os.path.join(base, item[0])), to_hash)
+            for (path, stat), digest in zip(to_hash, digests):
+                if digest is None:
+                    continue
+                entry = self.files.get(path)
+                if entry is None or entry["sha"] != digest:
+                    entry = {"sha": digest, "changed": generation}
+                    changed.append(path)
+                self.files[path] = dict(entry, mtime=stat.st_mtime_ns, size=stat.st_size)
+        self.hashed += len(to_hash)
+        self._dirty = self._dirty or bool(to_hash)
+
+        for path, entry in self.files.items():
+            if path not in seen and entry["sha"] is not None:
+                self.files[path] = {"sha": None, "changed": generation, "mtime": 0, "size": 0}
+                changed.append(path)
+        if changed:
+            self.generation = generation
+            self._dirty = True
+        return sorted(changed)
+
+    @staticmethod
+    def _try_hash(path: str) -> Optional[str]:
+        try:
+            return _hash_file(path)
+        except OSError:
+            return None
+
+    def changed_since(self, generation: int) -> List[str]:
+        """Return the paths (including deleted ones) whose content changed after ``generation``."""
+        return [path for path, entry in self.files.items() if entry["changed"] > generation]
+
+    def prune(self, generation: int) -> None:
+        """Forget deleted files whose deletion every consumer has seen (at or before ``generation``)."""
+        files = {
+            path: entry for path, entry in self.files.items()
+            if entry["sha"] is not None or entry["changed"] > generation
+        }
+        if len(files) != len(self.files):
+            self.files = files
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if it changed."""
+        if self.path is None or not self._dirty:
+            return
+        data = {"version": GATES_VERSION, "epoch": self.epoch, "generation": self.generation, "files": self.files}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, json.dumps(data).encode('utf-8'), fsync=False)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save file manifest {self.path}: {e}")
+
+
+def _truncate(text: str) -> str:
+    text = text.strip()
+    return text if len(text) <= MAX_DETAILS else "..." + text[-MAX_DETAILS:]
+
+
+def _run_command(argv: List[str], root: str, timeout: float) -> Tuple[int, str]:
+    if shutil.which(argv[0]) is None:
+        raise FileNotFoundError(f"{argv[0]} is not installed")
+    completed = subprocess.run(argv, cwd=root, capture_output=True, text=True, timeout=timeout)
+    return completed.returncode, completed.stdout + completed.stderr
+
+
+def has_runner(tool: str, settings: Dict[str, Any]) -> bool:
+    """Return True if a check with this tool and settings can be run automatically."""
+    return bool(settings.get("required_files") or settings.get("command")
+                or tool in TOOL_COMMANDS or tool in ("pytest-cov", "file_presence"))
+
+
+def run_check(spec: Dict[str, Any], root: str) -> Dict[str, Any]:
+    """Run one check described by plain data; executed in a worker process."""
+    settings = spec["settings"]
+    tool = spec["tool"]
+    timeout = parse_timeout(settings.get("timeout"))
+    started = time.perf_counter()
+    try:
+        if settings.get("required_files") or tool == "file_presence":
+            status, details = _check_file_presence(settings.get("required_files", []), root)
+        elif tool == "pytest-cov" and not settings.get("command"):
+            status, details = _check_coverage(settings, root, timeout)
+        elif has_runner(tool, settings):
+            code, output = _run_command(list(settings.get("command") or TOOL_COMMANDS[tool]), root, timeout)
+            status, details = (PASSED if code == 0 else FAILED), _truncate(output)
+        else:
+            status, details = SKIPPED, f"No automated runner for tool '{tool}'"
+    except subprocess.TimeoutExpired:
+        status, details = ERROR, f"Timed out after {timeout:.0f}s"
+    except Exception as e:
+        status, details = ERROR, str(e)
+    return {
+        "status": status,
+        "details": details,
+        "duration": time.perf_counter() - started,
+        "checked_at": datetime.utcnow().isoformat(),
+    }
+
+
+def _check_file_presence(patterns: List[str], root: str) -> Tuple[str, str]:
+    files = list_files(Path(root))
+    missing = [pattern for pattern in patterns if not match_files(files, [pattern])]
+    if missing:
+        return FAILED, "Missing: " + ", ".join(missing)
+    return PASSED, f"All {len(patterns)} required paths present"
+
+
+def _check_coverage(settings: Dict[str, Any], root: str, timeout: float) -> Tuple[str, str]:
+    threshold = parse_threshold(settings.get("pass_threshold"), default=80.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "coverage.json"
+        code, output = _run_command(
+            ["pytest", "-q", "--cov=.", f"--cov-report=json:{report}"], root, timeout
+        )
+        if code != 0:
+            return FAILED, _truncate(output)
+        covered = json.loads(report.read_text(encoding='utf-8'))["totals"]["percent_covered"]
+    status = PASSED if covered >= threshold else FAILED
+    return status, f"Coverage {covered:.1f}% (threshold {threshold:.0f}%)"
+
+
+class QualityGateEngine:
+    """Evaluates quality gates for the project rooted at ``root``.
+
+    Gate definitions are cached by the definitions file's hash. Check results
+    are reused until the check's settings or one of its input files change.
+    Results are written to ``<state_dir>/current-state.json``.
+    """
+
+    def __init__(self, root: Path = Path("."), gates_file: Path = DEFAULT_GATES_FILE,
+                 config_file: Optional[Path] = DEFAULT_CONFIG_FILE, state_dir: Path = DEFAULT_STATE_DIR,
+                 max_workers: Optional[int] = None, use_cache: bool = True):
+        self.root = Path(root)
+        self.gates_file = gates_file
+        self.state_dir = Path(state_dir)
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.overrides = self._load_overrides(config_file)
+        self.definitions_cache = FileCache(self.state_dir / "quality-gates-cache.pkl", version=GATES_VERSION)
+        self.results_path = self.state_dir / "quality-gate-results.json"
+        self.manifest_path = self.state_dir / "quality-gate-manifest.json"
+        self.gates = self._load_gates()
+
+    def _load_overrides(self, config_file: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+        if config_file is None:
+            return {}
+        path = config_file if config_file.is_absolute() else self.root / config_file
+        if not path.exists():
+            return {}
+        try:
+            data = yaml.safe_load(path.read_text(encoding='utf-8')) or {}
+        except (OSError, yaml.YAMLError) as e:
+            logger.error(f"Failed to load quality gate config {path}: {e}")
+            return {}
+        checks = data.get("checks", {}) if isinstance(data, dict) else {}
+        return {name: settings for name, settings in checks.items() if isinstance(settings, dict)}
+
+    def _load_gates(self) -> Dict[str, QualityGate]:
+        definitions = self.definitions_cache.get(self.gates_file)
+        if definitions is None:
+            data = self.gates_file.read_bytes()
+            definitions = self.definitions_cache.get(self.gates_file, data)
+            if definitions is None:
+                definitions = parse_gate_definitions(data.decode('utf-8'))
+                self.definitions_cache.put(self.gates_file, data, definitions)
+            self.definitions_cache.save()
+
+        gates = {}
+        for definition in definitions:
+            checks = []
+            for check in definition["checks"]:
+                settings = dict(check["settings"])
+                # "<check>" applies to every gate with that check, "<gate_id>.<check>" to one gate
+                settings.update(self.overrides.get(check["name"], {}))
+                settings.update(self.overrides.get(f"{definition['id']}.{check['name']}", {}))
+                tool = str(settings.pop("tool", check["tool"]))
+                checks.append(GateCheck(definition["id"], check["name"], tool, check["criteria"], settings))
+            gates[definition["id"]] = QualityGate(
+                definition["id"], definition["name"], definition["workflow"], tuple(checks)
+            )
+        return gates
+
+    def select(self, gate_ids: Optional[Iterable[str]] = None, workflow: Optional[str] = None) -> List[QualityGate]:
+        """Return the requested gates, or all gates that apply to ``workflow``."""
+        if gate_ids:
+            selected = []
+            for requested in gate_ids:
+                key = requested if requested in self.gates else f"gate_{requested}"
+                if key not in self.gates:
+                    raise ValueError(f"Unknown quality gate: {requested}")
+                selected.append(self.gates[key])
+            return selected
+        return [gate for gate in self.gates.values()
+                if workflow is None or gate.workflow in (None, workflow)]
+
+    def check_inputs(self, check: GateCheck) -> List[str]:
+        """Return the glob patterns of the files a check reads (every file if unknown)."""
+        settings = check.settings
+        return list(settings.get("inputs") or settings.get("required_files") or TOOL_INPUTS.get(check.tool, ALL_FILES))
+
+    def dependency_map(self, gates: Optional[Iterable[QualityGate]] = None) -> Dict[str, List[str]]:
+        """Return the input globs of each check, keyed by ``<gate_id>/<check>``."""
+        gates = self.gates.values() if gates is None else gates
+        return {f"{check.gate_id}/{check.name}": self.check_inputs(check) for gate in gates for check in gate.checks}
+
+    @staticmethod
+    def _spec_hash(check: GateCheck) -> str:
+        return hashlib.sha256(json.dumps(
+            [GATES_VERSION, check.gate_id, check.name, check.tool, check.settings], sort_keys=True, default=str
+        ).encode('utf-8')).hexdigest()
+
+    def _load_results_cache(self) -> Dict[str, Dict[str, Any]]:
+        # {"<gate_id>/<check>": {"spec": <settings hash>, "manifest": <epoch>, "generation": <n>, "result": {...}}}
+        if not self.use_cache or not self.results_path.exists():
+            return {}
+        try:
+            data = json.loads(self.results_path.read_text(encoding='utf-8'))
+            return data["checks"] if data.get("version") == GATES_VERSION else {}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable quality gate cache {self.results_path}: {e}")
+            return {}
+
+    def evaluate(self, gate_ids: Optional[Iterable[str]] = None, workflow: Optional[str] = None,
+                 record: bool = True) -> List[GateResult]:
+        """Run the automated checks of the selected gates and optionally record the outcome."""
+        gates = self.select(gate_ids, workflow)
+        checks = [check for gate in gates for check in gate.checks]
+        cache = self._load_results_cache()
+        manifest = FileManifest(self.manifest_path)
+        changed = manifest.scan(self.root) if self.use_cache else []
+        generation = manifest.generation
+
+        results: Dict[GateCheck, CheckResult] = {}
+        pending = []
+        for check in checks:
+            # Build-system style: re-run a check only if its settings changed or
+            # a file matching its inputs changed after it last ran
+            cached = cache.get(f"{check.gate_id}/{check.name}")
+            if (cached is not None and cached["manifest"] == manifest.epoch and cached["spec"] == self._spec_hash(check)
+                    and not match_files(manifest.changed_since(cached["generation"]), self.check_inputs(check))):
+                results[check] = CheckResult(check.gate_id, check.name, check.tool, cached=True, **cached["result"])
+            else:
+                pending.append(check)
+        logger.info(f"{len(changed)} files changed, re-running {len(pending)} of {len(checks)} checks")
+
+        runnable = [check for check in pending if has_runner(check.tool, check.settings)]
+        outcomes: Dict[GateCheck, Dict[str, Any]] = {}
+        if runnable:
+            root = str(self.root.resolve())
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {check: pool.submit(run_check, asdict(check), root) for check in runnable}
+                outcomes = {check: future.result() for check, future in futures.items()}
+        for check in pending:
+            outcome = outcomes.get(check) or {
+                "status": SKIPPED,
+                "details": f"No automated runner for tool '{check.tool}'",
+                "duration": 0.0,
+                "checked_at": datetime.utcnow().isoformat(),
+            }
+            results[check] = CheckResult(check.gate_id, check.name, check.tool, **outcome)
+            # Errors (missing tools, timeouts) are retried on the next run
+            if outcome["status"] != ERROR:
+                cache[f"{check.gate_id}/{check.name}"] = {
+                    "spec": self._spec_hash(check), "manifest": manifest.epoch,
+                    "generation": generation, "result": outcome,
+                }
+
+        if self.use_cache:
+            generations = [entry["generation"] for entry in cache.values() if entry["manifest"] == manifest.epoch]
+            manifest.prune(min(generations, default=generation))
+            manifest.save()
+            if pending:
+                self._save_results_cache(cache)
+        gate_results = [self._gate_result(gate, [results[check] for check in gate.checks]) for gate in gates]
+        if record:
+            self.record(gate_results)
+        return gate_results
+
+    @staticmethod
+    def _gate_result(gate: QualityGate, checks: List[CheckResult]) -> GateResult:
+        statuses = {check.status for check in checks}
+        if statuses & {FAILED, ERROR}:
+            status = FAILED
+        elif statuses == {PASSED}:
+            status = PASSED
+        elif PASSED in statuses:
+            status = PARTIAL
+        else:
+            status = SKIPPED
+        return GateResult(gate.id, gate.name, status, checks)
+
+    def _save_results_cache(self, cache: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            data = {"version": GATES_VERSION, "checks": cache}
+            atomic_write(self.results_path, json.dumps(data, indent=2).encode('utf-8'), fsync=False)
+        except OSError as e:
+            logger.warning(f"Failed to save quality gate cache {self.results_path}: {e}")
+
+    def record(self, results: List[GateResult]) -> None:
+        """Update ``quality_gates_passed`` and ``quality_gate_results`` in current-state.json."""
+        state_path = self.state_dir / "current-state.json"
+        state: Dict[str, Any] = {}
+        if state_path.exists():
+            try:
+                state = json.loads(state_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to read workflow state {state_path}: {e}")
+                return
+
+        passed = set(state.get("quality_gates_passed", []))
+        gate_results = state.setdefault("quality_gate_results", {})
+        now = datetime.utcnow().isoformat()
+        for result in results:
+            if result.status == PASSED:
+                passed.add(result.gate_id)
+            else:
+                passed.discard(result.gate_id)
+            gate_results[result.gate_id] = {
+                "name": result.name,
+                "status": result.status,
+                "evaluated_at": now,
+                "checks": {check.check: {"status": check.status, "details": check.details}
+                           for check in result.checks},
+            }
+        state["quality_gates_passed"] = sorted(passed, key=lambda gate: (len(gate), gate))
+
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(state_path, json.dumps(state, indent=2).encode('utf-8'))
+
+
+STATUS_ICONS = {PASSED: "✅", FAILED: "❌", ERROR: "⚠️", SKIPPED: "⏭️", PARTIAL: "🟡"}
+
+
+def format_results(results: List[GateResult]) -> List[str]:
+    """Render gate results as indented lines for the terminal."""
+    lines = []
+    for result in results:
+        lines.append(f"{STATUS_ICONS[result.status]} {result.name}")
+        for check in result.checks:
+            suffix = " (cached)" if check.cached else ""
+            lines.append(f"   {STATUS_ICONS[check.status]} {check.check} [{check.tool or 'manual'}]{suffix}")
+            if check.status in (FAILED, ERROR) and check.details:
+                lines.append("      " + check.details.splitlines()[-1])
+    return lines
+
+
+def main():
+    """Evaluate quality gates from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run quality gate automated checks")
+    parser.add_argument("gates", nargs="*", help="Gate ids or numbers (default: all gates of the workflow)")
+    parser.add_argument("--workflow", choices=["software_systems", "data_science"], default=None)
+    parser.add_argument("--root", default=".", help="Project root")
+    parser.add_argument("--workers", type=int, default=None, help="Number of check processes")
+    parser.add_argument("--no-cache", action="store_true", help="Re-run checks even if their inputs are unchanged")
+    args = parser.parse_args()
+
+    engine = QualityGateEngine(Path(args.root), state_dir=Path(args.root) / DEFAULT_STATE_DIR,
+                               max_workers=args.workers, use_cache=not args.no_cache)
+    results = engine.evaluate(args.gates, args.workflow)
+    print("\n".join(format_results(results)))
+    sys.exit(1 if any(result.status == FAILED for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
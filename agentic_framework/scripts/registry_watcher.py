@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Agent Registry Watcher
+
+Watches an agent directory and hot-reloads personas that are added, changed
+or deleted. Uses Linux inotify (through ctypes) when available and falls back
+to polling file mtimes everywhere else.
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+AGENT_FILE_PATTERN = "*-agent.md"
+
+# Times a persona that failed to reload is retried before waiting for its next change
+MAX_RELOAD_RETRIES = 3
+
+# inotify flags from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyUnavailable(OSError):
+    """Raised when inotify cannot be used on this platform."""
+
+
+class _Inotify:
+    """Minimal inotify wrapper reporting changed file names in one directory."""
+
+    def __init__(self, directory: Path):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise InotifyUnavailable("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise InotifyUnavailable("inotify is not supported on this platform")
+
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise InotifyUnavailable(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise InotifyUnavailable(errno, f"inotify_add_watch failed for {directory}")
+
+    def read(self, timeout: float) -> Optional[Set[str]]:
+        """Return names changed within ``timeout`` seconds, or None on queue overflow."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        names: Set[str] = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                return None
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class RegistryWatcher:
+    """Background thread that hot-reloads an AgentRegistry as its files change.
+
+    Changes are applied through ``AgentRegistry.reload_paths`` (inotify) or
+    ``AgentRegistry.reload_changed`` (polling), which swap the new personas
+    into the registry without blocking readers. Files that fail to reload
+    (e.g. caught mid-write) are retried after ``interval`` seconds, up to
+    MAX_RELOAD_RETRIES times.
+    """
+
+    def __init__(self, registry: Any, interval: float = 1.0, use_inotify: bool = True,
+                 settle_delay: float = 0.05):
+        self.registry = registry
+        self.interval = interval
+        self.settle_delay = settle_delay
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify(registry.agents_directory)
+            except (InotifyUnavailable, OSError) as e:
+                logger.info(f"inotify unavailable, polling {registry.agents_directory} instead: {e}")
+        self._retries: Dict[Path, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="agent-registry-watcher", daemon=True)
+
+    @property
+    def mode(self) -> str:
+        """The change-detection mechanism in use: "inotify" or "polling"."""
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self) -> "RegistryWatcher":
+        """Start watching in the background."""
+        self._thread.start()
+        logger.info(f"Watching {self.registry.agents_directory} for persona changes ({self.mode})")
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop watching and wait for the background thread to exit."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._inotify is not None:
+                    self._wait_for_inotify()
+                else:
+                    self._stop.wait(self.interval)
+                    if not self._stop.is_set():
+                        self._reload(None)
+            except Exception as e:
+                logger.error(f"Agent registry watcher error: {e}")
+                self._stop.wait(self.interval)
+
+    def _wait_for_inotify(self) -> None:
+        names = self._inotify.read(self.interval)
+        if names is None:
+            self._reload(None)
+            return
+        if not names:
+            if self._retries:
+                self._reload(set(self._retries))
+            return
+
+        # Editors often emit several events per save; collect them briefly
+        self._stop.wait(self.settle_delay)
+        while True:
+            more = self._inotify.read(0)
+            if more is None:
+                self._reload(None)
+                return
+            if not more:
+                break
+            names |= more
+
+        paths = {
+            self.registry.agents_directory / name
+            for name in names if fnmatch.fnmatch(name, AGENT_FILE_PATTERN)
+        }
+        if paths:
+            # A fresh change to a failed file starts its retries over
+            for path in paths:
+                self._retries.pop(path, None)
+            self._reload(paths | set(self._retries))
+
+    def _reload(self, paths: Optional[Set[Path]]) -> None:
+        """Reload ``paths`` (None: everything changed) and schedule retries for failures."""
+        if paths is None:
+            failed = {Path(path) for path in self.registry.reload_changed().get("failed", ())}
+            # Polling only sees files whose signature changed again; retry the rest
+            retry = set(self._retries) - failed
+            if retry:
+                failed |= {Path(path) for path in self.registry.reload_paths(retry).get("failed", ())}
+        else:
+            failed = {Path(path) for path in self.registry.reload_paths(paths).get("failed", ())}
+        for path in list(self._retries):
+            if path not in failed:
+                del self._retries[path]
+        for path in failed:
+            attempts = self._retries.get(path, 0) + 1
+            if attempts > MAX_RELOAD_RETRIES:
+                logger.error(f"Giving up reloading {path} until it changes again")
+                self._retries.pop(path, None)
+            else:
+                self._retries[path] = attempts
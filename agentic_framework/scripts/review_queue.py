@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Reviewer Workload Tracking
+
+Keeps a live queue per human reviewer of the tasks waiting for their review
+(``draft_ready`` and ``under_review``) across all projects, and picks the
+reviewer for a new task from the team members eligible to review it:
+
+* ``primary`` - always the first eligible member (the team role named after
+  the agent).
+* ``least_loaded`` - the member with the lowest load, where a task in the
+  review queue counts 1 and a task still being worked on counts
+  ``pending_weight`` (it reaches the reviewer later).
+* ``weighted`` - like ``least_loaded``, with each load divided by the
+  reviewer's capacity weight (default 1).
+
+Ties go to the earlier member in preference order. The WorkflowEngine
+updates the queues on every task mutation, like the task index.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+sys.path.append(str(Path(__file__).parent))
+
+from task_state_machine import APPROVED, COMPLETED, DRAFT_READY, UNDER_REVIEW
+
+# Statuses in which a task waits in its reviewer's queue
+REVIEW_STATES = frozenset({DRAFT_READY, UNDER_REVIEW})
+
+# Statuses in which a task no longer needs its reviewer
+CLOSED_STATES = frozenset({APPROVED, COMPLETED})
+
+# Assignment policies
+PRIMARY = "primary"
+LEAST_LOADED = "least_loaded"
+WEIGHTED = "weighted"
+ASSIGNMENT_POLICIES = (PRIMARY, LEAST_LOADED, WEIGHTED)
+
+DEFAULT_PENDING_WEIGHT = 0.5
+
+
+class _Entry(NamedTuple):
+    reviewer: str
+    status: str
+
+
+class ReviewQueue:
+    """Per-reviewer review queues, workload counters and review-time statistics.
+
+    Tasks are indexed by their ``id``, ``human_reviewer`` and ``status``
+    attributes. A task's wait starts when it becomes ``draft_ready``; its
+    review time is recorded when it leaves ``under_review`` (approved or sent
+    back for revision). Methods are safe to call from multiple threads.
+    """
+
+    def __init__(self, policy: str = LEAST_LOADED, weights: Optional[Dict[str, float]] = None,
+                 pending_weight: float = DEFAULT_PENDING_WEIGHT):
+        if policy not in ASSIGNMENT_POLICIES:
+            raise ValueError(f"Unknown reviewer assignment policy: {policy}")
+        if any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError("Reviewer weights must be positive")
+        self.policy = policy
+        self.weights = dict(weights or {})
+        self.pending_weight = pending_weight
+        self._entries: Dict[str, _Entry] = {}
+        # reviewer -> {task_id: time the task entered the queue}, oldest first
+        self._queues: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._open: Counter = Counter()
+        self._reviews: Counter = Counter()
+        self._review_time: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def add(self, task: Any) -> None:
+        """Index a task, replacing its previous entry if it was already indexed."""
+        with self._lock:
+            self._remove(task.id)
+            if not task.human_reviewer:
+                return
+            entry = _Entry(task.human_reviewer, task.status)
+            self._entries[task.id] = entry
+            if entry.status not in CLOSED_STATES:
+                self._open[entry.reviewer] += 1
+            if entry.status in REVIEW_STATES:
+                self._queues[entry.reviewer][task.id] = time.time()
+
+    def set_status(self, task_id: str, status: str) -> None:
+        """Move an indexed task to a new status."""
+        with self._lock:
+            old = self._entries.get(task_id)
+            if old is None or old.status == status:
+                return
+            reviewer = old.reviewer
+            now = time.time()
+
+            queue = self._queues[reviewer]
+            if old.status in REVIEW_STATES and status not in REVIEW_STATES:
+                entered = queue.pop(task_id, now)
+                if old.status == UNDER_REVIEW:
+                    self._reviews[reviewer] += 1
+                    self._review_time[reviewer] += now - entered
+            elif status in REVIEW_STATES and task_id not in queue:
+                queue[task_id] = now
+            if not queue:
+                del self._queues[reviewer]
+
+            if old.status not in CLOSED_STATES and status in CLOSED_STATES:
+                self._decrement_open(reviewer)
+            elif old.status in CLOSED_STATES and status not in CLOSED_STATES:
+                self._open[reviewer] += 1
+            self._entries[task_id] = old._replace(status=status)
+
+    def remove(self, task_id: str) -> None:
+        """Remove a task from the queues."""
+        with self._lock:
+            self._remove(task_id)
+
+    def _remove(self, task_id: str) -> None:
+        old = self._entries.pop(task_id, None)
+        if old is None:
+            return
+        if old.status not in CLOSED_STATES:
+            self._decrement_open(old.reviewer)
+        queue = self._queues.get(old.reviewer)
+        if queue is not None:
+            queue.pop(task_id, None)
+            if not queue:
+                del self._queues[old.reviewer]
+
+    def _decrement_open(self, reviewer: str) -> None:
+        self._open[reviewer] -= 1
+        if not self._open[reviewer]:
+            del self._open[reviewer]
+
+    def replay(self, review_since: Dict[str, str]) -> None:
+        """Restore when queued tasks entered review (``TaskStatusView.review_since``).
+
+        Tasks indexed on startup otherwise count their wait from the moment
+        they were indexed.
+        """
+        entered = {
+            # Journal timestamps are naive UTC
+            task_id: datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+            for task_id, timestamp in review_since.items()
+        }
+        with self._lock:
+            for reviewer, queue in self._queues.items():
+                restored = {task_id: entered.get(task_id, since) for task_id, since in queue.items()}
+                self._queues[reviewer] = dict(sorted(restored.items(), key=lambda item: item[1]))
+
+    def load(self, reviewer: str) -> float:
+        """Return a reviewer's load: queued tasks plus ``pending_weight`` per task still in progress."""
+        with self._lock:
+            return self._load(reviewer)
+
+    def _load(self, reviewer: str) -> float:
+        queued = len(self._queues.get(reviewer, ()))
+        return queued + self.pending_weight * (self._open.get(reviewer, 0) - queued)
+
+    def choose(self, candidates: Sequence[str]) -> str:
+        """Pick the reviewer for a new task from eligible members in preference order ("" if none)."""
+        if not candidates:
+            return ""
+        if self.policy == PRIMARY or len(candidates) == 1:
+            return candidates[0]
+        with self._lock:
+            if self.policy == WEIGHTED:
+                return min(candidates, key=lambda reviewer: self._load(reviewer) / self.weights.get(reviewer, 1.0))
+            return min(candidates, key=self._load)
+
+    def queue(self, reviewer: str) -> List[str]:
+        """Return the ids of tasks waiting for a reviewer, longest waiting first."""
+        with self._lock:
+            return list(self._queues.get(reviewer, ()))
+
+    def depth(self, reviewer: str) -> int:
+        """Return the number of tasks waiting for a reviewer."""
+        with self._lock:
+            return len(self._queues.get(reviewer, ()))
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return queue depth, workload and review-time statistics per reviewer."""
+        now = time.time()
+        with self._lock:
+            reviewers = set(self._open) | set(self._queues) | set(self._reviews)
+            metrics = {}
+            for reviewer in sorted(reviewers):
+                queue = self._queues.get(reviewer, {})
+                statuses = Counter(self._entries[task_id].status for task_id in queue)
+                reviews = self._reviews.get(reviewer, 0)
+                metrics[reviewer] = {
+                    "queue_depth": len(queue),
+                    "draft_ready": statuses.get(DRAFT_READY, 0),
+                    "under_review": statuses.get(UNDER_REVIEW, 0),
+                    "open_tasks": self._open.get(reviewer, 0),
+                    "load": self._load(reviewer),
+                    "weight": self.weights.get(reviewer, 1.0),
+                    "oldest_wait": now - min(queue.values()) if queue else 0.0,
+                    "reviews": reviews,
+                    "mean_review_time": self._review_time[reviewer] / reviews if reviews else None,
+                }
+            return metrics
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
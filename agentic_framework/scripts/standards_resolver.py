@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Development Standards Resolver
+
+Maps the ``./development-standards/<ref>`` references found in personas to
+the standards files shipped under templates/.github/development_standards/
+(or copied into a project), tolerating naming drift such as zero-width
+characters, case and ``-``/``_`` differences. Documents are normalized once
+and cached by content hash, in memory and under .agentic-state/, so each
+file is read once per change and identical documents are shared.
+"""
+
+import hashlib
+import os
+import re
+import sys
+import threading
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+sys.path.append(str(Path(__file__).parent))
+
+from file_cache import FileCache, DEFAULT_STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when normalize_document changes to invalidate cached documents
+NORMALIZER_VERSION = "1"
+
+# Standards shipped with the framework; in projects this resolves to the
+# copied templates/ directory next to agentic-scripts/
+PACKAGE_STANDARDS_DIR = Path(__file__).resolve().parent.parent / "templates" / ".github" / "development_standards"
+
+DEFAULT_SEARCH_PATHS = (
+    Path("./development-standards"),
+    Path("./.github/development_standards"),
+    PACKAGE_STANDARDS_DIR,
+)
+
+STANDARD_FILE_SUFFIXES = (".md", ".json", ".yaml", ".yml", ".txt")
+
+_INVISIBLE_CHARS = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
+
+def normalize_standard_name(name: str) -> str:
+    """Reduce a standards file name or reference to its lookup key."""
+    name = unicodedata.normalize("NFKC", name).translate(_INVISIBLE_CHARS)
+    return name.strip().lower().replace("-", "_").replace(" ", "_")
+
+
+def normalize_document(data: bytes) -> str:
+    """Decode a standards file and normalize BOMs, invisible characters, newlines and blank runs."""
+    text = data.decode("utf-8-sig", errors="replace").translate(_INVISIBLE_CHARS)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return _BLANK_RUN_RE.sub("\n\n", text).strip()
+
+
+@dataclass(frozen=True)
+class StandardDocument:
+    """A resolved standards document."""
+    ref: str
+    path: Path
+    digest: str
+    content: str
+
+    @property
+    def empty(self) -> bool:
+        """Whether the document has no content yet (many standards are placeholders)."""
+        return not self.content
+
+
+class StandardsResolver:
+    """Resolves persona standards references to normalized documents.
+
+    Search paths are scanned once; the first directory containing a file
+    wins. Documents are memoized per reference until their file changes,
+    contents are deduplicated by SHA-256 digest, and normalized contents are
+    kept in a FileCache so later processes skip decoding and normalization
+    for unchanged files.
+    """
+
+    DEFAULT_CACHE_PATH = DEFAULT_STATE_DIR / "standards-cache.pkl"
+
+    def __init__(self, search_paths: Iterable[Path] = DEFAULT_SEARCH_PATHS,
+                 cache_path: Optional[Path] = DEFAULT_CACHE_PATH):
+        self.search_paths = [Path(p) for p in search_paths]
+        self.cache = FileCache(cache_path, version=NORMALIZER_VERSION) if cache_path is not None else None
+        self._files: Optional[Dict[str, Path]] = None
+        # ref -> (file signature when resolved, document)
+        self._documents: Dict[str, Tuple[Optional[Tuple[int, int]], Optional[StandardDocument]]] = {}
+        self._contents: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.files_read = 0
+
+    def _index_files(self) -> Dict[str, Path]:
+        files: Dict[str, Path] = {}
+        for directory in self.search_paths:
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.iterdir()):
+                if path.is_file() and path.suffix.lower() in STANDARD_FILE_SUFFIXES:
+                    files.setdefault(normalize_standard_name(path.name), path)
+        return files
+
+    def find_file(self, ref: str) -> Optional[Path]:
+        """Return the standards file for a reference, or None if there is none."""
+        with self._lock:
+            if self._files is None:
+                self._files = self._index_files()
+            return self._files.get(normalize_standard_name(Path(ref).name))
+
+    def resolve(self, ref: str) -> Optional[StandardDocument]:
+        """Return the document for a reference, or None if no file matches it."""
+        document = self._resolve(ref)
+        self.save()
+        return document
+
+    def resolve_many(self, refs: Iterable[str]) -> Dict[str, Optional[StandardDocument]]:
+        """Resolve several references, preserving their order."""
+        documents = {ref: self._resolve(ref) for ref in refs}
+        self.save()
+        return documents
+
+    @staticmethod
+    def _signature(path: Optional[Path]) -> Optional[Tuple[int, int]]:
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def signatures(self, refs: Iterable[str]) -> Tuple[Tuple[str, Optional[Tuple[int, int]]], ...]:
+        """Return each reference's file (mtime, size), which changes whenever its document does."""
+        return tuple((ref, self._signature(self.find_file(ref))) for ref in refs)
+
+    def _resolve(self, ref: str) -> Optional[StandardDocument]:
+        path = self.find_file(ref)
+        signature = self._signature(path)
+        with self._lock:
+            # A document is reused until its file changes
+            entry = self._documents.get(ref)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+
+        document = None
+        if path is None:
+            logger.debug(f"Standards reference not found: {ref}")
+        else:
+            try:
+                digest, content = self._load(path)
+                document = StandardDocument(ref=ref, path=path, digest=digest, content=content)
+            except (OSError, UnicodeError) as e:
+                logger.error(f"Failed to load standards document {path}: {e}")
+
+        with self._lock:
+            self._documents[ref] = (signature, document)
+        return document
+
+    def _load(self, path: Path) -> tuple:
+        cached = self.cache.get(path) if self.cache is not None else None
+        if cached is None:
+            data = path.read_bytes()
+            self.files_read += 1
+            cached = self.cache.get(path, data) if self.cache is not None else None
+            if cached is None:
+                cached = {"digest": hashlib.sha256(data).hexdigest(), "content": normalize_document(data)}
+                if self.cache is not None:
+                    self.cache.put(path, data, cached)
+
+        digest = cached["digest"]
+        with self._lock:
+            # Identical documents share one string
+            content = self._contents.setdefault(digest, cached["content"])
+        return digest, content
+
+    def unresolved(self, refs: Iterable[str]) -> List[str]:
+        """Return the references with no matching file."""
+        return [ref for ref, document in self.resolve_many(refs).items() if document is None]
+
+    def save(self) -> None:
+        """Write documents loaded since the last save to the on-disk cache."""
+        if self.cache is not None:
+            self.cache.save()
+
+    def close(self) -> None:
+        """Write any unsaved documents to the cache."""
+        self.save()
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Workflow State Storage
+
+Pluggable persistence for WorkflowEngine and CommunicationHub state. Projects,
+tasks and messages are stored as serialized records; changes are written as
+batches of ``put``/``delete`` records built with ``make_record``.
+
+Two backends are provided:
+
+* ``JournalStateStore`` - a JSON snapshot plus an append-only journal of
+  changes, periodically compacted into a new snapshot so recovery never
+  replays more than a bounded number of entries.
+* ``SQLiteStateStore`` - a SQLite database in WAL mode with indexed columns
+  for project, task status, agent and timestamp, suited to large histories
+  and several CLI processes sharing one state file.
+"""
+
+import atexit
+import heapq
+import json
+import os
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+sys.path.append(str(Path(__file__).parent))
+
+from atomic_io import FileLock, atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Record kinds and the top-level state section each one is stored in
+STATE_SECTIONS = {"project": "projects", "task": "tasks", "message": "messages"}
+
+PUT = "put"
+DELETE = "delete"
+
+# File suffixes that select the SQLite backend in open_state_store
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# Seconds JournalStateStore waits to coalesce appended records into one write
+DEFAULT_FLUSH_INTERVAL = 0.25
+
+
+def make_record(kind: str, record_id: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Build a record that stores (or, without data, deletes) an object."""
+    if data is None:
+        return {"op": DELETE, "kind": kind, "id": record_id}
+    return {"op": PUT, "kind": kind, "id": record_id, "data": data}
+
+
+def apply_record(state: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+    """Apply one record to a ``{"projects": ..., "tasks": ..., "messages": ...}`` state."""
+    section = state.setdefault(STATE_SECTIONS[record["kind"]], {})
+    if record["op"] == PUT:
+        section[record["id"]] = record["data"]
+    else:
+        section.pop(record["id"], None)
+
+
+def task_project_id(task_id: str, data: Optional[Dict[str, Any]] = None) -> str:
+    """Return the project a task belongs to."""
+    if data and data.get("project_id"):
+        return data["project_id"]
+    return task_id.rsplit("_task_", 1)[0]
+
+
+def _message_matches(message: Dict[str, Any], agent: Optional[str], since: Optional[str]) -> bool:
+    if agent is not None and message.get("from") != agent and message.get("to") != agent:
+        return False
+    return since is None or message.get("timestamp", "") >= since
+
+
+class StateStore(ABC):
+    """Storage backend for serialized projects, tasks and messages."""
+
+    # Whether query_messages can return messages beyond a limit_messages window
+    keeps_all_messages = True
+
+    @abstractmethod
+    def load(self, exclude_statuses: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+        """Return the saved ``projects`` and ``tasks`` keyed by id.
+
+        Tasks in ``exclude_statuses`` are left in the store; ``excluded``
+        maps each project id to the number of them per status.
+        """
+
+    @abstractmethod
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        """Persist a batch of records built with ``make_record``."""
+
+    @abstractmethod
+    def query_tasks(self, project_id: Optional[str] = None, status: Optional[str] = None,
+                    agent: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return serialized tasks matching every given filter, oldest first."""
+
+    @abstractmethod
+    def task_status_counts(self, project_id: str) -> Dict[str, int]:
+        """Return the number of tasks in each status for a project."""
+
+    @abstractmethod
+    def query_messages(self, agent: Optional[str] = None, since: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return messages sent or received by ``agent``, newest first."""
+
+    def limit_messages(self, max_messages: Optional[int], retention: Optional[float] = None) -> None:
+        """Keep at most ``max_messages`` messages, none older than ``retention`` seconds.
+
+        Backends that index messages may ignore this and keep full history.
+        """
+
+    def needs_compaction(self) -> bool:
+        """Whether ``compact`` should be called."""
+        return False
+
+    def compact(self) -> None:
+        """Fold incremental writes into the backend's compact form."""
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class JournalStateStore(StateStore):
+    """Snapshot file plus an append-only JSON-lines journal.
+
+    Every journal record carries a sequence number and the snapshot records
+    the last sequence number it includes, so a crash between writing a new
+    snapshot and truncating the journal never replays a record twice. A torn
+    final journal line (a crash mid-append) is discarded on load.
+
+    Records passed to ``append`` within ``flush_interval`` seconds are written
+    together with a single fsync; call ``flush`` (or ``close``) to write them
+    immediately. Snapshots are replaced atomically. All file access happens
+    under an advisory lock on ``<snapshot>.lock``, and changes journaled by
+    other processes are picked up before each write or query.
+
+    Messages are kept in the order they were stored; ``limit_messages``
+    bounds them like the hub's MessageStore, evicting the oldest first, so
+    neither memory nor the snapshot grows with message history.
+    """
+
+    keeps_all_messages = False
+
+    def __init__(self, snapshot_path: Path = Path("./workflow_state.json"),
+                 journal_path: Path = None, compact_every: int = 500,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, fsync: bool = True):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or snapshot_path.with_suffix(".journal")
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._lock = FileLock(snapshot_path.with_suffix(".lock"))
+        self._state: Dict[str, Dict[str, Any]] = {section: {} for section in STATE_SECTIONS.values()}
+        self._state["messages"] = OrderedDict()
+        self.max_messages: Optional[int] = None
+        self.message_retention: Optional[float] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._seq = 0
+        self._journal_entries = 0
+        self._journal_offset = 0
+        self._snapshot_signature: Optional[Tuple[int, int, int]] = None
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load(self, exclude_statuses: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+        """Return the saved state: the snapshot with the journal replayed on top."""
+        excluded_statuses = frozenset(exclude_statuses)
+        tasks: Dict[str, Dict[str, Any]] = {}
+        excluded: Dict[str, Counter] = {}
+        with self._lock:
+            self._reload()
+            for task_id, task in self._state["tasks"].items():
+                if task["status"] in excluded_statuses:
+                    excluded.setdefault(task_project_id(task_id, task), Counter())[task["status"]] += 1
+                else:
+                    tasks[task_id] = task
+            return {"projects": dict(self._state["projects"]), "tasks": tasks,
+                    "excluded": {project_id: dict(counts) for project_id, counts in excluded.items()}}
+
+    def _reload(self) -> None:
+        state: Dict[str, Dict[str, Any]] = {section: {} for section in STATE_SECTIONS.values()}
+        snapshot_seq = 0
+
+        signature = self._signature(self.snapshot_path)
+        if signature is not None:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            for section in STATE_SECTIONS.values():
+                state[section] = snapshot.get(section, {})
+            snapshot_seq = snapshot.get("journal_seq", 0)
+        state["messages"] = OrderedDict(state["messages"])
+
+        self._state = state
+        self._snapshot_signature = signature
+        self._seq = snapshot_seq
+        self._journal_entries = 0
+        self._journal_offset = 0
+        self._replay_journal()
+
+        # Changes not yet flushed still apply on top of what is on disk
+        for record in self._pending:
+            self._apply(record)
+        self._trim_messages()
+
+    def _catch_up(self) -> None:
+        """Apply changes journaled by other processes since the last read."""
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except OSError:
+            journal_size = 0
+        if (
+            self._signature(self.snapshot_path) != self._snapshot_signature
+            or journal_size < self._journal_offset
+        ):
+            # Another process compacted the journal into a new snapshot
+            self._reload()
+        elif journal_size > self._journal_offset:
+            self._replay_journal()
+            for record in self._pending:
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        apply_record(self._state, record)
+        if record["kind"] == "message" and record["op"] == PUT:
+            self._trim_messages()
+
+    def _trim_messages(self) -> None:
+        """Evict the oldest messages beyond ``max_messages`` or ``message_retention``."""
+        messages = self._state["messages"]
+        if self.max_messages is not None:
+            while len(messages) > self.max_messages:
+                messages.popitem(last=False)
+        if self.message_retention is not None and messages:
+            cutoff = (datetime.utcnow() - timedelta(seconds=self.message_retention)).isoformat()
+            while messages and next(iter(messages.values())).get("timestamp", "") < cutoff:
+                messages.popitem(last=False)
+
+    def _replay_journal(self) -> None:
+        for record in self._read_journal():
+            if record["seq"] > self._seq:
+                self._apply(record)
+                self._seq = record["seq"]
+                self._journal_entries += 1
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        """Read journal records past ``_journal_offset`` and advance it."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        # Drop a torn final line so the next append starts on a fresh line
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            logger.warning(f"Discarding incomplete journal entry in {self.journal_path}")
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(self._journal_offset + complete)
+        self._journal_offset += complete
+
+        records = []
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring unreadable journal entry in {self.journal_path}")
+        return records
+
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        """Queue records for the journal, writing them after ``flush_interval``."""
+        if not records:
+            return
+        with self._lock:
+            self._pending.extend(records)
+            for record in records:
+                self._apply(record)
+            if self.flush_interval <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush workflow journal {self.journal_path}: {e}")
+
+    def flush(self) -> None:
+        """Write all queued records to the journal with a single write and fsync."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+
+            self._catch_up()
+            seq = self._seq
+            lines = []
+            for record in self._pending:
+                seq += 1
+                lines.append(json.dumps(dict(record, seq=seq)) + "\n")
+            data = "".join(lines).encode('utf-8')
+
+            with open(self.journal_path, 'ab') as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            self._journal_offset += len(data)
+            self._journal_entries += len(self._pending)
+            self._seq = seq
+            self._pending = []
+
+    def query_tasks(self, project_id: Optional[str] = None, status: Optional[str] = None,
+                    agent: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._catch_up()
+            return [
+                task for task_id, task in self._state["tasks"].items()
+                if (project_id is None or task_project_id(task_id, task) == project_id)
+                and (status is None or task["status"] == status)
+                and (agent is None or task["agent"] == agent)
+            ]
+
+    def task_status_counts(self, project_id: str) -> Dict[str, int]:
+        return dict(Counter(task["status"] for task in self.query_tasks(project_id=project_id)))
+
+    def query_messages(self, agent: Optional[str] = None, since: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        def timestamp(message: Dict[str, Any]) -> str:
+            return message["timestamp"]
+
+        with self._lock:
+            self._catch_up()
+            matches = (
+                message for message in self._state["messages"].values()
+                if _message_matches(message, agent, since)
+            )
+            if limit is not None:
+                return heapq.nlargest(limit, matches, key=timestamp)
+            return sorted(matches, key=timestamp, reverse=True)
+
+    def limit_messages(self, max_messages: Optional[int], retention: Optional[float] = None) -> None:
+        with self._lock:
+            self.max_messages = max_messages
+            self.message_retention = retention
+            self._trim_messages()
+
+    def needs_compaction(self) -> bool:
+        """Whether the journal has grown past ``compact_every`` entries."""
+        return self._journal_entries + len(self._pending) >= self.compact_every
+
+    def compact(self) -> None:
+        """Atomically replace the snapshot with the current state and truncate the journal."""
+        with self._lock:
+            self.flush()
+            self._catch_up()
+            data = dict(self._state)
+            data["journal_seq"] = self._seq
+            data["last_updated"] = datetime.utcnow().isoformat()
+            atomic_write(self.snapshot_path, json.dumps(data).encode('utf-8'), fsync=self.fsync)
+            with open(self.journal_path, 'wb'):
+                pass
+            self._snapshot_signature = self._signature(self.snapshot_path)
+            self._journal_offset = 0
+            self._journal_entries = 0
+
+    def close(self) -> None:
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+class SQLiteStateStore(StateStore):
+    """SQLite database in WAL mode.
+
+    Each object is stored as JSON next to the columns used for lookups, so
+    status counts, per-agent task lists and message history are answered by
+    indexes rather than by loading every record. WAL mode lets several
+    processes read while one writes; each ``append`` is one transaction.
+    Messages are not returned by ``load`` and are only read through
+    ``query_messages``.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS projects (
+            id TEXT PRIMARY KEY,
+            status TEXT,
+            created_at TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            agent TEXT NOT NULL,
+            created_at TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_project_status ON tasks (project_id, status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_agent ON tasks (agent, status);
+        CREATE TABLE IF NOT EXISTS messages (
+            id TEXT PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            sender TEXT,
+            recipient TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages (sender, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_messages_recipient ON messages (recipient, timestamp);
+    """
+
+    def __init__(self, db_path: Path = Path("./workflow_state.db"), timeout: float = 30.0):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), timeout=timeout, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def load(self, exclude_statuses: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+        excluded_statuses = list(exclude_statuses)
+        placeholders = ", ".join("?" * len(excluded_statuses))
+        with self._lock:
+            projects = self._conn.execute("SELECT id, data FROM projects ORDER BY created_at, id").fetchall()
+            if excluded_statuses:
+                # Excluded tasks are only counted (from the status index), never decoded
+                tasks = self._conn.execute(
+                    f"SELECT id, data FROM tasks WHERE status NOT IN ({placeholders}) ORDER BY created_at, id",
+                    excluded_statuses,
+                ).fetchall()
+                counts = self._conn.execute(
+                    f"SELECT project_id, status, COUNT(*) FROM tasks WHERE status IN ({placeholders}) "
+                    f"GROUP BY project_id, status",
+                    excluded_statuses,
+                ).fetchall()
+            else:
+                tasks = self._conn.execute("SELECT id, data FROM tasks ORDER BY created_at, id").fetchall()
+                counts = []
+        excluded: Dict[str, Dict[str, int]] = {}
+        for project_id, status, count in counts:
+            excluded.setdefault(project_id, {})[status] = count
+        return {
+            "projects": {row[0]: json.loads(row[1]) for row in projects},
+            "tasks": {row[0]: json.loads(row[1]) for row in tasks},
+            "excluded": excluded,
+        }
+
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for record in records:
+                    self._write(record)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        table = STATE_SECTIONS[record["kind"]]
+        if record["op"] == DELETE:
+            self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (record["id"],))
+            return
+
+        data = record["data"]
+        payload = json.dumps(data)
+        if record["kind"] == "project":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects (id, status, created_at, data) VALUES (?, ?, ?, ?)",
+                (record["id"], data.get("status"), data.get("created_at"), payload),
+            )
+        elif record["kind"] == "task":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks (id, project_id, status, agent, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (record["id"], task_project_id(record["id"], data), data["status"], data["agent"],
+                 data.get("created_at"), payload),
+            )
+        else:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO messages (id, timestamp, sender, recipient, data) VALUES (?, ?, ?, ?, ?)",
+                (record["id"], data["timestamp"], data.get("from"), data.get("to"), payload),
+            )
+
+    def query_tasks(self, project_id: Optional[str] = None, status: Optional[str] = None,
+                    agent: Optional[str] = None) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        for column, value in (("project_id", project_id), ("status", status), ("agent", agent)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT data FROM tasks{where} ORDER BY created_at, id", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def task_status_counts(self, project_id: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE project_id = ? GROUP BY status", (project_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def query_messages(self, agent: Optional[str] = None, since: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        since_clause = " AND timestamp >= ?" if since is not None else ""
+        since_params = [since] if since is not None else []
+        if agent is None:
+            sql = f"SELECT data, timestamp FROM messages WHERE 1 = 1{since_clause}"
+            params = since_params
+        else:
+            # A UNION lets each branch use its own (sender|recipient, timestamp) index
+            sql = (
+                f"SELECT data, timestamp FROM messages WHERE sender = ?{since_clause} "
+                f"UNION SELECT data, timestamp FROM messages WHERE recipient = ?{since_clause}"
+            )
+            params = [agent] + since_params + [agent] + since_params
+        sql += " ORDER BY timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [limit]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def compact(self) -> None:
+        """Checkpoint the write-ahead log into the main database file."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_state_store(path: Path, compact_every: int = 500,
+                     flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> StateStore:
+    """Open the backend matching ``path``: SQLite for .db/.sqlite files, else the JSON journal."""
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        return SQLiteStateStore(path)
+    return JournalStateStore(path, compact_every=compact_every, flush_interval=flush_interval)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Asynchronous Task Executor
+
+Dispatches agent prompts from WorkflowEngine.assign_task to a pluggable model
+backend concurrently, with global and per-agent concurrency limits, timeouts,
+retries with exponential backoff and cancellation.
+"""
+
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# TaskResult.status values
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+
+
+class ModelBackend(ABC):
+    """Model that turns an agent prompt into the agent's response.
+
+    ``context_tokens`` is the model's context window; when set, prompts are
+    pruned to fit it minus ``ExecutorSettings.response_tokens``.
+    """
+
+    context_tokens: Optional[int] = None
+
+    @abstractmethod
+    async def complete(self, prompt: str, agent: str, task_id: str) -> str:
+        """Return the model's response to ``prompt``."""
+
+
+class FakeModelBackend(ModelBackend):
+    """Local stand-in backend for tests and dry runs.
+
+    Responds after ``latency`` seconds (plus up to ``jitter`` seconds) with a
+    canned response. ``failures`` maps task ids to the number of attempts that
+    should raise before one succeeds; ``failure_rate`` fails attempts at
+    random. Every call is recorded in ``calls``.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 failures: Optional[Dict[str, int]] = None, failure_rate: float = 0.0,
+                 seed: Optional[int] = None, context_tokens: Optional[int] = None):
+        self.latency = latency
+        self.context_tokens = context_tokens
+        self.jitter = jitter
+        self.failures = dict(failures or {})
+        self.failure_rate = failure_rate
+        self.calls: List[Dict[str, Any]] = []
+        self._random = random.Random(seed)
+
+    async def complete(self, prompt: str, agent: str, task_id: str) -> str:
+        self.calls.append({"agent": agent, "task_id": task_id, "prompt_length": len(prompt)})
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+        if self.failures.get(task_id, 0) > 0:
+            self.failures[task_id] -= 1
+            raise RuntimeError(f"Simulated failure for {task_id}")
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise RuntimeError(f"Simulated random failure for {task_id}")
+        return f"[{agent}] Draft deliverables for {task_id}"
+
+
+@dataclass
+class TaskResult:
+    """Outcome of executing one task."""
+    task_id: str
+    agent: str
+    status: str
+    output: str = ""
+    error: str = ""
+    attempts: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class ExecutorSettings:
+    """Concurrency, timeout and retry settings for AsyncTaskExecutor."""
+    max_concurrency: int = 16
+    per_agent_limit: int = 2
+    agent_limits: Dict[str, int] = field(default_factory=dict)
+    timeout: float = 300.0
+    retries: int = 2
+    backoff: float = 1.0
+    backoff_factor: float = 2.0
+    max_backoff: float = 30.0
+    response_tokens: int = 1024
+
+
+class AsyncTaskExecutor:
+    """Runs workflow tasks against a ModelBackend on an asyncio event loop.
+
+    Each task is assigned through ``WorkflowEngine.assign_task`` (so blocked
+    tasks are refused), its prompt is sent to the backend, and on success the
+    task moves to ``draft_ready`` for human review, or through review to
+    ``completed`` with ``auto_complete``. Failed tasks stay ``in_progress``.
+    """
+
+    def __init__(self, workflow_engine: Any, backend: ModelBackend,
+                 settings: Optional[ExecutorSettings] = None, auto_complete: bool = False):
+        self.workflow_engine = workflow_engine
+        self.backend = backend
+        self.settings = settings or ExecutorSettings()
+        self.auto_complete = auto_complete
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._agent_limits: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _agent_semaphore(self, agent: str) -> asyncio.Semaphore:
+        semaphore = self._agent_limits.get(agent)
+        if semaphore is None:
+            limit = self.settings.agent_limits.get(agent, self.settings.per_agent_limit)
+            semaphore = self._agent_limits[agent] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def _prompt_budget(self) -> Optional[int]:
+        if not self.backend.context_tokens:
+            return None
+        return max(self.backend.context_tokens - self.settings.response_tokens, 0)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = self.settings.backoff * self.settings.backoff_factor ** (attempt - 1)
+        return min(delay, self.settings.max_backoff)
+
+    async def _execute(self, task_id: str) -> TaskResult:
+        task = self.workflow_engine.active_tasks.get(task_id)
+        if not task:
+            raise ValueError(f"Task not found: {task_id}")
+        if self._global_limit is None:
+            self._global_limit = asyncio.Semaphore(self.settings.max_concurrency)
+
+        result = TaskResult(task_id=task_id, agent=task.agent, status=FAILED)
+        started = time.perf_counter()
+        # Wait for the agent before taking a global slot, so tasks queued
+        # behind a busy agent do not hold slots other agents could use
+        async with self._agent_semaphore(task.agent), self._global_limit:
+            try:
+                prompt = self.workflow_engine.assign_task(task_id, token_budget=self._prompt_budget())
+            except ValueError as e:
+                result.error = str(e)
+                return result
+
+            while result.attempts <= self.settings.retries:
+                result.attempts += 1
+                try:
+                    result.output = await asyncio.wait_for(
+                        self.backend.complete(prompt, task.agent, task_id), self.settings.timeout
+                    )
+                    result.status = SUCCEEDED
+                    result.error = ""
+                    break
+                except asyncio.TimeoutError:
+                    result.status = TIMED_OUT
+                    result.error = f"Timed out after {self.settings.timeout}s"
+                except Exception as e:
+                    result.status = FAILED
+                    result.error = str(e)
+
+                if result.attempts <= self.settings.retries:
+                    delay = self._backoff_delay(result.attempts)
+                    logger.warning(f"Task {task_id} attempt {result.attempts} failed ({result.error}), "
+                                   f"retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+        result.elapsed = time.perf_counter() - started
+        if result.status == SUCCEEDED:
+            if self.auto_complete:
+                self.workflow_engine.advance_task(task_id, "completed", actor="executor")
+            else:
+                self.workflow_engine.set_task_status(task_id, "draft_ready", actor=task.agent)
+            logger.info(f"Task {task_id} executed by {task.agent} in {result.elapsed:.2f}s")
+        else:
+            logger.error(f"Task {task_id} failed after {result.attempts} attempts: {result.error}")
+        return result
+
+    async def run_tasks(self, task_ids: Iterable[str]) -> List[TaskResult]:
+        """Execute tasks concurrently and return their results in the given order."""
+        task_ids = list(dict.fromkeys(task_ids))
+        for task_id in task_ids:
+            self._start(task_id)
+        return [await self._result(task_id) for task_id in task_ids]
+
+    async def run_workflow(self, project_id: str) -> List[TaskResult]:
+        """Execute a project's tasks as soon as their dependencies complete.
+
+        Without ``auto_complete`` only the currently ready tasks run, since
+        their dependents are released when a human approves the drafts.
+        """
+        results: List[TaskResult] = []
+        running: Dict[asyncio.Task, str] = {}
+        dispatched = set()
+        while True:
+            for task in self.workflow_engine.get_ready_tasks(project_id):
+                if task.id not in dispatched:
+                    dispatched.add(task.id)
+                    running[self._start(task.id)] = task.id
+            if not running:
+                return results
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                results.append(await self._result(running.pop(finished)))
+
+    def _start(self, task_id: str) -> asyncio.Task:
+        future = self._inflight.get(task_id)
+        if future is None:
+            future = self._inflight[task_id] = asyncio.ensure_future(self._execute(task_id))
+        return future
+
+    async def _result(self, task_id: str) -> TaskResult:
+        future = self._inflight[task_id]
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            task = self.workflow_engine.active_tasks[task_id]
+            return TaskResult(task_id=task_id, agent=task.agent, status=CANCELLED, error="Cancelled")
+        except Exception as e:
+            task = self.workflow_engine.active_tasks.get(task_id)
+            return TaskResult(task_id=task_id, agent=task.agent if task else "", status=FAILED, error=str(e))
+        finally:
+            if future.done():
+                self._inflight.pop(task_id, None)
+
+    def cancel(self, task_id: Optional[str] = None) -> int:
+        """Cancel one in-flight task, or all of them; return how many were cancelled."""
+        futures = [self._inflight[task_id]] if task_id in self._inflight else (
+            [] if task_id is not None else list(self._inflight.values())
+        )
+        return sum(1 for future in futures if future.cancel())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Workflow Task Index
+
+Secondary indexes over WorkflowEngine tasks: project -> tasks, status -> tasks,
+agent -> tasks and task -> project, plus per-project status counters. The
+engine updates the index on every task mutation so lookups never scan the
+full task table. Tasks left unloaded in the state store (completed ones) are
+only counted, via ``count_unloaded``.
+"""
+
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class _Entry(NamedTuple):
+    project_id: str
+    status: str
+    agent: str
+
+
+class TaskIndex:
+    """Incrementally maintained indexes over tasks.
+
+    Tasks are indexed by their ``id``, ``project_id``, ``status`` and
+    ``agent`` attributes. Lookups return task ids in the order tasks were
+    first indexed.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._project_tasks: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._status_tasks: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._agent_tasks: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._status_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._unloaded_counts: Dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, task: Any) -> None:
+        """Index a task, replacing its previous entry if it was already indexed."""
+        entry = _Entry(task.project_id, task.status, task.agent)
+        old = self._entries.get(task.id)
+        if old == entry:
+            return
+        if old is not None:
+            self._unindex(task.id, old)
+
+        self._entries[task.id] = entry
+        self._project_tasks[entry.project_id][task.id] = None
+        self._status_tasks[entry.status][task.id] = None
+        self._agent_tasks[entry.agent][task.id] = None
+        self._status_counts[entry.project_id][entry.status] += 1
+
+    def set_status(self, task_id: str, status: str) -> None:
+        """Move an indexed task to a new status."""
+        old = self._entries[task_id]
+        if old.status == status:
+            return
+
+        self._status_tasks[old.status].pop(task_id)
+        if not self._status_tasks[old.status]:
+            del self._status_tasks[old.status]
+        self._status_tasks[status][task_id] = None
+
+        counts = self._status_counts[old.project_id]
+        counts[old.status] -= 1
+        if not counts[old.status]:
+            del counts[old.status]
+        counts[status] += 1
+
+        self._entries[task_id] = old._replace(status=status)
+
+    def remove(self, task_id: str) -> None:
+        """Remove a task from the index."""
+        old = self._entries.pop(task_id, None)
+        if old is not None:
+            self._unindex(task_id, old)
+
+    def _unindex(self, task_id: str, entry: _Entry) -> None:
+        for postings, key in (
+            (self._project_tasks, entry.project_id),
+            (self._status_tasks, entry.status),
+            (self._agent_tasks, entry.agent),
+        ):
+            postings[key].pop(task_id, None)
+            if not postings[key]:
+                del postings[key]
+
+        counts = self._status_counts[entry.project_id]
+        counts[entry.status] -= 1
+        if not counts[entry.status]:
+            del counts[entry.status]
+        if not counts:
+            del self._status_counts[entry.project_id]
+
+    def project_of(self, task_id: str) -> Optional[str]:
+        """Return the project id of a task."""
+        entry = self._entries.get(task_id)
+        return entry.project_id if entry else None
+
+    def tasks_for_project(self, project_id: str) -> List[str]:
+        """Return the ids of a project's tasks."""
+        return list(self._project_tasks.get(project_id, ()))
+
+    def tasks_with_status(self, status: str) -> List[str]:
+        """Return the ids of tasks in ``status`` across all projects."""
+        return list(self._status_tasks.get(status, ()))
+
+    def tasks_for_agent(self, agent: str) -> List[str]:
+        """Return the ids of tasks assigned to ``agent``."""
+        return list(self._agent_tasks.get(agent, ()))
+
+    def count_unloaded(self, project_id: str, counts: Dict[str, int]) -> None:
+        """Add tasks that are not indexed (left in the state store) to a project's status counts."""
+        self._unloaded_counts[project_id].update(counts)
+
+    def has_unloaded(self, project_id: str) -> bool:
+        """Whether some of a project's tasks are only counted, not indexed."""
+        return project_id in self._unloaded_counts
+
+    def status_counts(self, project_id: str) -> Dict[str, int]:
+        """Return the number of tasks in each status for a project, including unloaded ones."""
+        counts = self._status_counts.get(project_id, Counter())
+        unloaded = self._unloaded_counts.get(project_id)
+        return dict(counts + unloaded if unloaded else counts)
+
+    def task_count(self, project_id: str) -> int:
+        """Return the number of tasks in a project, including unloaded ones."""
+        unloaded = self._unloaded_counts.get(project_id)
+        return len(self._project_tasks.get(project_id, ())) + (sum(unloaded.values()) if unloaded else 0)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
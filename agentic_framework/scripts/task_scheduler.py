@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Workflow Task Scheduler
+
+Dependency graph of workflow tasks. Each task keeps a count of unfinished
+dependencies; completing a task decrements its dependents' counts and
+releases those that reach zero, so the ready set is maintained incrementally
+and independent tasks can run concurrently.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PENDING = "pending"
+READY = "ready"
+RUNNING = "running"
+DONE = "done"
+
+
+class TaskScheduler:
+    """DAG of task ids scheduled by in-degree (Kahn's algorithm).
+
+    Tasks are added after their dependencies; a dependency that is not in
+    the graph is treated as already satisfied. Ready tasks are returned in
+    the order they became ready, ties broken by the order tasks were added.
+    Each task may belong to a ``group`` (e.g. its project) whose ready tasks
+    are tracked separately.
+    """
+
+    def __init__(self):
+        self._dependencies: Dict[str, List[str]] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._in_degree: Dict[str, int] = {}
+        self._state: Dict[str, str] = {}
+        self._ready: Dict[str, None] = {}
+        self._group: Dict[str, str] = {}
+        self._ready_by_group: Dict[str, Dict[str, None]] = {}
+
+    def _set_ready(self, task_id: str) -> None:
+        self._state[task_id] = READY
+        self._ready[task_id] = None
+        self._ready_by_group.setdefault(self._group[task_id], {})[task_id] = None
+
+    def _unset_ready(self, task_id: str) -> None:
+        if task_id in self._ready:
+            del self._ready[task_id]
+            group = self._group[task_id]
+            del self._ready_by_group[group][task_id]
+            if not self._ready_by_group[group]:
+                del self._ready_by_group[group]
+
+    def add_task(self, task_id: str, dependencies: Iterable[str] = (), done: bool = False,
+                 group: str = "") -> None:
+        """Add a task that waits for ``dependencies``; ``done`` adds it as completed."""
+        if task_id in self._state:
+            raise ValueError(f"Task already scheduled: {task_id}")
+
+        known = [dep for dep in dict.fromkeys(dependencies) if dep in self._state]
+        self._dependencies[task_id] = known
+        self._dependents[task_id] = []
+        self._group[task_id] = group
+        for dep in known:
+            self._dependents[dep].append(task_id)
+
+        if done:
+            self._in_degree[task_id] = 0
+            self._state[task_id] = DONE
+            return
+
+        self._in_degree[task_id] = sum(1 for dep in known if self._state[dep] != DONE)
+        if self._in_degree[task_id] == 0:
+            self._set_ready(task_id)
+        else:
+            self._state[task_id] = PENDING
+
+    def start(self, task_id: str) -> None:
+        """Mark a ready task as running."""
+        state = self._state[task_id]
+        if state == RUNNING:
+            return
+        if state != READY:
+            raise ValueError(f"Task {task_id} is {state}, not ready: waiting on {self.blocking(task_id)}")
+        self._unset_ready(task_id)
+        self._state[task_id] = RUNNING
+
+    def complete(self, task_id: str) -> List[str]:
+        """Mark a task as done and return the dependents it released."""
+        state = self._state[task_id]
+        if state == DONE:
+            return []
+        if state == PENDING:
+            raise ValueError(f"Task {task_id} cannot complete before {self.blocking(task_id)}")
+        self._unset_ready(task_id)
+        self._state[task_id] = DONE
+
+        released = []
+        for dependent in self._dependents[task_id]:
+            self._in_degree[dependent] -= 1
+            if self._in_degree[dependent] == 0 and self._state[dependent] == PENDING:
+                self._set_ready(dependent)
+                released.append(dependent)
+        return released
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task, releasing dependents that were only waiting on it."""
+        if task_id not in self._state:
+            return
+        if self._state[task_id] != DONE:
+            for dependent in self._dependents[task_id]:
+                self._in_degree[dependent] -= 1
+                if self._in_degree[dependent] == 0 and self._state[dependent] == PENDING:
+                    self._set_ready(dependent)
+        self._unset_ready(task_id)
+        for dependent in self._dependents.pop(task_id):
+            self._dependencies[dependent].remove(task_id)
+        for dep in self._dependencies.pop(task_id):
+            self._dependents[dep].remove(task_id)
+        del self._in_degree[task_id]
+        del self._state[task_id]
+        del self._group[task_id]
+
+    def ready(self, group: Optional[str] = None) -> List[str]:
+        """Return tasks (of ``group``, if given) whose dependencies are all done and that have not started."""
+        if group is not None:
+            return list(self._ready_by_group.get(group, ()))
+        return list(self._ready)
+
+    def ready_count(self, group: str) -> int:
+        """Return the number of ready tasks in a group."""
+        return len(self._ready_by_group.get(group, ()))
+
+    def is_ready(self, task_id: str) -> bool:
+        return self._state.get(task_id) in (READY, RUNNING)
+
+    def state(self, task_id: str) -> Optional[str]:
+        return self._state.get(task_id)
+
+    def blocking(self, task_id: str) -> List[str]:
+        """Return the unfinished dependencies of a task."""
+        return [dep for dep in self._dependencies[task_id] if self._state[dep] != DONE]
+
+    def dependencies(self, task_id: str) -> List[str]:
+        return list(self._dependencies[task_id])
+
+    def topological_order(self, task_ids: Optional[Iterable[str]] = None) -> List[str]:
+        """Return tasks (all, or the given subset) with every task after its dependencies."""
+        subset = set(self._state) if task_ids is None else set(task_ids)
+        in_degree = {
+            task_id: sum(1 for dep in self._dependencies[task_id] if dep in subset)
+            for task_id in self._state if task_id in subset
+        }
+        queue = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for dependent in self._dependents[task_id]:
+                if dependent in in_degree:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        queue.append(dependent)
+        if len(order) != len(in_degree):
+            raise ValueError("Task dependencies contain a cycle")
+        return order
+
+    def critical_path(self, durations: Dict[str, float],
+                      task_ids: Optional[Iterable[str]] = None) -> Tuple[float, List[str]]:
+        """Return the longest dependency chain by duration and its length.
+
+        This is the shortest possible end-to-end time when every ready task
+        runs as soon as it is released. Missing durations count as 1.
+        """
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        order = self.topological_order(task_ids)
+        members = set(order)
+        for task_id in order:
+            start, before = 0.0, None
+            for dep in self._dependencies[task_id]:
+                if dep in members and finish[dep] > start:
+                    start, before = finish[dep], dep
+            finish[task_id] = start + durations.get(task_id, 1.0)
+            previous[task_id] = before
+
+        if not finish:
+            return 0.0, []
+        last = max(order, key=finish.__getitem__)
+        path = []
+        node: Optional[str] = last
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return finish[last], path[::-1]
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._state
+
+    def __len__(self) -> int:
+        return len(self._state)
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Task State Machine
+
+Task lifecycle from workflow-state-management.md:
+
+    ASSIGNED → IN_PROGRESS → DRAFT_READY → UNDER_REVIEW → APPROVED → COMPLETED
+    UNDER_REVIEW → REVISION_REQUESTED → IN_PROGRESS
+
+The transitions are compiled into a lookup table so validating a status
+change is a single dict lookup, and hooks registered for a transition are
+attached to its table entry. Every transition is appended to a task event
+journal (JSON lines) that TaskStatusView folds incrementally.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import logging
+
+sys.path.append(str(Path(__file__).parent))
+
+from atomic_io import FileLock, atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Task states
+ASSIGNED = "assigned"
+IN_PROGRESS = "in_progress"
+DRAFT_READY = "draft_ready"
+UNDER_REVIEW = "under_review"
+APPROVED = "approved"
+COMPLETED = "completed"
+REVISION_REQUESTED = "revision_requested"
+
+TASK_STATES = (ASSIGNED, IN_PROGRESS, DRAFT_READY, UNDER_REVIEW, APPROVED, COMPLETED, REVISION_REQUESTED)
+
+# Name of the pseudo-transition journaled when a task is created
+CREATE = "create"
+
+# (name, source, target)
+TASK_TRANSITIONS = (
+    ("start", ASSIGNED, IN_PROGRESS),
+    ("submit", IN_PROGRESS, DRAFT_READY),
+    ("begin_review", DRAFT_READY, UNDER_REVIEW),
+    ("approve", UNDER_REVIEW, APPROVED),
+    ("request_revision", UNDER_REVIEW, REVISION_REQUESTED),
+    ("resume", REVISION_REQUESTED, IN_PROGRESS),
+    ("complete", APPROVED, COMPLETED),
+)
+
+
+class InvalidTransitionError(ValueError):
+    """Raised when a task status change is not allowed by the state machine."""
+
+
+class Transition(NamedTuple):
+    name: str
+    source: str
+    target: str
+
+
+Hook = Callable[[Any, Transition], None]
+
+
+class TaskStateMachine:
+    """Compiled transition table with before/after hooks per transition.
+
+    Before-hooks run before anything changes and may raise to veto the
+    transition; after-hooks run once the new status has been recorded.
+    """
+
+    def __init__(self, transitions: Iterable[Tuple[str, str, str]] = TASK_TRANSITIONS,
+                 initial: str = ASSIGNED):
+        self.initial = initial
+        self._table: Dict[Tuple[str, str], Transition] = {}
+        self._targets: Dict[str, List[str]] = defaultdict(list)
+        for name, source, target in transitions:
+            if (source, target) in self._table:
+                raise ValueError(f"Duplicate transition {source} -> {target}")
+            self._table[(source, target)] = Transition(name, source, target)
+            self._targets[source].append(target)
+        self.states = frozenset([initial] + [s for key in self._table for s in key])
+        self._paths = {source: self._shortest_paths(source) for source in self.states}
+        self._before: Dict[Transition, List[Hook]] = defaultdict(list)
+        self._after: Dict[Transition, List[Hook]] = defaultdict(list)
+
+    def _shortest_paths(self, source: str) -> Dict[str, Tuple[Transition, ...]]:
+        paths: Dict[str, Tuple[Transition, ...]] = {source: ()}
+        queue = deque([source])
+        while queue:
+            state = queue.popleft()
+            for target in self._targets.get(state, ()):
+                if target not in paths:
+                    paths[target] = paths[state] + (self._table[(state, target)],)
+                    queue.append(target)
+        return paths
+
+    def transition(self, source: str, target: str, subject: str = "task") -> Transition:
+        """Return the transition from ``source`` to ``target``; raises InvalidTransitionError."""
+        transition = self._table.get((source, target))
+        if transition is None:
+            allowed = ", ".join(self._targets.get(source, ())) or "none"
+            raise InvalidTransitionError(
+                f"Cannot move {subject} from '{source}' to '{target}' (allowed: {allowed})"
+            )
+        return transition
+
+    def path(self, source: str, target: str, subject: str = "task") -> Tuple[Transition, ...]:
+        """Return the shortest sequence of transitions from ``source`` to ``target``."""
+        path = self._paths.get(source, {}).get(target)
+        if path is None:
+            raise InvalidTransitionError(f"Cannot move {subject} from '{source}' to '{target}'")
+        return path
+
+    def allowed_targets(self, source: str) -> List[str]:
+        return list(self._targets.get(source, ()))
+
+    def add_hook(self, hook: Hook, source: Optional[str] = None, target: Optional[str] = None,
+                 before: bool = False) -> None:
+        """Call ``hook(task, transition)`` on matching transitions (None matches any state)."""
+        hooks = self._before if before else self._after
+        matched = [
+            transition for (s, t), transition in self._table.items()
+            if (source is None or s == source) and (target is None or t == target)
+        ]
+        if not matched:
+            raise ValueError(f"No transition matches {source or '*'} -> {target or '*'}")
+        for transition in matched:
+            hooks[transition].append(hook)
+
+    def run_hooks(self, transition: Transition, task: Any, before: bool = False) -> None:
+        """Run the hooks for a transition; errors in after-hooks are logged, not raised."""
+        for hook in (self._before if before else self._after).get(transition, ()):
+            if before:
+                hook(task, transition)
+                continue
+            try:
+                hook(task, transition)
+            except Exception as e:
+                logger.error(f"Hook for {transition.name} on {getattr(task, 'id', task)} failed: {e}")
+
+
+def make_event(task: Any, transition: Optional[Transition], actor: str = "") -> Dict[str, Any]:
+    """Build a journal event for a task's transition (``None`` for task creation)."""
+    return {
+        "task_id": task.id,
+        "project_id": task.project_id,
+        "transition": transition.name if transition else CREATE,
+        "from": transition.source if transition else None,
+        "to": transition.target if transition else task.status,
+        "actor": actor,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+class TaskEventJournal:
+    """Append-only journal of task transitions, optionally backed by a JSON-lines file.
+
+    Events are numbered from 1 in append order. Appends from several
+    processes are serialized with a lock file, and events written by other
+    processes are picked up before each append or read. ``compact`` folds the
+    events up to a sequence number into a checkpoint (``<path>.checkpoint``)
+    and drops them from the journal, so startup only reads the checkpoint and
+    the events after it.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.checkpoint_path = path.with_name(path.name + ".checkpoint") if path is not None else None
+        self._lock = FileLock(path.with_name(path.name + ".lock")) if path is not None else None
+        self._thread_lock = threading.RLock()
+        # Sequence number of the last event folded into the checkpoint
+        self.base = 0
+        self.checkpoint: Optional[Dict[str, Any]] = None
+        self._events: List[Dict[str, Any]] = []
+        self._offset = 0
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._load_checkpoint()
+        self._catch_up()
+
+    def _load_checkpoint(self) -> None:
+        if self.checkpoint_path is None:
+            return
+        try:
+            data = json.loads(self.checkpoint_path.read_text(encoding='utf-8'))
+            seq, state = data["seq"], data["state"]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable task event checkpoint {self.checkpoint_path}: {e}")
+            return
+        if seq > self.base:
+            self.base, self.checkpoint = seq, state
+            self._events = [event for event in self._events if event["seq"] > self.base]
+
+    def _catch_up(self) -> None:
+        if self.path is None:
+            return
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if self._file_id is not None and (file_id != self._file_id or stat.st_size < self._offset):
+            # Another process compacted the journal: reread the checkpoint and the new file
+            self._load_checkpoint()
+            self._offset = 0
+        self._file_id = file_id
+        if stat.st_size <= self._offset:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Only consume complete lines; a partial one may still be being written
+        complete = data.rfind(b"\n") + 1
+        self._offset += complete
+        for line in data[:complete].splitlines():
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring unreadable task event in {self.path}")
+                continue
+            if event.get("seq") == self.last_seq + 1:
+                self._events.append(event)
+
+    def catch_up(self) -> None:
+        """Pick up events appended by other processes."""
+        with self._thread_lock:
+            self._catch_up()
+
+    def append(self, events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Number and store events; returns them with their ``seq``."""
+        events = list(events)
+        if not events:
+            return []
+        with self._thread_lock:
+            if self._lock is None:
+                return self._store(events)
+            with self._lock:
+                self._catch_up()
+                self._discard_torn_tail()
+                stored = self._store(events)
+                data = "".join(json.dumps(event) + "\n" for event in stored).encode('utf-8')
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'ab') as f:
+                    f.write(data)
+                self._offset += len(data)
+                if self._file_id is None:
+                    stat = os.stat(self.path)
+                    self._file_id = (stat.st_dev, stat.st_ino)
+                return stored
+
+    def _discard_torn_tail(self) -> None:
+        # A crash mid-append leaves a partial last line; cut it before appending
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size > self._offset:
+            logger.warning(f"Discarding incomplete task event in {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(self._offset)
+
+    def _store(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        stored = []
+        for event in events:
+            event = dict(event, seq=self.last_seq + 1)
+            self._events.append(event)
+            stored.append(event)
+        return stored
+
+    def since(self, seq: int = 0, catch_up: bool = True) -> List[Dict[str, Any]]:
+        """Return the events after ``seq``, oldest first.
+
+        Raises ValueError if events after ``seq`` were already folded into
+        the checkpoint (``seq < base``).
+        """
+        with self._thread_lock:
+            if catch_up:
+                self._catch_up()
+            if seq < self.base:
+                raise ValueError(f"Task events up to {self.base} were compacted into {self.checkpoint_path}")
+            return self._events[seq - self.base:]
+
+    def compact(self, state: Dict[str, Any], seq: int) -> None:
+        """Replace the events up to ``seq`` with ``state``, the result of folding them."""
+        with self._thread_lock:
+            if self._lock is None:
+                self._compact(state, seq)
+                return
+            with self._lock:
+                self._catch_up()
+                self._compact(state, seq)
+
+    def _compact(self, state: Dict[str, Any], seq: int) -> None:
+        if seq <= self.base:
+            return
+        if seq > self.last_seq:
+            raise ValueError(f"Cannot compact task events up to {seq}, last is {self.last_seq}")
+        remaining = self._events[seq - self.base:]
+        if self.path is not None:
+            # Checkpoint first: events it already covers are skipped if the rewrite is lost
+            atomic_write(self.checkpoint_path, json.dumps({"seq": seq, "state": state}).encode('utf-8'))
+            data = "".join(json.dumps(event) + "\n" for event in remaining).encode('utf-8')
+            atomic_write(self.path, data)
+            stat = os.stat(self.path)
+            self._file_id, self._offset = (stat.st_dev, stat.st_ino), len(data)
+        self.base, self.checkpoint, self._events = seq, state, remaining
+
+    @property
+    def last_seq(self) -> int:
+        return self.base + len(self._events)
+
+    def __len__(self) -> int:
+        """Number of events not yet compacted."""
+        return len(self._events)
+
+
+class TaskStatusView:
+    """Per-project task counts and transition statistics folded from the event journal.
+
+    ``refresh`` only processes events appended since the previous refresh;
+    the accessors fold just the events this process appended, and
+    ``refresh()`` also picks up other processes' events. The folded state
+    starts from the journal's checkpoint, and ``compact`` writes a new one.
+    """
+
+    def __init__(self, journal: TaskEventJournal):
+        self.journal = journal
+        self._restore()
+
+    def _restore(self) -> None:
+        state = self.journal.checkpoint or {}
+        self.seq = self.journal.base
+        self._status: Dict[str, str] = dict(state.get("status", {}))
+        self._counts: Dict[str, Counter] = defaultdict(Counter, {
+            project_id: Counter(counts) for project_id, counts in state.get("counts", {}).items()
+        })
+        self._transitions: Dict[str, Counter] = defaultdict(Counter, {
+            project_id: Counter(counts) for project_id, counts in state.get("transitions", {}).items()
+        })
+        self._last_activity: Dict[str, str] = dict(state.get("last_activity", {}))
+        self._review_since: Dict[str, str] = dict(state.get("review_since", {}))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the folded state as JSON-compatible data."""
+        return {
+            "status": self._status,
+            "counts": {project_id: dict(counts) for project_id, counts in self._counts.items()},
+            "transitions": {project_id: dict(counts) for project_id, counts in self._transitions.items()},
+            "last_activity": self._last_activity,
+            "review_since": self._review_since,
+        }
+
+    def refresh(self, catch_up: bool = True) -> int:
+        """Apply new journal events; return how many were applied."""
+        if catch_up:
+            self.journal.catch_up()
+        if self.seq < self.journal.base:
+            # Events this view has not seen were compacted by another process
+            self._restore()
+        events = self.journal.since(self.seq, catch_up=False)
+        for event in events:
+            project_id, task_id, status = event["project_id"], event["task_id"], event["to"]
+            previous = self._status.get(task_id)
+            if previous is not None:
+                self._counts[project_id][previous] -= 1
+            self._status[task_id] = status
+            self._counts[project_id][status] += 1
+            self._transitions[project_id][event["transition"]] += 1
+            self._last_activity[project_id] = event["timestamp"]
+            if status == DRAFT_READY:
+                self._review_since[task_id] = event["timestamp"]
+            elif status != UNDER_REVIEW:
+                self._review_since.pop(task_id, None)
+            self.seq = event["seq"]
+        return len(events)
+
+    def compact(self) -> None:
+        """Checkpoint the folded state and drop the events it covers from the journal."""
+        self.refresh()
+        self.journal.compact(self.to_dict(), self.seq)
+
+    def status_counts(self, project_id: str) -> Dict[str, int]:
+        self.refresh(catch_up=False)
+        return {status: count for status, count in self._counts[project_id].items() if count}
+
+    def transition_counts(self, project_id: str) -> Dict[str, int]:
+        self.refresh(catch_up=False)
+        return dict(self._transitions[project_id])
+
+    def last_activity(self, project_id: str) -> Optional[str]:
+        self.refresh(catch_up=False)
+        return self._last_activity.get(project_id)
+
+    def review_since(self) -> Dict[str, str]:
+        """Return when each task awaiting review (draft_ready or under_review) last became draft_ready."""
+        self.refresh(catch_up=False)
+        return dict(self._review_since)
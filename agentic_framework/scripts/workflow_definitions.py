@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Workflow Definitions
+
+Loads workflow definitions (phases and the agent tasks in each) from YAML or
+JSON files in templates/workflows/, validates them and compiles them into
+immutable workflow graphs shared by every project. Validated definitions are
+cached under .agentic-state/ so unchanged files are not re-validated.
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+import yaml
+
+sys.path.append(str(Path(__file__).parent))
+
+from file_cache import FileCache, DEFAULT_STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when validation or the compiled layout changes to invalidate caches
+SCHEMA_VERSION = "1"
+
+# templates/workflows next to the scripts directory, both inside the package
+# and in projects where the scripts are copied to agentic-scripts/
+DEFAULT_WORKFLOWS_DIR = Path(__file__).resolve().parent.parent / "templates" / "workflows"
+
+WORKFLOW_FILE_SUFFIXES = (".yaml", ".yml", ".json")
+
+
+class WorkflowDefinitionError(ValueError):
+    """Raised when a workflow definition file is invalid."""
+
+
+@dataclass(frozen=True)
+class WorkflowTask:
+    """A task template: the agent that performs it and its title."""
+    agent: str
+    title: str
+
+
+@dataclass(frozen=True)
+class WorkflowPhase:
+    """A named phase whose tasks can run concurrently."""
+    name: str
+    tasks: Tuple[WorkflowTask, ...]
+
+
+@dataclass(frozen=True)
+class Workflow:
+    """A compiled workflow: an ordered sequence of phases."""
+    name: str
+    description: str
+    phases: Tuple[WorkflowPhase, ...]
+
+    @property
+    def agents(self) -> Tuple[str, ...]:
+        """Agents used by the workflow, in order of first use."""
+        return tuple(dict.fromkeys(task.agent for phase in self.phases for task in phase.tasks))
+
+
+def validate_definition(data: Any, source: str) -> Dict[str, Any]:
+    """Check a parsed definition and return it in normalized plain-data form."""
+    if not isinstance(data, dict):
+        raise WorkflowDefinitionError(f"{source}: workflow definition must be a mapping")
+
+    name = data.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise WorkflowDefinitionError(f"{source}: 'name' is required")
+    description = data.get("description", "")
+    if not isinstance(description, str):
+        raise WorkflowDefinitionError(f"{source}: 'description' must be a string")
+
+    phases = data.get("phases")
+    if not isinstance(phases, list) or not phases:
+        raise WorkflowDefinitionError(f"{source}: 'phases' must be a non-empty list")
+
+    normalized_phases = []
+    seen_phases = set()
+    for index, phase in enumerate(phases, 1):
+        if not isinstance(phase, dict):
+            raise WorkflowDefinitionError(f"{source}: phase {index} must be a mapping")
+        phase_name = phase.get("name")
+        if not isinstance(phase_name, str) or not phase_name.strip():
+            raise WorkflowDefinitionError(f"{source}: phase {index} needs a 'name'")
+        if phase_name in seen_phases:
+            raise WorkflowDefinitionError(f"{source}: duplicate phase '{phase_name}'")
+        seen_phases.add(phase_name)
+
+        tasks = phase.get("tasks")
+        if not isinstance(tasks, list) or not tasks:
+            raise WorkflowDefinitionError(f"{source}: phase '{phase_name}' needs a non-empty 'tasks' list")
+        normalized_tasks = []
+        for task_index, task in enumerate(tasks, 1):
+            if not isinstance(task, dict):
+                raise WorkflowDefinitionError(f"{source}: task {task_index} of phase '{phase_name}' must be a mapping")
+            agent, title = task.get("agent"), task.get("task")
+            if not isinstance(agent, str) or not agent.endswith("-agent"):
+                raise WorkflowDefinitionError(
+                    f"{source}: task {task_index} of phase '{phase_name}' needs an 'agent' ending in '-agent'"
+                )
+            if not isinstance(title, str) or not title.strip():
+                raise WorkflowDefinitionError(f"{source}: task {task_index} of phase '{phase_name}' needs a 'task'")
+            normalized_tasks.append({"agent": agent, "task": title.strip()})
+        normalized_phases.append({"name": phase_name.strip(), "tasks": normalized_tasks})
+
+    return {"name": name.strip(), "description": description.strip(), "phases": normalized_phases}
+
+
+class _Interner:
+    """Shares equal strings and task nodes between compiled workflows."""
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[str, str], WorkflowTask] = {}
+
+    def task(self, agent: str, title: str) -> WorkflowTask:
+        key = (sys.intern(agent), sys.intern(title))
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = WorkflowTask(*key)
+        return task
+
+
+def compile_definition(definition: Dict[str, Any], interner: Optional[_Interner] = None) -> Workflow:
+    """Compile a validated definition into an immutable Workflow."""
+    interner = interner or _Interner()
+    return Workflow(
+        name=sys.intern(definition["name"]),
+        description=definition["description"],
+        phases=tuple(
+            WorkflowPhase(
+                name=sys.intern(phase["name"]),
+                tasks=tuple(interner.task(task["agent"], task["task"]) for task in phase["tasks"]),
+            )
+            for phase in definition["phases"]
+        ),
+    )
+
+
+class WorkflowLibrary:
+    """Compiled workflows loaded from a directory of definition files.
+
+    Each file is parsed and validated once; the validated form is cached by
+    file mtime, size and content hash, so later processes only rebuild the
+    immutable graph. Invalid files are logged and skipped.
+    """
+
+    DEFAULT_CACHE_PATH = DEFAULT_STATE_DIR / "workflow-cache.pkl"
+
+    def __init__(self, workflows_directory: Path = DEFAULT_WORKFLOWS_DIR,
+                 cache_path: Path = DEFAULT_CACHE_PATH, rebuild_cache: bool = False):
+        self.workflows_directory = workflows_directory
+        self.cache = FileCache(cache_path, version=SCHEMA_VERSION)
+        if rebuild_cache:
+            self.cache.clear()
+        self.workflows: Dict[str, Workflow] = {}
+        self._interner = _Interner()
+        self._load_all()
+
+    def _definition_files(self) -> List[Path]:
+        if not self.workflows_directory.exists():
+            logger.error(f"Workflows directory not found: {self.workflows_directory}")
+            return []
+        return sorted(
+            path for path in self.workflows_directory.iterdir()
+            if path.suffix.lower() in WORKFLOW_FILE_SUFFIXES
+        )
+
+    def _load_all(self) -> None:
+        files = self._definition_files()
+        for path in files:
+            try:
+                workflow = compile_definition(self._read_definition(path), self._interner)
+            except (WorkflowDefinitionError, OSError, ValueError, yaml.YAMLError) as e:
+                logger.error(f"Failed to load workflow from {path}: {e}")
+                continue
+            if workflow.name in self.workflows:
+                logger.error(f"Duplicate workflow '{workflow.name}' in {path}, ignoring it")
+                continue
+            self.workflows[workflow.name] = workflow
+        self.cache.prune(files)
+        self.cache.save()
+
+    def _read_definition(self, path: Path) -> Dict[str, Any]:
+        definition = self.cache.get(path)
+        if definition is not None:
+            return definition
+
+        data = path.read_bytes()
+        definition = self.cache.get(path, data)
+        if definition is not None:
+            return definition
+
+        text = data.decode('utf-8')
+        parsed = json.loads(text) if path.suffix.lower() == ".json" else yaml.safe_load(text)
+        definition = validate_definition(parsed, str(path))
+        self.cache.put(path, data, definition)
+        return definition
+
+    def get(self, name: str) -> Workflow:
+        """Return a workflow by name."""
+        workflow = self.workflows.get(name)
+        if workflow is None:
+            raise ValueError(f"Unknown workflow: {name}")
+        return workflow
+
+    def names(self) -> List[str]:
+        """Return the names of all loaded workflows."""
+        return list(self.workflows)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.workflows
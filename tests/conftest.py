@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The scripts import their siblings by module name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "agentic_framework" / "scripts"))
+
+AGENTS_DIR = Path(__file__).resolve().parent.parent / "agentic_framework" / "sub_agents"
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """Build WorkflowEngines on a state file in a temporary directory.
+
+    Caches default to ``./.agentic-state``, so the test runs in ``tmp_path``.
+    """
+    from agent_integration import AgentRegistry, WorkflowEngine
+
+    monkeypatch.chdir(tmp_path)
+    registry = AgentRegistry(AGENTS_DIR, metadata_only=True)
+
+    def make(state_file: str = "workflow_state.json", **kwargs):
+        kwargs.setdefault("flush_interval", 0)
+        return WorkflowEngine(registry, state_file=tmp_path / state_file, **kwargs)
+
+    return make
+
+
+BRIEF = """\
+# Project Brief
+
+### Project Name
+
+Payments Gateway
+
+### Project Type
+
+- [x] REST API Service
+- [ ] CLI Tool
+"""
+
+
+@pytest.fixture
+def brief_path(tmp_path):
+    """A minimal project brief for an API project."""
+    path = tmp_path / "brief.md"
+    path.write_text(BRIEF, encoding="utf-8")
+    return path
+
+
+def finish(engine, task_id):
+    """Take a ready task through review to completion."""
+    from task_state_machine import APPROVED, COMPLETED, DRAFT_READY, UNDER_REVIEW
+
+    engine.assign_task(task_id)
+    for status in (DRAFT_READY, UNDER_REVIEW, APPROVED, COMPLETED):
+        engine.set_task_status(task_id, status)
+
+
+@pytest.fixture
+def finish_task():
+    return finish
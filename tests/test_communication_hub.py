@@ -0,0 +1,37 @@
+import json
+
+from agent_integration import CommunicationHub
+
+
+def send(hub, count):
+    for i in range(count):
+        hub.send_message("agent-a" if i % 2 else "agent-b", "agent-c", f"m{i}")
+
+
+def test_journal_store_keeps_the_message_window(make_engine, tmp_path):
+    engine = make_engine()
+    hub = CommunicationHub(engine, max_messages=10)
+    send(hub, 200)
+    engine.store.compact()
+
+    snapshot = (tmp_path / "workflow_state.json").read_text(encoding="utf-8")
+    assert len(json.loads(snapshot)["messages"]) == 10
+    assert "\n" not in snapshot.strip()
+    assert [m["message"] for m in engine.store.query_messages(limit=2)] == ["m199", "m198"]
+
+    reloaded = CommunicationHub(make_engine(), max_messages=10)
+    assert [m["message"] for m in reloaded.get_conversation_history("agent-c", limit=3)] == ["m199", "m198", "m197"]
+
+
+def test_history_beyond_the_window_comes_from_the_spill_file(make_engine, tmp_path):
+    hub = CommunicationHub(make_engine(), max_messages=4, spill_path=tmp_path / "spill.jsonl")
+    send(hub, 10)
+    history = hub.get_conversation_history("agent-a", limit=4)
+    assert [m["message"] for m in history] == ["m9", "m7", "m5", "m3"]
+
+
+def test_sqlite_store_serves_full_history(make_engine):
+    hub = CommunicationHub(make_engine("workflow_state.db"), max_messages=4)
+    send(hub, 10)
+    history = hub.get_conversation_history("agent-b", limit=5)
+    assert [m["message"] for m in history] == ["m8", "m6", "m4", "m2", "m0"]
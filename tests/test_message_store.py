@@ -0,0 +1,58 @@
+import json
+
+from message_store import MessageStore
+
+
+def message(index, sender="a", recipient="b", timestamp=None):
+    return {
+        "id": f"msg_{index}",
+        "timestamp": timestamp or f"2025-01-01T00:00:{index:02d}",
+        "from": sender,
+        "to": recipient,
+        "message": f"m{index}",
+    }
+
+
+def test_history_is_newest_first_per_agent():
+    store = MessageStore(max_messages=10)
+    store.extend(message(i, sender="a" if i % 2 else "c") for i in range(6))
+    assert [m["id"] for m in store.history("a", limit=2)] == ["msg_5", "msg_3"]
+    assert [m["id"] for m in store.history("b")] == [f"msg_{i}" for i in range(5, -1, -1)]
+    assert [m["id"] for m in store.history(since="2025-01-01T00:00:04")] == ["msg_5", "msg_4"]
+
+
+def test_late_message_is_kept_in_timestamp_order():
+    store = MessageStore(max_messages=10)
+    store.add(message(2))
+    store.add(message(1))
+    assert [m["id"] for m in store.history("a")] == ["msg_2", "msg_1"]
+
+
+def test_eviction_removes_the_evicted_message_by_identity():
+    store = MessageStore(max_messages=2)
+    first = {"timestamp": "2025-01-01T00:00:00", "from": "a", "to": "b", "message": "hi"}
+    duplicate = dict(first)
+    store.add(first)
+    store.add(duplicate)
+    store.add(message(1, sender="x", recipient="y"))
+    (kept,) = store.history("a")
+    assert kept is duplicate
+    assert not store.is_complete("a")
+    assert store.is_complete("x")
+
+
+def test_evicted_messages_spill_to_disk(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    store = MessageStore(max_messages=3, spill_path=spill)
+    store.extend(message(i) for i in range(5))
+    store.close()
+    assert len(store) == 3
+    assert [json.loads(line)["id"] for line in spill.read_text().splitlines()] == ["msg_0", "msg_1"]
+    assert [m["id"] for m in store.spilled("a")] == ["msg_1", "msg_0"]
+
+
+def test_retention_drops_old_messages():
+    store = MessageStore(max_messages=None, retention=60)
+    store.add(message(0, timestamp="2000-01-01T00:00:00"))
+    assert store.history() == []
+    assert store.evicted == 1
@@ -0,0 +1,219 @@
+import json
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from notification_dispatcher import NotificationDispatcher, SMTPTransport, WebhookTransport
+
+
+def notification(recipient, number, urgency="normal"):
+    return {"id": f"n{number}", "recipient": recipient, "subject": f"Subject {number}",
+            "message": f"Message {number}", "urgency": urgency}
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        self.handled = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.received.append(body)
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.handled += 1
+        # Drop the connection without announcing it, like an idle timeout
+        if self.handled == self.server.requests_per_connection:
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of RFC 5321 for smtplib to deliver messages."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        handled = 0
+        self.reply("220 localhost test sink")
+        for line in self.rfile:
+            command = line.decode("ascii").strip().split(" ", 1)[0].upper()
+            if command == "EHLO":
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b"".join(iter(self.rfile.readline, b".\r\n"))
+                self.server.received.append(message_from_bytes(data))
+                self.reply("250 OK")
+                handled += 1
+                if handled == self.server.requests_per_connection:
+                    return
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+def serve(server, requests_per_connection=None, status=200):
+    server.daemon_threads = True
+    server.connections = 0
+    server.received = []
+    server.requests_per_connection = requests_per_connection
+    server.status = status
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def webhook_server():
+    servers = []
+
+    def start(**kwargs):
+        servers.append(serve(ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler), **kwargs))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def smtp_server():
+    servers = []
+
+    def start(**kwargs):
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPHandler)
+        servers.append(serve(server, **kwargs))
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def webhook(server):
+    return WebhookTransport(f"http://127.0.0.1:{server.server_address[1]}/hooks/notify")
+
+
+def smtp(server):
+    return SMTPTransport("127.0.0.1", server.server_address[1], sender="sdlc@example.com", timeout=5)
+
+
+def test_webhook_digests_share_one_connection(webhook_server):
+    server = webhook_server()
+    dispatcher = NotificationDispatcher(webhook(server), retry_delay=0)
+    for i in range(3):
+        dispatcher.submit(notification("po@example.com", i))
+    dispatcher.submit(notification("reviewer@example.com", 3))
+    dispatcher.submit(notification("", 4))
+    assert dispatcher.flush() == 2
+    dispatcher.submit(notification("po@example.com", 5))
+    assert dispatcher.flush() == 1
+    dispatcher.stop()
+
+    assert server.connections == 1
+    assert [(body["recipient"], body["notifications"]) for body in server.received] == [
+        ("po@example.com", ["n0", "n1", "n2"]),
+        ("reviewer@example.com", ["n3"]),
+        ("po@example.com", ["n5"]),
+    ]
+    assert server.received[0]["subject"] == "3 notifications from the Agentic SDLC"
+
+
+def test_webhook_reconnects_after_the_server_drops_the_connection(webhook_server):
+    server = webhook_server(requests_per_connection=1)
+    dispatcher = NotificationDispatcher(webhook(server), retries=0)
+    notifications = [notification(f"user{i}@example.com", i) for i in range(3)]
+    for item in notifications:
+        dispatcher.submit(item)
+        time.sleep(0.05)
+        assert dispatcher.flush() == 1
+    dispatcher.stop()
+
+    assert server.connections == 3
+    assert len(server.received) == 3
+    assert {item["status"] for item in notifications} == {"sent"}
+
+
+def test_webhook_errors_mark_notifications_failed(webhook_server):
+    server = webhook_server(status=500)
+    dispatcher = NotificationDispatcher(webhook(server), retries=2, retry_delay=0)
+    item = notification("po@example.com", 0)
+    dispatcher.submit(item)
+    assert dispatcher.flush() == 0
+    dispatcher.stop()
+
+    assert len(server.received) == 3
+    assert item["status"] == "failed"
+
+
+def test_rate_limit_spaces_out_sends(webhook_server):
+    server = webhook_server()
+    dispatcher = NotificationDispatcher(webhook(server), rate_limit=20, burst=1)
+    for i in range(5):
+        dispatcher.submit(notification(f"user{i}@example.com", i))
+    started = time.monotonic()
+    assert dispatcher.flush() == 5
+    elapsed = time.monotonic() - started
+    dispatcher.stop()
+
+    # The first send uses the burst token, the other four wait 1/20 s each
+    assert elapsed >= 0.18
+    assert server.connections == 1
+
+
+def test_urgent_notifications_skip_the_digest_interval(webhook_server):
+    server = webhook_server()
+    with NotificationDispatcher(webhook(server), digest_interval=60) as dispatcher:
+        dispatcher.submit(notification("po@example.com", 0, urgency="urgent"))
+        deadline = time.monotonic() + 5
+        while not server.received and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [body["notifications"] for body in server.received] == [["n0"]]
+
+
+def test_smtp_digests_share_one_connection(smtp_server):
+    server = smtp_server()
+    dispatcher = NotificationDispatcher(smtp(server), retry_delay=0)
+    dispatcher.submit(notification("po@example.com", 0))
+    dispatcher.submit(notification("po@example.com", 1))
+    dispatcher.submit(notification("reviewer@example.com", 2))
+    assert dispatcher.flush() == 2
+    dispatcher.stop()
+
+    assert server.connections == 1
+    assert [(m["From"], m["To"], m["Subject"]) for m in server.received] == [
+        ("sdlc@example.com", "po@example.com", "2 notifications from the Agentic SDLC"),
+        ("sdlc@example.com", "reviewer@example.com", "Subject 2"),
+    ]
+    assert "## Subject 1\r\nMessage 1" in server.received[0].get_payload()
+
+
+def test_smtp_reconnects_after_the_server_drops_the_connection(smtp_server):
+    server = smtp_server(requests_per_connection=1)
+    dispatcher = NotificationDispatcher(smtp(server), retries=0)
+    notifications = [notification(f"user{i}@example.com", i) for i in range(3)]
+    for item in notifications:
+        dispatcher.submit(item)
+        time.sleep(0.05)
+        assert dispatcher.flush() == 1
+    dispatcher.stop()
+
+    assert server.connections == 3
+    assert [m["To"] for m in server.received] == [item["recipient"] for item in notifications]
+    assert {item["status"] for item in notifications} == {"sent"}
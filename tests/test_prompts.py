@@ -0,0 +1,43 @@
+import os
+
+from agent_integration import Task
+from standards_resolver import StandardsResolver
+
+AGENT = "QA-engineer-agent"
+
+
+def render(engine):
+    agent = engine.agent_registry.get_agent(AGENT)
+    task = Task(id="p_task_001", title="Write the test plan", description="Plan", agent=AGENT, human_reviewer="qa@example.com")
+    return engine._generate_agent_prompt(agent, task)
+
+
+def test_prompt_follows_inline_flag_and_standards_edits(make_engine, tmp_path):
+    standards = tmp_path / "standards"
+    standards.mkdir()
+    document = standards / "testing_strategy.md"
+    document.write_text("Use the testing pyramid.\n", encoding="utf-8")
+    engine = make_engine(standards=StandardsResolver([standards], cache_path=None))
+
+    assert "testing pyramid" not in render(engine)
+
+    engine.inline_standards = True
+    assert "Use the testing pyramid." in render(engine)
+
+    document.write_text("Use contract tests.\n", encoding="utf-8")
+    os.utime(document, ns=(0, 10**18))
+    prompt = render(engine)
+    assert "Use contract tests." in prompt
+    assert "testing pyramid" not in prompt
+
+    engine.inline_standards = False
+    assert "contract tests" not in render(engine)
+
+
+def test_compiled_template_is_reused_while_nothing_changes(make_engine):
+    engine = make_engine()
+    first = render(engine)
+    assert len(engine.prompt_templates) == 1
+    template = engine.prompt_templates._templates[(AGENT, engine.prompt_templates.version)][2]
+    assert render(engine) == first
+    assert engine.prompt_templates._templates[(AGENT, engine.prompt_templates.version)][2] is template
@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from quality_gates import FAILED, PARTIAL, PASSED, SKIPPED, QualityGateEngine
+
+GATES = """\
+## Software/Systems Workflow Gates
+
+### Gate 1: Build
+
+```yaml
+automated_checks:
+  infrastructure_validation:
+    tool: custom
+  lint:
+    tool: custom
+```
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    gates_file = tmp_path / "quality-gates.md"
+    gates_file.write_text(GATES, encoding="utf-8")
+    return root, gates_file
+
+
+def configure(root: Path, checks) -> None:
+    config = root / "config" / "quality-gates.yaml"
+    config.parent.mkdir(exist_ok=True)
+    config.write_text(yaml.safe_dump({"checks": checks}), encoding="utf-8")
+
+
+def evaluate(root: Path, gates_file: Path):
+    engine = QualityGateEngine(root, gates_file=gates_file, state_dir=root / ".agentic-state", max_workers=1)
+    (result,) = engine.evaluate(record=False)
+    return {check.check: check for check in result.checks}
+
+
+def test_check_without_inputs_reruns_when_any_file_changes(project):
+    root, gates_file = project
+    configure(root, {
+        "infrastructure_validation": {"command": ["sh", "-c", "test -f k8s/ok.yaml"]},
+        "lint": {"command": ["true"], "inputs": ["src/**/*.py"]},
+    })
+    (root / "k8s").mkdir()
+    (root / "k8s" / "ok.yaml").write_text("kind: Pod\n")
+
+    checks = evaluate(root, gates_file)
+    assert checks["infrastructure_validation"].status == PASSED
+    assert not checks["infrastructure_validation"].cached
+
+    (root / "k8s" / "ok.yaml").unlink()
+    checks = evaluate(root, gates_file)
+    assert checks["infrastructure_validation"].status == FAILED
+    assert not checks["infrastructure_validation"].cached
+    # Declared inputs are unchanged, so the other check is served from cache
+    assert checks["lint"].cached
+
+
+def test_check_reruns_only_when_its_inputs_change(project):
+    root, gates_file = project
+    configure(root, {
+        "infrastructure_validation": {"command": ["true"], "inputs": ["k8s/*.yaml"]},
+        "lint": {"command": ["true"], "inputs": ["src/**/*.py"]},
+    })
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "a.py").write_text("x = 1\n")
+    evaluate(root, gates_file)
+
+    (root / "src" / "pkg" / "a.py").write_text("x = 2\n")
+    checks = evaluate(root, gates_file)
+    assert not checks["lint"].cached
+    assert checks["infrastructure_validation"].cached
+
+    # Touching a file without changing its content is not a change
+    (root / "src" / "pkg" / "a.py").write_text("x = 2\n")
+    checks = evaluate(root, gates_file)
+    assert checks["lint"].cached
+
+
+def test_settings_change_invalidates_cached_result(project):
+    root, gates_file = project
+    configure(root, {"lint": {"command": ["true"], "inputs": ["*.py"]}})
+    assert evaluate(root, gates_file)["lint"].status == PASSED
+
+    configure(root, {"lint": {"command": ["false"], "inputs": ["*.py"]}})
+    checks = evaluate(root, gates_file)
+    assert checks["lint"].status == FAILED
+    assert not checks["lint"].cached
+
+
+def test_results_are_cached_in_an_empty_project(project):
+    root, gates_file = project
+    evaluate(root, gates_file)
+    checks = evaluate(root, gates_file)
+    assert all(check.cached for check in checks.values())
+
+
+def test_gate_with_skipped_checks_is_not_recorded_as_passed(project):
+    root, gates_file = project
+    state_dir = root / ".agentic-state"
+    configure(root, {"lint": {"command": ["true"], "inputs": ["*.py"]}})
+    engine = QualityGateEngine(root, gates_file=gates_file, state_dir=state_dir, max_workers=1)
+    (result,) = engine.evaluate()
+    assert result.status == PARTIAL
+    assert {check.check: check.status for check in result.checks} == {
+        "infrastructure_validation": SKIPPED, "lint": PASSED,
+    }
+    state = json.loads((state_dir / "current-state.json").read_text(encoding="utf-8"))
+    assert state["quality_gates_passed"] == []
+    assert state["quality_gate_results"]["gate_1"]["status"] == PARTIAL
+
+    configure(root, {
+        "lint": {"command": ["true"], "inputs": ["*.py"]},
+        "infrastructure_validation": {"command": ["true"], "inputs": ["k8s/*"]},
+    })
+    engine = QualityGateEngine(root, gates_file=gates_file, state_dir=state_dir, max_workers=1)
+    (result,) = engine.evaluate()
+    assert result.status == PASSED
+    state = json.loads((state_dir / "current-state.json").read_text(encoding="utf-8"))
+    assert state["quality_gates_passed"] == ["gate_1"]
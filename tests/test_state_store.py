@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from state_store import JournalStateStore, SQLiteStateStore, make_record
+
+BACKENDS = ["journal", "sqlite"]
+
+
+def open_store(kind, path, **kwargs):
+    if kind == "sqlite":
+        return SQLiteStateStore(path / "state.db")
+    kwargs.setdefault("flush_interval", 0)
+    return JournalStateStore(path / "state.json", **kwargs)
+
+
+def task(task_id, status="assigned", agent="qa-agent", project_id="proj_1"):
+    return {"id": task_id, "status": status, "agent": agent, "project_id": project_id,
+            "created_at": f"2025-01-01T00:00:{int(task_id[-2:]):02d}"}
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_round_trip_and_delete(kind, tmp_path):
+    store = open_store(kind, tmp_path)
+    store.append([
+        make_record("project", "proj_1", {"id": "proj_1", "status": "active", "created_at": "2025-01-01"}),
+        make_record("task", "proj_1_task_01", task("proj_1_task_01")),
+        make_record("task", "proj_1_task_02", task("proj_1_task_02", status="completed")),
+        make_record("task", "proj_2_task_03", task("proj_2_task_03", project_id="proj_2")),
+    ])
+    store.append([make_record("task", "proj_2_task_03")])
+    store.close()
+
+    data = open_store(kind, tmp_path).load()
+    assert list(data["projects"]) == ["proj_1"]
+    assert list(data["tasks"]) == ["proj_1_task_01", "proj_1_task_02"]
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_indexed_queries(kind, tmp_path):
+    store = open_store(kind, tmp_path)
+    store.append([
+        make_record("task", "proj_1_task_01", task("proj_1_task_01", status="completed")),
+        make_record("task", "proj_1_task_02", task("proj_1_task_02", agent="dev-agent")),
+        make_record("task", "proj_2_task_03", task("proj_2_task_03", project_id="proj_2")),
+    ])
+    assert [t["id"] for t in store.query_tasks(project_id="proj_1")] == ["proj_1_task_01", "proj_1_task_02"]
+    assert [t["id"] for t in store.query_tasks(agent="qa-agent", status="assigned")] == ["proj_2_task_03"]
+    assert store.task_status_counts("proj_1") == {"completed": 1, "assigned": 1}
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_load_leaves_excluded_statuses_in_the_store(kind, tmp_path):
+    store = open_store(kind, tmp_path)
+    store.append([
+        make_record("task", "proj_1_task_01", task("proj_1_task_01", status="completed")),
+        make_record("task", "proj_1_task_02", task("proj_1_task_02", status="completed")),
+        make_record("task", "proj_1_task_03", task("proj_1_task_03")),
+    ])
+    data = store.load(exclude_statuses=("completed",))
+    assert list(data["tasks"]) == ["proj_1_task_03"]
+    assert data["excluded"] == {"proj_1": {"completed": 2}}
+
+
+def test_journal_compaction_writes_a_snapshot_and_truncates_the_journal(tmp_path):
+    store = open_store("journal", tmp_path, compact_every=3)
+    for i in range(3):
+        store.append([make_record("task", f"proj_1_task_{i:02d}", task(f"proj_1_task_{i:02d}"))])
+    assert store.needs_compaction()
+    store.compact()
+    assert not store.needs_compaction()
+    assert (tmp_path / "state.journal").read_bytes() == b""
+    snapshot = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+    assert snapshot["journal_seq"] == 3
+    assert len(snapshot["tasks"]) == 3
+
+    store.append([make_record("task", "proj_1_task_00")])
+    store.close()
+    assert list(open_store("journal", tmp_path).load()["tasks"]) == ["proj_1_task_01", "proj_1_task_02"]
+
+
+def test_journal_sees_changes_from_another_store(tmp_path):
+    first = open_store("journal", tmp_path)
+    second = open_store("journal", tmp_path)
+    first.append([make_record("task", "proj_1_task_01", task("proj_1_task_01"))])
+    assert [t["id"] for t in second.query_tasks()] == ["proj_1_task_01"]
+    second.append([make_record("task", "proj_1_task_02", task("proj_1_task_02"))])
+    first.compact()
+    assert len(second.query_tasks()) == 2
+
+
+def test_journal_discards_a_torn_final_entry(tmp_path):
+    store = open_store("journal", tmp_path)
+    store.append([make_record("task", "proj_1_task_01", task("proj_1_task_01"))])
+    store.close()
+    with open(tmp_path / "state.journal", "ab") as f:
+        f.write(b'{"op": "put", "kind": "task", "id": "proj_1_ta')
+    assert list(open_store("journal", tmp_path).load()["tasks"]) == ["proj_1_task_01"]
+
+
+@pytest.mark.parametrize("state_file", ["workflow_state.json", "workflow_state.db"])
+def test_engine_leaves_completed_tasks_in_the_store(make_engine, brief_path, finish_task, state_file):
+    engine = make_engine(state_file)
+    project = engine.create_project(brief_path)
+    engine.start_workflow(project.id)
+    done = engine.get_ready_tasks(project.id)
+    for t in done:
+        finish_task(engine, t.id)
+    engine.store.close()
+
+    reloaded = make_engine(state_file)
+    assert not any(t.id in reloaded.active_tasks for t in done)
+    assert reloaded.task_index.status_counts(project.id) == engine.task_index.status_counts(project.id)
+    assert [t.id for t in reloaded.get_project_tasks(project.id)] == [t.id for t in engine.get_project_tasks(project.id)]
+    assert [t.status for t in reloaded.get_project_tasks(project.id)][:len(done)] == ["completed"] * len(done)
+    assert [t.id for t in reloaded.get_ready_tasks(project.id)] == [t.id for t in engine.get_ready_tasks(project.id)]
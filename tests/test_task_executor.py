@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import pytest
+
+from task_executor import (
+    CANCELLED, FAILED, SUCCEEDED, TIMED_OUT, AsyncTaskExecutor, ExecutorSettings, FakeModelBackend,
+)
+from task_state_machine import COMPLETED, DRAFT_READY, IN_PROGRESS
+
+
+class PeakTrackingBackend(FakeModelBackend):
+    """Records the highest number of concurrent calls, overall and per agent."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.running = {}
+        self.peak = 0
+        self.agent_peaks = {}
+
+    async def complete(self, prompt, agent, task_id):
+        self.running[agent] = self.running.get(agent, 0) + 1
+        self.peak = max(self.peak, sum(self.running.values()))
+        self.agent_peaks[agent] = max(self.agent_peaks.get(agent, 0), self.running[agent])
+        try:
+            return await super().complete(prompt, agent, task_id)
+        finally:
+            self.running[agent] -= 1
+
+
+@pytest.fixture
+def workflow(make_engine, brief_path):
+    engine = make_engine()
+    project = engine.create_project(brief_path)
+    engine.start_workflow(project.id)
+    return engine, project
+
+
+def ready_ids(engine, project):
+    return [task.id for task in engine.get_ready_tasks(project.id)]
+
+
+def run(executor, task_ids):
+    return asyncio.run(executor.run_tasks(task_ids))
+
+
+def test_per_agent_limits_cap_concurrent_calls(workflow):
+    engine, project = workflow
+    task_ids = ready_ids(engine, project)
+    for task_id in task_ids:
+        engine.active_tasks[task_id].agent = "software-developer-agent"
+
+    backend = PeakTrackingBackend(latency=0.02)
+    settings = ExecutorSettings(per_agent_limit=2, retries=0)
+    results = run(AsyncTaskExecutor(engine, backend, settings), task_ids)
+
+    assert [result.status for result in results] == [SUCCEEDED] * len(task_ids)
+    assert backend.agent_peaks == {"software-developer-agent": 2}
+
+
+def test_agent_override_and_global_limit(workflow):
+    engine, project = workflow
+    task_ids = ready_ids(engine, project)
+    engine.active_tasks[task_ids[1]].agent = engine.active_tasks[task_ids[0]].agent
+    busy_agent = engine.active_tasks[task_ids[0]].agent
+
+    backend = PeakTrackingBackend(latency=0.02)
+    settings = ExecutorSettings(max_concurrency=2, per_agent_limit=4, agent_limits={busy_agent: 1}, retries=0)
+    run(AsyncTaskExecutor(engine, backend, settings), task_ids)
+
+    assert backend.peak == 2
+    assert backend.agent_peaks[busy_agent] == 1
+
+
+def test_timeouts_leave_the_task_in_progress(workflow):
+    engine, project = workflow
+    task_id = ready_ids(engine, project)[0]
+    settings = ExecutorSettings(timeout=0.01, retries=1, backoff=0)
+    [result] = run(AsyncTaskExecutor(engine, FakeModelBackend(latency=1.0), settings), [task_id])
+
+    assert result.status == TIMED_OUT
+    assert result.attempts == 2
+    assert engine.active_tasks[task_id].status == IN_PROGRESS
+
+
+def test_retries_back_off_exponentially(workflow):
+    engine, project = workflow
+    flaky, broken = ready_ids(engine, project)[:2]
+    backend = FakeModelBackend(failures={flaky: 2, broken: 5})
+    settings = ExecutorSettings(retries=2, backoff=0.02, backoff_factor=2, max_backoff=0.03)
+    executor = AsyncTaskExecutor(engine, backend, settings)
+    assert [executor._backoff_delay(attempt) for attempt in (1, 2, 3)] == [0.02, 0.03, 0.03]
+
+    started = time.perf_counter()
+    results = run(executor, [flaky, broken])
+    assert time.perf_counter() - started >= 0.05
+
+    assert [(result.status, result.attempts) for result in results] == [(SUCCEEDED, 3), (FAILED, 3)]
+    assert engine.active_tasks[flaky].status == DRAFT_READY
+    assert engine.active_tasks[broken].status == IN_PROGRESS
+    assert [call["task_id"] for call in backend.calls].count(broken) == 3
+
+
+def test_cancel_stops_in_flight_tasks(workflow):
+    engine, project = workflow
+    task_ids = ready_ids(engine, project)
+    executor = AsyncTaskExecutor(engine, FakeModelBackend(latency=5.0), ExecutorSettings(retries=0))
+
+    async def cancel_soon():
+        pending = asyncio.ensure_future(executor.run_tasks(task_ids))
+        await asyncio.sleep(0.05)
+        assert executor.cancel("unknown") == 0
+        assert executor.cancel() == len(task_ids)
+        return await pending
+
+    started = time.perf_counter()
+    results = asyncio.run(cancel_soon())
+    assert time.perf_counter() - started < 1.0
+    assert [result.status for result in results] == [CANCELLED] * len(task_ids)
+
+
+def test_run_workflow_releases_dependents_as_tasks_complete(workflow):
+    engine, project = workflow
+    executor = AsyncTaskExecutor(engine, FakeModelBackend(latency=0.01), auto_complete=True)
+    results = asyncio.run(executor.run_workflow(project.id))
+
+    order = [result.task_id for result in results]
+    assert sorted(order) == sorted(task.id for task in engine.get_project_tasks(project.id))
+    for position, task_id in enumerate(order):
+        assert set(engine.scheduler.dependencies(task_id)) <= set(order[:position])
+    assert {engine.active_tasks[task_id].status for task_id in order} == {COMPLETED}
+
+
+def test_run_workflow_waits_for_review_without_auto_complete(workflow):
+    engine, project = workflow
+    ready = ready_ids(engine, project)
+    results = asyncio.run(AsyncTaskExecutor(engine, FakeModelBackend()).run_workflow(project.id))
+
+    assert sorted(result.task_id for result in results) == sorted(ready)
+    assert {engine.active_tasks[task_id].status for task_id in ready} == {DRAFT_READY}
@@ -0,0 +1,72 @@
+import pytest
+
+from task_scheduler import DONE, PENDING, READY, RUNNING, TaskScheduler
+
+
+@pytest.fixture
+def diamond():
+    """a -> (b, c) -> d, plus an independent e."""
+    scheduler = TaskScheduler()
+    scheduler.add_task("a", group="p1")
+    scheduler.add_task("b", ["a"], group="p1")
+    scheduler.add_task("c", ["a"], group="p1")
+    scheduler.add_task("d", ["c", "b"], group="p1")
+    scheduler.add_task("e", group="p2")
+    return scheduler
+
+
+def test_ready_tasks_follow_release_order(diamond):
+    assert diamond.ready() == ["a", "e"]
+    assert diamond.ready("p1") == ["a"]
+    assert diamond.state("d") == PENDING
+
+    diamond.start("a")
+    assert diamond.state("a") == RUNNING
+    assert diamond.ready() == ["e"]
+    # Dependents are released in the order they were added
+    assert diamond.complete("a") == ["b", "c"]
+    assert diamond.ready() == ["e", "b", "c"]
+
+    diamond.complete("c")
+    assert diamond.blocking("d") == ["b"]
+    assert diamond.complete("b") == ["d"]
+    assert diamond.ready("p1") == ["d"]
+    assert diamond.ready_count("p1") == 1
+    assert diamond.complete("b") == []
+
+
+def test_blocked_tasks_cannot_start_or_complete(diamond):
+    with pytest.raises(ValueError, match="waiting on"):
+        diamond.start("b")
+    with pytest.raises(ValueError, match="cannot complete"):
+        diamond.complete("d")
+
+
+def test_done_and_unknown_dependencies_are_satisfied():
+    scheduler = TaskScheduler()
+    scheduler.add_task("a", done=True)
+    scheduler.add_task("b", ["a", "missing"])
+    assert scheduler.state("a") == DONE
+    assert scheduler.state("b") == READY
+    assert scheduler.dependencies("b") == ["a"]
+    with pytest.raises(ValueError, match="already scheduled"):
+        scheduler.add_task("b")
+
+
+def test_removing_a_task_releases_its_dependents(diamond):
+    diamond.complete("a")
+    diamond.complete("b")
+    diamond.remove("c")
+    assert "c" not in diamond
+    assert diamond.ready("p1") == ["d"]
+    assert diamond.dependencies("d") == ["b"]
+
+
+def test_topological_order_and_critical_path(diamond):
+    order = diamond.topological_order()
+    assert order == ["a", "e", "b", "c", "d"]
+    assert diamond.topological_order(["d", "b"]) == ["b", "d"]
+
+    length, path = diamond.critical_path({"a": 2, "b": 1, "c": 3, "d": 1})
+    assert (length, path) == (6.0, ["a", "c", "d"])
+    assert diamond.critical_path({}, task_ids=[]) == (0.0, [])
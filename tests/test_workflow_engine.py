@@ -0,0 +1,65 @@
+import pytest
+
+from task_state_machine import COMPLETED, DRAFT_READY, IN_PROGRESS, InvalidTransitionError
+
+@pytest.fixture
+def workflow(make_engine, brief_path):
+    engine = make_engine()
+    project = engine.create_project(brief_path)
+    tasks = engine.start_workflow(project.id)
+    return engine, project, tasks
+
+
+def test_blocked_task_is_refused_before_hooks_run(workflow):
+    engine, project, tasks = workflow
+    blocked = next(task for task in tasks if engine.scheduler.blocking(task.id))
+    calls = []
+    engine.state_machine.add_hook(lambda task, transition: calls.append(task.id), before=True)
+
+    with pytest.raises(ValueError, match="blocked"):
+        engine.set_task_status(blocked.id, IN_PROGRESS)
+    assert calls == []
+    assert blocked.status == "assigned"
+
+
+def test_invalid_transition_is_rejected(workflow):
+    engine, project, tasks = workflow
+    ready = engine.get_ready_tasks(project.id)[0]
+    with pytest.raises(InvalidTransitionError):
+        engine.set_task_status(ready.id, COMPLETED)
+    assert ready.status == "assigned"
+
+
+def test_reassigning_a_submitted_task_is_a_clear_error(workflow):
+    engine, project, tasks = workflow
+    task = engine.get_ready_tasks(project.id)[0]
+    first = engine.assign_task(task.id)
+    # Re-assigning while in progress re-renders the same prompt
+    assert engine.assign_task(task.id) == first
+
+    engine.set_task_status(task.id, DRAFT_READY)
+    with pytest.raises(ValueError, match="already submitted"):
+        engine.assign_task(task.id)
+    assert task.status == DRAFT_READY
+
+
+def test_completing_a_task_releases_its_dependents(workflow, finish_task):
+    engine, project, tasks = workflow
+    ready = engine.get_ready_tasks(project.id)
+    for task in ready:
+        finish_task(engine, task.id)
+    released = {task.id for task in engine.get_ready_tasks(project.id)}
+    assert released
+    assert all(set(engine.scheduler.dependencies(task_id)) <= {task.id for task in ready} for task_id in released)
+
+
+def test_state_survives_a_restart(workflow, make_engine, finish_task):
+    engine, project, tasks = workflow
+    task = engine.get_ready_tasks(project.id)[0]
+    finish_task(engine, task.id)
+    engine.store.flush()
+
+    reloaded = make_engine()
+    assert {t.id: t.status for t in reloaded.get_project_tasks(project.id)}[task.id] == COMPLETED
+    assert reloaded.status_view.transition_counts(project.id)["complete"] == 1
+    assert [t.id for t in reloaded.get_ready_tasks(project.id)] == [t.id for t in engine.get_ready_tasks(project.id)]